@@ -1,13 +1,18 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import json
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
 import logging
 import re
+from time import perf_counter
 
 from backend.models.models import Match, Team, Schedule, Disruption, GameType
-from backend.models.tournament import Tournament
+from backend.models.tournament import Tournament, daily_venue_windows
 from backend.schedulers.scheduler import GraphColoringScheduler, GeneticAlgorithmOptimizer
+from backend.schedulers.days import MultiDayOptimizer, MultiDayScheduler
+from backend.schedulers.decompose import DecomposedOptimizer
+from backend.schedulers.greedy import GreedyRescheduler
+from backend.schedulers.local_search import LocalSearchOptimizer, choose_engine
 from backend.utils.data_importer import import_data
 
 # Set up logging
@@ -36,6 +41,92 @@ def parse_time(time_str):
     hour, minute = map(int, time_str.split(':'))
     return time(hour, minute)
 
+def parse_venue_windows(tournament_data, venue_start, venue_end):
+    """Dated venue windows of a multi-day tournament, or None for a single day today."""
+    # Explicit {start, end} windows, or the same venue hours on each listed day
+    windows = tournament_data.get('venueWindows')
+    if windows:
+        return [(parse_datetime(window['start']), parse_datetime(window['end'])) for window in windows]
+    days = tournament_data.get('days')
+    if days:
+        return daily_venue_windows([date.fromisoformat(day) for day in days], venue_start, venue_end)
+    return None
+
+def add_dependencies(tournament, tournament_data):
+    """Add the bracket dependencies of a request: {from, to, outcome} with outcome "winner" or "loser"."""
+    for dependency in tournament_data.get('dependencies') or []:
+        tournament.add_dependency(dependency['from'], dependency['to'], dependency.get('outcome', 'winner'))
+    # Reject cyclic brackets before any scheduling starts
+    tournament.bracket.topological_order()
+
+def parse_optimizer_options(data):
+    """Parse optional GA optimizer settings from a request."""
+    options = data.get('optimizer') or {}
+    
+    # Latency budget for the whole optimization, in milliseconds
+    time_budget_ms = options.get('timeBudgetMs')
+    
+    return {
+        'workers': options.get('workers', 1),
+        'chunk_size': options.get('chunkSize'),
+        'seed': options.get('seed'),
+        'generations': options.get('generations', 100),
+        'time_budget': time_budget_ms / 1000 if time_budget_ms is not None else None,
+        'stagnation_generations': options.get('stagnationGenerations'),
+        'target_fitness': options.get('targetFitness'),
+        'stop_when_feasible': options.get('stopWhenFeasible', False),
+        'stop_at_bound': options.get('stopAtBound', True),
+        'bound_tolerance': options.get('boundTolerance', 1e-3),
+        'islands': options.get('islands', 1),
+        'migration_interval': options.get('migrationInterval', 10),
+        'migration_size': options.get('migrationSize', 2),
+        'migration_topology': options.get('migrationTopology', 'ring'),
+        'warm_start': options.get('warmStart', True),
+        'repair_offspring': options.get('repairOffspring', False),
+        'delta_evaluation': options.get('deltaEvaluation', False),
+        'encoding': options.get('encoding', 'time'),
+        'permutation_crossover': options.get('permutationCrossover', 'ox'),
+        'grid_interval': options.get('gridInterval', 5),
+        'now': parse_datetime(data.get('now'))
+    }
+
+def create_optimizer(data, tournament, schedule, disruptions):
+    """Build the optimizer for an adjust request, choosing the engine per request or automatically."""
+    options = data.get('optimizer') or {}
+    engine = choose_engine(options.get('engine', 'ga'), len(disruptions), len(schedule.matches))
+    kwargs = parse_optimizer_options(data)
+    if engine == 'ga':
+        optimizer_class = GeneticAlgorithmOptimizer
+    else:
+        # Local search evaluates one schedule at a time, always incrementally
+        optimizer_class = LocalSearchOptimizer
+        kwargs.pop('islands')
+        kwargs.pop('delta_evaluation')
+        kwargs.update(method=engine, iterations=options.get('iterations', 5000))
+    
+    # Multi-day tournaments re-optimize only the disrupted days and the days they spill into
+    if tournament.n_days > 1:
+        return engine, MultiDayOptimizer(tournament, schedule, disruptions, optimizer_class=optimizer_class,
+                                         processes=options.get('processes', 0), **kwargs)
+    
+    # Independent venues can be solved as separate subproblems in parallel
+    if options.get('decompose', False):
+        return engine, DecomposedOptimizer(tournament, schedule, disruptions, optimizer_class=optimizer_class,
+                                           processes=options.get('processes', 0), **kwargs)
+    return engine, optimizer_class(tournament, schedule, disruptions, **kwargs)
+
+def optimality_fields(optimizer):
+    """Lower bounds and the optimality gap of an optimizer run (None where not known)."""
+    bounds = getattr(optimizer, 'bounds', None)
+    return {
+        'stopReason': getattr(optimizer, 'stop_reason', None),
+        'softPenalty': getattr(optimizer, 'soft_penalty', None),
+        'softPenaltyLowerBound': getattr(optimizer, 'soft_bound', None),
+        'optimalityGap': getattr(optimizer, 'optimality_gap', None),
+        'makespanLowerBound': bounds.makespan if bounds else None,
+        'idleTimeLowerBound': bounds.idle_time if bounds else None
+    }
+
 @app.route('/api/python/schedule/generate', methods=['POST'])
 def generate_schedule():
     try:
@@ -56,7 +147,8 @@ def generate_schedule():
             name=tournament_data.get('name', ''),
             venue_start=venue_start,
             venue_end=venue_end,
-            rest_period=rest_period
+            rest_period=rest_period,
+            venue_windows=parse_venue_windows(tournament_data, venue_start, venue_end)
         )
         
         # Parse teams
@@ -102,15 +194,23 @@ def generate_schedule():
                 tournament.add_fixed_event(fixed_match)
                 logger.info(f"Added fixed event: {description} at {event_start}")
         
+        add_dependencies(tournament, tournament_data)
+        
         # Also check for matches marked as finals
         finals_ids = data.get('finalsMatches', [])
         if finals_ids:
             logger.info(f"Marking matches {finals_ids} as fixed-time finals")
             tournament.mark_finals(finals_ids)
         
-        # Generate schedule using GraphColoringScheduler
-        scheduler = GraphColoringScheduler(tournament)
+        # Generate schedule using GraphColoringScheduler ("dsatur" or "legacy" fixed slots),
+        # one day per worker process for multi-day tournaments
+        if tournament.n_days > 1:
+            scheduler = MultiDayScheduler(tournament, mode=data.get('schedulingMode', 'dsatur'))
+        else:
+            scheduler = GraphColoringScheduler(tournament, mode=data.get('schedulingMode', 'dsatur'))
         schedule = scheduler.generate_schedule()
+        if scheduler.unscheduled_matches:
+            logger.warning(f"Matches outside venue hours: {[m.id for m in scheduler.unscheduled_matches]}")
         
         # Convert schedule to JSON format
         matches_json = []
@@ -134,7 +234,10 @@ def generate_schedule():
                 'endTime': match.end_time.isoformat() if match.end_time else None
             })
         
-        response = {'matches': matches_json}
+        response = {
+            'matches': matches_json,
+            'unscheduledMatches': [m.id for m in scheduler.unscheduled_matches]
+        }
         logger.info(f"Sending response: {json.dumps(response)}")
         return jsonify(response)
     
@@ -162,9 +265,12 @@ def adjust_schedule():
             name=tournament_data.get('name', ''),
             venue_start=venue_start,
             venue_end=venue_end,
-            rest_period=rest_period
+            rest_period=rest_period,
+            venue_windows=parse_venue_windows(tournament_data, venue_start, venue_end)
         )
         
+        add_dependencies(tournament, tournament_data)
+        
         # Parse initial schedule
         schedule = Schedule()
         
@@ -231,18 +337,40 @@ def adjust_schedule():
             all_teams.add(match.team2)
         tournament.add_teams(list(all_teams))
         
+        optimizer = None
+        
+        # Deterministic list-scheduling fast path, unless the caller asks for optimization
+        # Matches that started before "now" are kept as they are
+        now = parse_datetime(data.get('now'))
+        adjust_start = perf_counter()
+        greedy = GreedyRescheduler(tournament, schedule, disruptions_list,
+                                   GeneticAlgorithmOptimizer.WEIGHTS, GeneticAlgorithmOptimizer.PEAK_HOURS,
+                                   now=now)
+        greedy_schedule = greedy.reschedule()
+        greedy_ms = (perf_counter() - adjust_start) * 1000
+        logger.info(f"Greedy rescheduling took {greedy_ms:.2f} ms, hard penalty {greedy.hard_penalty}")
+        
         # Check if all disruptions are late arrivals
         all_late_arrivals = all(d.type == "late_arrival" for d in disruptions_list)
         
-        if all_late_arrivals:
+        if greedy.feasible and not data.get('optimize', False):
+            logger.info("Greedy schedule has no hard violations - skipping optimization")
+            path = 'greedy'
+            adjusted_schedule = greedy_schedule
+        elif all_late_arrivals and now is None:
             # For late arrivals, use direct adjustment without GA optimization
             logger.info("All disruptions are late arrivals - using direct adjustment")
+            path = 'late_arrival'
             adjusted_schedule = handle_late_arrivals(schedule, disruptions_list, tournament.rest_period)
         else:
-            # For other disruptions, use GA optimization
-            logger.info("Using GA optimizer for complex disruptions")
-            optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions_list)
+            # For other disruptions, use the GA or a local search engine
+            engine, optimizer = create_optimizer(data, tournament, schedule, disruptions_list)
+            logger.info(f"Using {engine} optimizer for complex disruptions")
+            path = engine
             adjusted_schedule = optimizer.optimize()
+            generations = len(optimizer.logbook) - 1 if optimizer.logbook else 0
+            logger.info(f"{engine} stopped after {generations} generations: {optimizer.stop_reason}")
+        elapsed_ms = (perf_counter() - adjust_start) * 1000
         
         # Verify no match starts earlier than its original time
         for match in adjusted_schedule.matches:
@@ -283,9 +411,21 @@ def adjust_schedule():
                 'description': match.description
             })
         
-        response = {'matches': matches_json}
+        response = {
+            'matches': matches_json,
+            'adjustment': {
+                'path': path,
+                'elapsedMs': elapsed_ms,
+                'greedyMs': greedy_ms,
+                'greedyHardPenalty': greedy.hard_penalty,
+                **optimality_fields(optimizer)
+            }
+        }
         logger.info(f"Sending response: {json.dumps(response)}")
-        return jsonify(response)
+        result = jsonify(response)
+        result.headers['X-Adjust-Path'] = path
+        result.headers['X-Adjust-Time-Ms'] = f"{elapsed_ms:.2f}"
+        return result
     
     except Exception as e:
         logger.error(f"Error adjusting schedule: {str(e)}", exc_info=True)
@@ -11,7 +11,7 @@ Based on thesis: "Dynamic Scheduling Optimization for Cebu-Based Esports Tournam
 import argparse
 import sys
 import time
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import random
 import pandas as pd
 import networkx as nx
@@ -20,7 +20,8 @@ import os
 from data_importer import import_tournament_data, export_schedule_to_csv
 from tournament import Tournament
 from scheduler import GraphColoringScheduler, GeneticAlgorithmOptimizer
-from models import Match, Team, Schedule, Disruption, GameType
+from models import Match, Team, Schedule, Disruption, GameType, ScheduleArrays
+from models.arrays import as_arrays
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -221,7 +222,7 @@ def main():
             
             # Calculate and display metrics
             print("\nPerformance Metrics:")
-            calculate_metrics(initial_schedule, adjusted_schedule, disruptions)
+            calculate_metrics(initial_schedule, adjusted_schedule, disruptions, optimizer)
             
             # Export schedule if requested
             if args.export_schedule:
@@ -290,7 +291,7 @@ def main():
         
         # Calculate and display metrics
         print("\nPerformance Metrics:")
-        calculate_metrics(initial_schedule, adjusted_schedule, disruptions)
+        calculate_metrics(initial_schedule, adjusted_schedule, disruptions, optimizer)
     
     print("\nScheduling complete!")
 
@@ -350,63 +351,56 @@ def simulate_disruptions(tournament: Tournament, schedule: Schedule) -> List[Dis
     
     return disruptions
 
-def calculate_metrics(initial_schedule: Schedule, adjusted_schedule: Schedule, disruptions: List[Disruption]):
-    """Calculate and display performance metrics comparing schedules."""
+def calculate_metrics(initial_schedule: Union[Schedule, ScheduleArrays],
+                      adjusted_schedule: Union[Schedule, ScheduleArrays], disruptions: List[Disruption],
+                      optimizer: Optional[GeneticAlgorithmOptimizer] = None):
+    """Calculate and display performance metrics comparing schedules, and the optimizer's lower bounds."""
+    # Every metric reads the columnar views, built once per schedule
+    initial = as_arrays(initial_schedule)
+    adjusted = as_arrays(adjusted_schedule)
+    
     # Calculate idle time (gaps between matches)
-    initial_idle = calculate_idle_time(initial_schedule)
-    adjusted_idle = calculate_idle_time(adjusted_schedule)
+    initial_idle = calculate_idle_time(initial)
+    adjusted_idle = calculate_idle_time(adjusted)
     
     # Calculate schedule disruption (how many matches were moved from original time)
-    moved_matches = sum(1 for m1 in initial_schedule.matches 
-                      for m2 in adjusted_schedule.matches 
-                      if m1.id == m2.id and m1.start_time != m2.start_time)
-    disruption_score = (moved_matches / len(initial_schedule.matches)) * 100
+    moved_matches = adjusted.moved_from(initial)
+    disruption_score = (moved_matches / len(initial)) * 100
     
     # Calculate total tournament duration
-    initial_duration = (max(m.end_time for m in initial_schedule.matches) - 
-                      min(m.start_time for m in initial_schedule.matches)).total_seconds() / 60
-    adjusted_duration = (max(m.end_time for m in adjusted_schedule.matches) - 
-                       min(m.start_time for m in adjusted_schedule.matches)).total_seconds() / 60
+    initial_duration = initial.makespan()
+    adjusted_duration = adjusted.makespan()
     
     # Display metrics
     print(f"Idle Time (mins): Initial: {initial_idle:.1f}, Adjusted: {adjusted_idle:.1f}, Change: {adjusted_idle - initial_idle:+.1f}")
     print(f"Total Duration (mins): Initial: {initial_duration:.1f}, Adjusted: {adjusted_duration:.1f}, Change: {adjusted_duration - initial_duration:+.1f}")
     print(f"Disruption Score: {disruption_score:.1f}% of matches were rescheduled")
     
+    # Distance of the adjusted schedule from the best any schedule could do
+    if optimizer is not None and optimizer.optimality_gap is not None:
+        print(f"Lower Bounds: Total Duration: {optimizer.bounds.makespan:.1f} mins, "
+              f"Soft Penalty: {optimizer.soft_bound:.1f}")
+        print(f"Optimality Gap: {optimizer.optimality_gap * 100:.1f}% "
+              f"(soft penalty {optimizer.soft_penalty:.1f}, stopped by {optimizer.stop_reason})")
+    
     # Check for constraint violations
-    check_constraint_violations(adjusted_schedule)
+    check_constraint_violations(adjusted)
 
-def calculate_idle_time(schedule: Schedule) -> float:
+def calculate_idle_time(schedule: Union[Schedule, ScheduleArrays]) -> float:
     """Calculate total idle time in a schedule (in minutes)."""
-    sorted_matches = sorted(schedule.matches, key=lambda m: m.start_time)
-    total_idle = 0
-    
-    for i in range(1, len(sorted_matches)):
-        current_start = sorted_matches[i].start_time
-        prev_end = sorted_matches[i-1].end_time
-        if current_start > prev_end:
-            idle_minutes = (current_start - prev_end).total_seconds() / 60
-            total_idle += idle_minutes
-    
-    return total_idle
+    return as_arrays(schedule).idle_time()
 
-def check_constraint_violations(schedule: Schedule):
+def check_constraint_violations(schedule: Union[Schedule, ScheduleArrays]):
     """Check and report any constraint violations in the schedule."""
     violations = []
-    
-    # Check for team playing multiple matches at once
-    team_matches = {}
-    for match in schedule.matches:
-        for team in [match.team1, match.team2]:
-            if team.name not in team_matches:
-                team_matches[team.name] = []
-            team_matches[team.name].append(match)
-    
-    for team, matches in team_matches.items():
-        sorted_matches = sorted(matches, key=lambda m: m.start_time)
-        for i in range(1, len(sorted_matches)):
-            if sorted_matches[i].start_time < sorted_matches[i-1].end_time:
-                violations.append(f"Overlap: {team} is scheduled in overlapping matches")
+    arrays = as_arrays(schedule)
+    
+    # Check for team playing multiple matches at once: each team's matches in start order
+    order = arrays.scheduled
+    for code, team in enumerate(arrays.teams):
+        played = order[(arrays.team1[order] == code) | (arrays.team2[order] == code)]
+        overlapping = arrays.start[played[1:]] < arrays.end[played[:-1]]
+        violations.extend([f"Overlap: {team.name} is scheduled in overlapping matches"] * int(overlapping.sum()))
     
     # Report violations
     if violations:
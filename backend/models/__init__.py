@@ -5,6 +5,9 @@ Contains data models for the esports tournament scheduler.
 """
 
 from .models import Team, Match, Schedule, Disruption
+from .arrays import ScheduleArrays
 from .tournament import Tournament
+from .bracket import BracketDAG
+from .conflict_graph import BitsetConflictGraph
 
-__all__ = ['Team', 'Match', 'Schedule', 'Disruption', 'Tournament'] 
\ No newline at end of file
+__all__ = ['Team', 'Match', 'Schedule', 'Disruption', 'ScheduleArrays', 'Tournament', 'BracketDAG', 'BitsetConflictGraph'] 
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""
+Columnar (struct-of-arrays) view of a schedule.
+
+A ``Schedule`` is a list of ``Match`` objects, so every whole-schedule
+computation walks the objects and most of them sort them again first.
+``ScheduleArrays`` copies a schedule into one NumPy array per attribute in a
+single pass, with venues and teams as integer codes into lookup tables.
+Start order is computed once and shared by every metric, and the arrays
+convert back to a ``Schedule`` when match objects are needed again.
+
+Times are minutes since the epoch of ``backend.models.models``, with NaN for
+unscheduled matches.
+"""
+
+from datetime import datetime, tzinfo as tzinfo_type
+from functools import cached_property
+from typing import Dict, Hashable, List, Optional, Union
+
+import numpy as np
+
+from backend.models.models import Match, Schedule, Team, from_minutes, venue_key
+
+
+class ScheduleArrays:
+    """One array per match attribute, in the order of the schedule's matches."""
+
+    def __init__(self, ids: List[str], start: np.ndarray, end: np.ndarray, duration: np.ndarray,
+                 venue: np.ndarray, team1: np.ndarray, team2: np.ndarray, round_number: np.ndarray,
+                 fixed: np.ndarray, is_break: np.ndarray, venues: List[Hashable], teams: List[Team],
+                 game_types: List, descriptions: List[str], tzinfo: Optional[tzinfo_type] = None):
+        """
+        Wrap the columns; venue and team codes index the venues and teams lists.
+        
+        game_types keeps every match's game type as given, since ``"Val"`` and
+        ``GameType.VALORANT`` share a venue code.
+        """
+        self.ids = ids
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.venue = venue
+        self.team1 = team1
+        self.team2 = team2
+        self.round_number = round_number
+        self.fixed = fixed
+        self.is_break = is_break
+        self.venues = venues
+        self.teams = teams
+        self.game_types = game_types
+        self.descriptions = descriptions
+        self.tzinfo = tzinfo
+        self.index_of: Dict[str, int] = {}
+        for i, match_id in enumerate(ids):
+            self.index_of.setdefault(match_id, i)
+
+    @classmethod
+    def from_schedule(cls, schedule: Schedule) -> 'ScheduleArrays':
+        """Copy a schedule's matches into columns in one pass."""
+        n = len(schedule.matches)
+        start = np.full(n, np.nan)
+        end = np.full(n, np.nan)
+        duration = np.zeros(n, dtype=np.int64)
+        venue = np.zeros(n, dtype=np.int32)
+        team1 = np.zeros(n, dtype=np.int32)
+        team2 = np.zeros(n, dtype=np.int32)
+        round_number = np.zeros(n, dtype=np.int64)
+        fixed = np.zeros(n, dtype=bool)
+        is_break = np.zeros(n, dtype=bool)
+        ids, game_types, descriptions = [], [], []
+        venue_code: Dict[Hashable, int] = {}
+        team_code: Dict[str, int] = {}
+        venues: List[Hashable] = []
+        teams: List[Team] = []
+        tzinfo = None
+
+        for i, match in enumerate(schedule.matches):
+            ids.append(match.id)
+            game_types.append(match.game_type)
+            descriptions.append(match.description)
+            if match.start_minute is not None:
+                start[i] = match.start_minute
+                tzinfo = tzinfo or match.tzinfo
+            if match.end_minute is not None:
+                end[i] = match.end_minute
+            duration[i] = match.duration
+            key = venue_key(match.game_type)
+            if key not in venue_code:
+                venue_code[key] = len(venues)
+                venues.append(match.game_type)
+            venue[i] = venue_code[key]
+            for column, team in ((team1, match.team1), (team2, match.team2)):
+                if team.name not in team_code:
+                    team_code[team.name] = len(teams)
+                    teams.append(team)
+                column[i] = team_code[team.name]
+            round_number[i] = match.round_number
+            fixed[i] = match.is_fixed_time
+            is_break[i] = match.is_break
+
+        return cls(ids, start, end, duration, venue, team1, team2, round_number, fixed, is_break,
+                   venues, teams, game_types, descriptions, tzinfo)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_schedule(self) -> Schedule:
+        """New match objects with the same times and attributes, in the same order."""
+        schedule = Schedule()
+        for i, match_id in enumerate(self.ids):
+            match = Match(
+                id=match_id,
+                team1=self.teams[self.team1[i]],
+                team2=self.teams[self.team2[i]],
+                duration=int(self.duration[i]),
+                game_type=self.game_types[i],
+                round_number=int(self.round_number[i]),
+                is_fixed_time=bool(self.fixed[i]),
+                is_break=bool(self.is_break[i]),
+                description=self.descriptions[i]
+            )
+            if not np.isnan(self.start[i]):
+                match.tzinfo = self.tzinfo
+                match.set_minutes(_minutes(self.start[i]), _minutes(self.end[i]))
+            schedule.add_match(match)
+        return schedule
+
+    @cached_property
+    def order(self) -> np.ndarray:
+        """Match positions by start time (stable, unscheduled matches last)."""
+        return np.argsort(self.start, kind='stable')
+
+    @cached_property
+    def scheduled(self) -> np.ndarray:
+        """Positions of the matches with a start time, in start order."""
+        order = self.order
+        return order[~np.isnan(self.start[order])]
+
+    def idle_time(self, threshold: float = 0.0) -> float:
+        """Total gap minutes longer than threshold between consecutive matches in start order."""
+        order = self.scheduled
+        gaps = self.start[order[1:]] - self.end[order[:-1]]
+        return float(gaps[gaps > threshold].sum())
+
+    def makespan(self) -> float:
+        """Minutes from the first start to the last end (0 without scheduled matches)."""
+        order = self.scheduled
+        if len(order) == 0:
+            return 0.0
+        return float(np.nanmax(self.end[order]) - self.start[order[0]])
+
+    def moved_from(self, other: 'ScheduleArrays') -> int:
+        """Number of matches, also in the other schedule, whose start differs from it."""
+        rows = [(i, other.index_of[match_id]) for i, match_id in enumerate(self.ids) if match_id in other.index_of]
+        if not rows:
+            return 0
+        mine, theirs = np.array(rows).T
+        a, b = self.start[mine], other.start[theirs]
+        return int(np.sum((a != b) & ~(np.isnan(a) & np.isnan(b))))
+
+    def times(self, column: np.ndarray) -> List[Optional[datetime]]:
+        """Datetime views of a time column (start or end), None where unscheduled."""
+        return [None if np.isnan(minutes) else from_minutes(_minutes(minutes), self.tzinfo)
+                for minutes in column.tolist()]
+
+
+def _minutes(value: float) -> Union[int, float]:
+    """A column value as stored on a match: an int when whole."""
+    return int(value) if float(value).is_integer() else float(value)
+
+
+def as_arrays(schedule: Union[Schedule, ScheduleArrays]) -> ScheduleArrays:
+    """The columnar view of a schedule, or the view itself."""
+    return schedule if isinstance(schedule, ScheduleArrays) else ScheduleArrays.from_schedule(schedule)
@@ -0,0 +1,91 @@
+"""
+Lower bounds on the length and idle time of a tournament schedule.
+
+No schedule without hard-constraint violations can be shorter than:
+- the total match time at its busiest venue, since a venue plays one match at a time
+- the matches of its busiest team with a rest period between each two of them
+- the longest chain of matches that must follow each other: bracket dependencies,
+  or without a bracket one match of every round after all lower rounds
+
+Idle time is measured between consecutive matches in start order and only
+counts gaps longer than a threshold. A schedule covers at most the total
+match time, so a schedule of at least the bounded length leaves at least the
+rest as gaps, of which every gap up to the threshold may go uncounted.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from backend.models.models import Match, venue_key
+from backend.models.tournament import Tournament
+
+
+@dataclass
+class ScheduleBounds:
+    """Lower bounds (minutes) for a set of matches."""
+    venue_load: float
+    team_load: float
+    critical_path: float
+    makespan: float
+    idle_time: float
+
+
+def venue_load_bound(matches: List[Match], durations: Dict[str, float]) -> float:
+    """Total match minutes at the busiest venue."""
+    loads: Dict = {}
+    for match in matches:
+        if not match.is_break:
+            key = venue_key(match.game_type)
+            loads[key] = loads.get(key, 0) + durations[match.id]
+    return max(loads.values(), default=0.0)
+
+
+def team_load_bound(matches: List[Match], durations: Dict[str, float], rest_period: float) -> float:
+    """Match minutes of the busiest team, plus a rest period between consecutive matches."""
+    minutes: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for match in matches:
+        if match.is_break:
+            continue
+        for team in {match.team1.name, match.team2.name}:
+            minutes[team] = minutes.get(team, 0) + durations[match.id]
+            counts[team] = counts.get(team, 0) + 1
+    return max((minutes[team] + rest_period * (counts[team] - 1) for team in minutes), default=0.0)
+
+
+def sequence_bound(tournament: Tournament, matches: List[Match], durations: Dict[str, float]) -> float:
+    """Length of the longest chain of matches that must be played one after another."""
+    if tournament.has_bracket:
+        ids = [match.id for match in matches]
+        bracket = tournament.bracket.subgraph(ids)
+        # Matches outside the bracket are chains of their own
+        longest = max((durations[match_id] for match_id in ids), default=0.0)
+        return max(longest, bracket.critical_path_length(durations))
+
+    # Every round waits for all lower rounds, so each round adds its longest match
+    longest_per_round: Dict[int, float] = {}
+    for match in matches:
+        longest_per_round[match.round_number] = max(longest_per_round.get(match.round_number, 0),
+                                                     durations[match.id])
+    return float(sum(longest_per_round.values()))
+
+
+def schedule_bounds(tournament: Tournament, matches: List[Match], durations: Optional[Dict[str, float]] = None,
+                    idle_threshold: float = 10) -> ScheduleBounds:
+    """
+    Lower bounds on the span (first start to last end) and idle time of any
+    feasible schedule of the given matches.
+
+    durations overrides match durations by id, e.g. after disruptions.
+    Gaps of at most idle_threshold minutes do not count as idle time.
+    """
+    durations = {**{match.id: float(match.duration) for match in matches}, **(durations or {})}
+    venue = venue_load_bound(matches, durations)
+    team = team_load_bound(matches, durations, tournament.rest_period)
+    critical = sequence_bound(tournament, matches, durations)
+    makespan = max(venue, team, critical)
+
+    # Time not covered by any match, less the gaps that are too short to count
+    uncovered = makespan - sum(durations[match.id] for match in matches)
+    idle = max(0.0, uncovered - idle_threshold * max(0, len(matches) - 1))
+    return ScheduleBounds(venue_load=venue, team_load=team, critical_path=critical, makespan=makespan, idle_time=idle)
@@ -0,0 +1,166 @@
+"""
+Bracket dependencies between matches.
+
+A bracket is a directed acyclic graph over match ids. An edge from X to Y
+means the winner (or loser) of X plays in Y, so Y cannot start before X has
+ended. Only these true predecessor edges order matches. Two first-round
+matches of different titles, or a semi-final and an unrelated quarter-final,
+are not ordered at all, unlike with round numbers. Every check over the
+bracket is therefore linear in the number of edges.
+"""
+
+import heapq
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# What a dependency carries from one match into the next
+OUTCOMES = ("winner", "loser")
+
+# Placeholder team names that refer to another match, e.g. "Winner of M1" or "Loser QF2"
+_REFERENCE = re.compile(r"^(winner|loser)\s+(?:of\s+)?(?P<match_id>\S+)$", re.IGNORECASE)
+
+
+class BracketDAG:
+    """Match dependencies as a directed acyclic graph over match ids."""
+
+    def __init__(self):
+        """Initialize an empty bracket."""
+        self._successors: Dict[str, Dict[str, str]] = {}
+        self._predecessors: Dict[str, Dict[str, str]] = {}
+        self._order: Optional[List[str]] = None
+
+    @classmethod
+    def from_team_names(cls, matches) -> 'BracketDAG':
+        """Bracket inferred from "Winner of <id>" / "Loser of <id>" team names of the given matches."""
+        bracket = cls()
+        ids = {match.id for match in matches}
+        for match in matches:
+            bracket.add_match(match.id)
+            for team in (match.team1, match.team2):
+                reference = _REFERENCE.match(team.name.strip())
+                if reference and reference.group('match_id') in ids:
+                    bracket.add_dependency(reference.group('match_id'), match.id, reference.group(1).lower())
+        return bracket
+
+    def add_match(self, match_id: str) -> None:
+        """Add a match without dependencies."""
+        if match_id not in self._successors:
+            self._successors[match_id] = {}
+            self._predecessors[match_id] = {}
+            self._order = None
+
+    def add_dependency(self, source: str, target: str, outcome: str = "winner") -> None:
+        """Record that the winner (or loser) of match `source` plays in match `target`."""
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown dependency outcome: {outcome}")
+        if source == target:
+            raise ValueError(f"Match {source} cannot depend on itself")
+        self.add_match(source)
+        self.add_match(target)
+        self._successors[source][target] = outcome
+        self._predecessors[target][source] = outcome
+        self._order = None
+
+    def __contains__(self, match_id: str) -> bool:
+        return match_id in self._successors
+
+    @property
+    def nodes(self) -> List[str]:
+        """Match ids in the bracket, in insertion order."""
+        return list(self._successors)
+
+    @property
+    def n_edges(self) -> int:
+        """Number of dependencies."""
+        return sum(len(targets) for targets in self._successors.values())
+
+    @property
+    def edges(self) -> List[Tuple[str, str, str]]:
+        """Every dependency as (source, target, outcome)."""
+        return [(source, target, outcome)
+                for source, targets in self._successors.items()
+                for target, outcome in targets.items()]
+
+    def predecessors(self, match_id: str) -> List[str]:
+        """Matches whose result feeds the given match."""
+        return list(self._predecessors.get(match_id, ()))
+
+    def successors(self, match_id: str) -> List[str]:
+        """Matches the given match's result feeds."""
+        return list(self._successors.get(match_id, ()))
+
+    def adjacent(self, match1: str, match2: str) -> bool:
+        """Whether one match feeds the other directly."""
+        return match2 in self._successors.get(match1, ()) or match1 in self._successors.get(match2, ())
+
+    def topological_order(self) -> List[str]:
+        """Match ids with every match after its predecessors, ties broken by id (Kahn's algorithm)."""
+        if self._order is None:
+            indegree = {match_id: len(sources) for match_id, sources in self._predecessors.items()}
+            ready = [match_id for match_id, degree in indegree.items() if degree == 0]
+            heapq.heapify(ready)
+            order = []
+            while ready:
+                match_id = heapq.heappop(ready)
+                order.append(match_id)
+                for target in self._successors[match_id]:
+                    indegree[target] -= 1
+                    if indegree[target] == 0:
+                        heapq.heappush(ready, target)
+            if len(order) < len(indegree):
+                cycle = sorted(match_id for match_id, degree in indegree.items() if degree > 0)
+                raise ValueError(f"Bracket dependencies form a cycle through {', '.join(cycle)}")
+            self._order = order
+        return list(self._order)
+
+    def levels(self) -> Dict[str, int]:
+        """Length of the longest dependency chain leading into each match (0 without predecessors)."""
+        levels: Dict[str, int] = {}
+        for match_id in self.topological_order():
+            levels[match_id] = max((levels[source] + 1 for source in self._predecessors[match_id]), default=0)
+        return levels
+
+    def earliest_starts(self, durations: Dict[str, float], release: Optional[Dict[str, float]] = None,
+                        gap: float = 0) -> Dict[str, float]:
+        """
+        Earliest start of every match when each waits for its predecessors.
+
+        A match starts at its release time (0 by default) or `gap` minutes
+        after its latest predecessor ends, whichever is later.
+        """
+        release = release or {}
+        starts: Dict[str, float] = {}
+        for match_id in self.topological_order():
+            starts[match_id] = max([release.get(match_id, 0)] +
+                                   [starts[source] + durations[source] + gap
+                                    for source in self._predecessors[match_id]])
+        return starts
+
+    def critical_path(self, durations: Dict[str, float], gap: float = 0) -> Tuple[float, List[str]]:
+        """Length in minutes and match ids of the longest dependency chain."""
+        starts = self.earliest_starts(durations, gap=gap)
+        if not starts:
+            return 0.0, []
+        last = max(starts, key=lambda match_id: (starts[match_id] + durations[match_id], match_id))
+        path = [last]
+        while self._predecessors[path[-1]]:
+            # Follow the predecessor that determined the start
+            path.append(max(self._predecessors[path[-1]],
+                            key=lambda source: (starts[source] + durations[source], source)))
+        return float(starts[last] + durations[last]), path[::-1]
+
+    def critical_path_length(self, durations: Dict[str, float], gap: float = 0) -> float:
+        """Minutes from the first match start to the end of the longest dependency chain."""
+        return self.critical_path(durations, gap)[0]
+
+    def subgraph(self, match_ids: Iterable[str]) -> 'BracketDAG':
+        """Bracket restricted to the given matches and the dependencies between them."""
+        members = set(match_ids)
+        bracket = BracketDAG()
+        for match_id in self._successors:
+            if match_id in members:
+                bracket.add_match(match_id)
+        for source, target, outcome in self.edges:
+            if source in members and target in members:
+                bracket.add_dependency(source, target, outcome)
+        return bracket
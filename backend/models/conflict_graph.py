@@ -0,0 +1,192 @@
+"""
+Compact conflict graph backends for tournaments.
+
+Matches in different rounds always conflict, so the conflict graph of a
+large bracket is nearly complete. A networkx graph stores every edge as two
+dictionary entries, which is costly in memory and build time. The bitset
+graph here gives every match an integer slot and stores each adjacency row
+as one Python integer bitset. It exposes the subset of the networkx graph
+API that the schedulers and the tournament use, so it can replace
+``nx.Graph`` behind ``Tournament.conflict_graph``.
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from backend.models.models import Match
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of the set bits of a bitset, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitsetConflictGraph:
+    """Undirected graph of matches backed by integer adjacency bitsets."""
+
+    def __init__(self):
+        """Create an empty graph."""
+        # Slot i holds a match (or None once removed); slots are never reused,
+        # so iteration follows insertion order like networkx
+        self._matches: List[Optional[Match]] = []
+        self._adjacency: List[int] = []
+        self._slot_of: Dict[int, int] = {}
+        self._alive = 0
+
+    # Node access
+
+    def slot(self, match: Match) -> int:
+        """Integer slot of a match (nodes are keyed by object identity)."""
+        return self._slot_of[id(match)]
+
+    def match_at(self, slot: int) -> Match:
+        """Match stored in a slot."""
+        return self._matches[slot]
+
+    def neighbor_mask(self, match: Match) -> int:
+        """Adjacency bitset of a match over the graph slots."""
+        return self._adjacency[self.slot(match)]
+
+    def has_node(self, match: Match) -> bool:
+        return id(match) in self._slot_of
+
+    def __contains__(self, match: Match) -> bool:
+        return self.has_node(match)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __iter__(self) -> Iterator[Match]:
+        return iter(self.nodes)
+
+    @property
+    def nodes(self) -> List[Match]:
+        """Matches in insertion order."""
+        return [match for match in self._matches if match is not None]
+
+    @property
+    def edges(self) -> List[Tuple[Match, Match]]:
+        """Edges as (match, match) pairs, each listed once."""
+        return [
+            (self._matches[i], self._matches[j])
+            for i, row in enumerate(self._adjacency)
+            for j in iter_bits(row >> (i + 1) << (i + 1))
+        ]
+
+    def number_of_nodes(self) -> int:
+        return len(self)
+
+    def number_of_edges(self) -> int:
+        return sum(bin(row).count("1") for row in self._adjacency) // 2
+
+    def neighbors(self, match: Match) -> Iterator[Match]:
+        return (self._matches[j] for j in iter_bits(self.neighbor_mask(match)))
+
+    def __getitem__(self, match: Match) -> Dict[Match, dict]:
+        """Neighbour mapping, mirroring ``G[n]`` in networkx."""
+        return {neighbor: {} for neighbor in self.neighbors(match)}
+
+    def degree(self, match: Optional[Match] = None):
+        """Degree of a match, or (match, degree) pairs for every match."""
+        if match is not None:
+            return bin(self.neighbor_mask(match)).count("1")
+        return [(node, bin(self._adjacency[i]).count("1"))
+                for i, node in enumerate(self._matches) if node is not None]
+
+    def has_edge(self, match1: Match, match2: Match) -> bool:
+        slot1 = self._slot_of.get(id(match1))
+        slot2 = self._slot_of.get(id(match2))
+        if slot1 is None or slot2 is None:
+            return False
+        return bool(self._adjacency[slot1] >> slot2 & 1)
+
+    # Mutation
+
+    def add_node(self, match: Match) -> int:
+        """Add a match if it is not in the graph yet and return its slot."""
+        slot = self._slot_of.get(id(match))
+        if slot is None:
+            slot = len(self._matches)
+            self._slot_of[id(match)] = slot
+            self._matches.append(match)
+            self._adjacency.append(0)
+        return slot
+
+    def add_nodes_from(self, matches: Iterable[Match]) -> None:
+        for match in matches:
+            self.add_node(match)
+
+    def add_edge(self, match1: Match, match2: Match) -> None:
+        slot1 = self.add_node(match1)
+        slot2 = self.add_node(match2)
+        self._adjacency[slot1] |= 1 << slot2
+        self._adjacency[slot2] |= 1 << slot1
+
+    def add_edges_from(self, edges: Iterable[Tuple[Match, Match]]) -> None:
+        adjacency = self._adjacency
+        for match1, match2 in edges:
+            slot1 = self.add_node(match1)
+            slot2 = self.add_node(match2)
+            adjacency[slot1] |= 1 << slot2
+            adjacency[slot2] |= 1 << slot1
+
+    def remove_edge(self, match1: Match, match2: Match) -> None:
+        if not self.has_edge(match1, match2):
+            raise nx.NetworkXError(f"The edge {match1.id}-{match2.id} is not in the graph")
+        slot1, slot2 = self.slot(match1), self.slot(match2)
+        self._adjacency[slot1] &= ~(1 << slot2)
+        self._adjacency[slot2] &= ~(1 << slot1)
+
+    def remove_node(self, match: Match) -> None:
+        slot = self._slot_of.pop(id(match), None)
+        if slot is None:
+            raise nx.NetworkXError(f"The node {match.id} is not in the graph")
+        clear = ~(1 << slot)
+        for neighbor in iter_bits(self._adjacency[slot]):
+            self._adjacency[neighbor] &= clear
+        self._adjacency[slot] = 0
+        self._matches[slot] = None
+
+    # Conversion
+
+    def to_csr(self) -> Tuple[List[Match], np.ndarray, np.ndarray]:
+        """
+        Export as compressed sparse rows over the live nodes.
+
+        Returns (nodes, indptr, indices): the neighbours of ``nodes[i]`` are
+        ``nodes[k]`` for ``k`` in ``indices[indptr[i]:indptr[i + 1]]``.
+        """
+        live = [i for i, match in enumerate(self._matches) if match is not None]
+        position = {slot: k for k, slot in enumerate(live)}
+        indptr = np.zeros(len(live) + 1, dtype=np.int64)
+        indices: List[int] = []
+        for k, slot in enumerate(live):
+            indices.extend(position[j] for j in iter_bits(self._adjacency[slot]))
+            indptr[k + 1] = len(indices)
+        return [self._matches[slot] for slot in live], indptr, np.array(indices, dtype=np.int64)
+
+    def to_networkx(self) -> nx.Graph:
+        """Copy into a networkx graph."""
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes)
+        graph.add_edges_from(self.edges)
+        return graph
+
+
+# Conflict graph backends selectable on Tournament
+CONFLICT_GRAPH_BACKENDS: Dict[str, Callable[[], object]] = {
+    "networkx": nx.Graph,
+    "bitset": BitsetConflictGraph,
+}
+
+
+def create_conflict_graph(backend: str = "networkx"):
+    """Create an empty conflict graph for the given backend name."""
+    if backend not in CONFLICT_GRAPH_BACKENDS:
+        raise ValueError(f"Unknown conflict graph backend: {backend}")
+    return CONFLICT_GRAPH_BACKENDS[backend]()
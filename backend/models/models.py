@@ -2,50 +2,168 @@
 Data models for the esports tournament scheduling system.
 """
 
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone, tzinfo as tzinfo_type
 from enum import Enum
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, Hashable, List, Tuple, Optional, Set, Union
+import weakref
 
 class GameType(str, Enum):
     """Types of games in the tournament."""
     MOBILE_LEGENDS = "ML"
     VALORANT = "Val"
 
-@dataclass
+def venue_key(game_type) -> Hashable:
+    """Normalize a game type so that ``GameType.VALORANT`` and ``"Val"`` index together."""
+    return getattr(game_type, 'value', game_type)
+
+# Epochs of the integer-minute time model, for naive and time-zone aware datetimes
+EPOCH = datetime(2000, 1, 1)
+EPOCH_UTC = EPOCH.replace(tzinfo=timezone.utc)
+
+# Minutes since the epoch: an int for whole-minute times, a float otherwise
+Minutes = Union[int, float]
+
+def to_minutes(moment: datetime) -> Minutes:
+    """Minutes from the epoch to a datetime (aware datetimes count from the UTC epoch)."""
+    delta = moment - (EPOCH if moment.tzinfo is None else EPOCH_UTC)
+    if delta.seconds % 60 or delta.microseconds:
+        return delta / timedelta(minutes=1)
+    return delta.days * 1440 + delta.seconds // 60
+
+def from_minutes(minutes: Minutes, tzinfo: Optional[tzinfo_type] = None) -> datetime:
+    """The datetime at some minutes from the epoch, in the given time zone (naive without one)."""
+    if tzinfo is None:
+        return EPOCH + timedelta(minutes=minutes)
+    return (EPOCH_UTC + timedelta(minutes=minutes)).astimezone(tzinfo)
+
 class Team:
     """Represents a team participating in the tournament."""
-    id: int
-    name: str
-    game_type: GameType
-    matches_played: int = 0
+    
+    __slots__ = ('id', 'name', 'game_type', 'matches_played')
+    
+    def __init__(self, id: int, name: str, game_type: GameType, matches_played: int = 0):
+        self.id = id
+        self.name = name
+        self.game_type = game_type
+        self.matches_played = matches_played
+    
+    def __repr__(self):
+        return (f"Team(id={self.id!r}, name={self.name!r}, game_type={self.game_type!r}, "
+                f"matches_played={self.matches_played!r})")
+    
+    def _fields(self) -> tuple:
+        return (self.id, self.name, self.game_type, self.matches_played)
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
     
     def __hash__(self):
         return hash((self.id, self.name))
 
-@dataclass
 class Match:
-    """Represents a match between two teams."""
-    id: str
-    team1: Team
-    team2: Team
-    duration: int  # in minutes
-    game_type: GameType
-    round_number: int
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
-    is_fixed_time: bool = False  # If True, start time cannot be moved by the scheduler
-    is_break: bool = False       # If True, this is a break (lunch, etc.), not a match
-    description: str = ""        # Additional description (e.g., "Lunch Break", "Finals")
+    """
+    Represents a match between two teams.
     
-    def __post_init__(self):
-        if self.start_time and not self.end_time:
-            self.end_time = self.start_time + timedelta(minutes=self.duration)
+    Times are stored as minutes since the epoch (``start_minute``/``end_minute``)
+    plus the time zone they were given in; ``start_time`` and ``end_time`` are
+    datetime views of them for the API, CSV and CLI. The minutes are read
+    directly but only set through ``set_minutes`` or the datetime views, which
+    keep the schedules' time indexes up to date.
+    """
+    
+    __slots__ = ('id', 'team1', 'team2', 'duration', 'game_type', 'round_number', 'is_fixed_time',
+                 'is_break', 'description', 'tzinfo', 'start_minute', 'end_minute', '_schedules')
+    
+    def __init__(self, id: str, team1: Team, team2: Team, duration: int, game_type: GameType,
+                 round_number: int, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                 is_fixed_time: bool = False, is_break: bool = False, description: str = ""):
+        self.id = id
+        self.team1 = team1
+        self.team2 = team2
+        self.duration = duration  # in minutes
+        self.game_type = game_type
+        self.round_number = round_number
+        self.is_fixed_time = is_fixed_time  # If True, start time cannot be moved by the scheduler
+        self.is_break = is_break            # If True, this is a break (lunch, etc.), not a match
+        self.description = description      # Additional description (e.g., "Lunch Break", "Finals")
+        self._schedules: Tuple[weakref.ref, ...] = ()
+        self.tzinfo = start_time.tzinfo if start_time is not None else None
+        self.start_minute: Optional[Minutes] = to_minutes(start_time) if start_time is not None else None
+        self.end_minute: Optional[Minutes] = to_minutes(end_time) if end_time is not None else None
+        if self.start_minute is not None and self.end_minute is None:
+            self.end_minute = self.start_minute + duration
+    
+    def __repr__(self):
+        return (f"Match(id={self.id!r}, team1={self.team1!r}, team2={self.team2!r}, duration={self.duration!r}, "
+                f"game_type={self.game_type!r}, round_number={self.round_number!r}, "
+                f"start_time={self.start_time!r}, end_time={self.end_time!r}, "
+                f"is_fixed_time={self.is_fixed_time!r}, is_break={self.is_break!r}, "
+                f"description={self.description!r})")
+    
+    def _fields(self) -> tuple:
+        return (self.id, self.team1, self.team2, self.duration, self.game_type, self.round_number,
+                self.start_minute, self.end_minute, self.tzinfo is None, self.is_fixed_time, self.is_break, self.description)
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    def __getstate__(self):
+        # Schedule registrations are rebuilt by the schedule that owns the match
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_schedules'}
+    
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self._schedules = ()
+    
+    def _register(self, schedule: 'Schedule'):
+        """Register a schedule (or tournament) whose indexes must follow this match's times."""
+        self._schedules = tuple(ref for ref in self._schedules if ref() is not None) + (weakref.ref(schedule),)
+    
+    def _moved(self, attribute: str):
+        """Keep the time indexes of every schedule holding this match up to date."""
+        for ref in self._schedules:
+            schedule = ref()
+            if schedule is not None:
+                schedule._reindex(self, attribute)
+    
+    @property
+    def start_time(self) -> Optional[datetime]:
+        return from_minutes(self.start_minute, self.tzinfo) if self.start_minute is not None else None
+    
+    @start_time.setter
+    def start_time(self, value: Optional[datetime]):
+        self.start_minute = to_minutes(value) if value is not None else None
+        if value is not None:
+            self.tzinfo = value.tzinfo
+        self._moved('start_time')
+    
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return from_minutes(self.end_minute, self.tzinfo) if self.end_minute is not None else None
+    
+    @end_time.setter
+    def end_time(self, value: Optional[datetime]):
+        self.end_minute = to_minutes(value) if value is not None else None
+        self._moved('end_time')
     
     def set_time(self, start_time: datetime):
         """Set the start time and calculate the end time."""
-        self.start_time = start_time
-        self.end_time = start_time + timedelta(minutes=self.duration)
+        self.tzinfo = start_time.tzinfo
+        self.set_minutes(to_minutes(start_time))
+    
+    def set_minutes(self, start: Minutes, end: Optional[Minutes] = None):
+        """Set the start (and end, by default start plus duration) in minutes since the epoch."""
+        self.start_minute = start
+        self._moved('start_time')
+        self.end_minute = start + self.duration if end is None else end
+        self._moved('end_time')
     
     def __hash__(self):
         return hash((self.id, self.team1.id, self.team2.id))
@@ -60,26 +178,118 @@ class Match:
         """Check if this match is considered important (semifinals or finals)."""
         return self.round_number >= 2 or "final" in self.description.lower() or "semi" in self.description.lower()
 
+class _TimeIndex:
+    """Matches bucketed by key (team, venue) and kept sorted by one time attribute (in minutes)."""
+    
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+        self.buckets: Dict[Hashable, List[Tuple[Minutes, int, Match]]] = {}
+        self._entries: Dict[int, Tuple[Tuple[Hashable, ...], int, Optional[Tuple[Minutes, int, Match]]]] = {}
+    
+    def add(self, match: Match, keys: Tuple[Hashable, ...], seq: int):
+        """Index a match under the given bucket keys."""
+        self._entries[id(match)] = (keys, seq, None)
+        self.update(match)
+    
+    def update(self, match: Match):
+        """Move a match to the position matching its current time."""
+        keys, seq, entry = self._entries[id(match)]
+        if entry is not None:
+            for key in keys:
+                bucket = self.buckets[key]
+                del bucket[bisect_left(bucket, entry)]
+        
+        moment = getattr(match, self.attribute)
+        entry = (moment, seq, match) if moment is not None else None
+        if entry is not None:
+            for key in keys:
+                insort(self.buckets.setdefault(key, []), entry)
+        self._entries[id(match)] = (keys, seq, entry)
+    
+    def range(self, key: Hashable, after: Optional[datetime] = None, before: Optional[datetime] = None,
+              inclusive: bool = True) -> List[Match]:
+        """Matches in a bucket with time in [after, before), or (after, before) if not inclusive."""
+        bucket = self.buckets.get(key, [])
+        lo = 0
+        if after is not None:
+            after = to_minutes(after)
+            lo = bisect_left(bucket, (after,)) if inclusive else bisect_right(bucket, (after, float('inf')))
+        hi = bisect_left(bucket, (to_minutes(before),)) if before is not None else len(bucket)
+        return [entry[2] for entry in bucket[lo:hi]]
+
 @dataclass
 class Schedule:
     """Represents a tournament schedule."""
     matches: List[Match] = field(default_factory=list)
     
+    def __post_init__(self):
+        # Indexes maintained alongside the match list
+        self._by_id: Dict[str, Match] = {}
+        self._order: Dict[int, int] = {}
+        self._team_starts = _TimeIndex('start_minute')
+        self._team_ends = _TimeIndex('end_minute')
+        self._venue_starts = _TimeIndex('start_minute')
+        for match in self.matches:
+            self._index(match)
+    
+    def __getstate__(self):
+        return {'matches': self.matches}
+    
+    def __setstate__(self, state):
+        self.matches = state['matches']
+        self.__post_init__()
+    
+    def _index(self, match: Match):
+        """Add a match to the id, team and venue indexes."""
+        if id(match) in self._order:
+            return  # The same match object was already indexed
+        seq = len(self._order)
+        self._order[id(match)] = seq
+        self._by_id.setdefault(match.id, match)
+        
+        teams = tuple({match.team1.name, match.team2.name})
+        self._team_starts.add(match, teams, seq)
+        self._team_ends.add(match, teams, seq)
+        self._venue_starts.add(match, (venue_key(match.game_type),), seq)
+        match._register(self)
+    
+    def _reindex(self, match: Match, attribute: str):
+        """Re-sort a match after one of its times changed."""
+        if id(match) not in self._order:
+            return
+        if attribute == 'start_time':
+            self._team_starts.update(match)
+            self._venue_starts.update(match)
+        else:
+            self._team_ends.update(match)
+    
     def add_match(self, match: Match):
         """Add a match to the schedule."""
         self.matches.append(match)
+        self._index(match)
     
     def find_match(self, match_id: str) -> Optional[Match]:
         """Find a match by ID."""
-        for match in self.matches:
-            if match.id == match_id:
-                return match
-        return None
+        return self._by_id.get(match_id)
+    
+    def matches_for_team(self, team_name: str, after: Optional[datetime] = None,
+                         before: Optional[datetime] = None) -> List[Match]:
+        """A team's matches starting in [after, before), sorted by start time."""
+        return self._team_starts.range(team_name, after, before)
+    
+    def matches_for_venue(self, game_type, after: Optional[datetime] = None,
+                          before: Optional[datetime] = None) -> List[Match]:
+        """A venue's (game type's) matches starting in [after, before), sorted by start time."""
+        return self._venue_starts.range(venue_key(game_type), after, before)
+    
+    def team_matches_ending_after(self, team_name: str, moment: datetime) -> List[Match]:
+        """A team's matches that end strictly after the given moment, sorted by end time."""
+        return self._team_ends.range(team_name, moment, inclusive=False)
     
     def conflicts_with(self, match: Match, other_match: Match) -> bool:
         """Check if two matches conflict with each other."""
         # If either match doesn't have times set, they don't conflict
-        if not match.start_time or not other_match.start_time:
+        if match.start_minute is None or other_match.start_minute is None:
             return False
         
         # Check for team overlap
@@ -89,11 +299,13 @@ class Schedule:
                         match.team2.name == other_match.team2.name)
         
         # Check for time overlap (whether the matches happen at the same time)
+        start, end = match.start_minute, match.end_minute
+        other_start, other_end = other_match.start_minute, other_match.end_minute
         time_overlap = (
-            (match.start_time <= other_match.start_time < match.end_time) or
-            (match.start_time < other_match.end_time <= match.end_time) or
-            (other_match.start_time <= match.start_time < other_match.end_time) or
-            (other_match.start_time < match.end_time <= other_match.end_time)
+            (start <= other_start < end) or
+            (start < other_end <= end) or
+            (other_start <= start < other_end) or
+            (other_start < end <= other_end)
         )
         
         # Treat matches of the same game type as using the same venue
@@ -104,34 +316,20 @@ class Schedule:
     
     def get_affected_matches(self, disrupted_match: Match) -> List[Match]:
         """Return all matches affected by a disruption to the given match."""
-        if not disrupted_match.start_time or not disrupted_match.end_time:
+        if disrupted_match.start_minute is None or disrupted_match.end_minute is None:
             return []
         
-        affected = []
-        for match in self.matches:
-            # Skip the disrupted match itself
-            if match.id == disrupted_match.id:
-                continue
-                
-            # A match is affected if:
-            # 1. It involves the same team(s) and starts after the disrupted match
-            teams_affected = (match.team1.name == disrupted_match.team1.name or
-                              match.team1.name == disrupted_match.team2.name or
-                              match.team2.name == disrupted_match.team1.name or
-                              match.team2.name == disrupted_match.team2.name)
-            
-            # 2. It uses the same venue (same game type) and starts after the disrupted match
-            venue_affected = match.game_type == disrupted_match.game_type
-            
-            # 3. It starts after the disrupted match's end time
-            time_affected = match.start_time >= disrupted_match.end_time
-            
-            if (teams_affected or venue_affected) and time_affected:
-                affected.append(match)
-                
+        # A match is affected if it shares a team or the venue (same game type)
+        # with the disrupted match and starts after the disrupted match ends
+        candidates = [
+            *self.matches_for_team(disrupted_match.team1.name, after=disrupted_match.end_time),
+            *self.matches_for_team(disrupted_match.team2.name, after=disrupted_match.end_time),
+            *self.matches_for_venue(disrupted_match.game_type, after=disrupted_match.end_time),
+        ]
+        affected = {id(match): match for match in candidates if match.id != disrupted_match.id}
+        
         # Sort by start time
-        affected.sort(key=lambda m: m.start_time)
-        return affected
+        return sorted(affected.values(), key=lambda m: (m.start_minute, self._order[id(m)]))
     
     def clone(self) -> 'Schedule':
         """Create a deep copy of the schedule."""
@@ -144,12 +342,13 @@ class Schedule:
                 duration=match.duration,
                 game_type=match.game_type,
                 round_number=match.round_number,
-                start_time=match.start_time,
-                end_time=match.end_time,
                 is_fixed_time=match.is_fixed_time,
                 is_break=match.is_break,
                 description=match.description
             )
+            # Copy the times in minutes, without datetime round trips
+            new_match.tzinfo = match.tzinfo
+            new_match.start_minute, new_match.end_minute = match.start_minute, match.end_minute
             new_schedule.add_match(new_match)
         return new_schedule
 
@@ -2,42 +2,134 @@
 Tournament class for creating and managing esports tournaments.
 """
 
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
 import random
-from typing import Dict, List, Tuple, Set
-import networkx as nx
+from typing import Dict, List, Optional, Tuple, Set
 
 from backend.models.models import GameType, Team, Match, Schedule
+from backend.models.bracket import BracketDAG
+from backend.models.conflict_graph import create_conflict_graph
+
+def daily_venue_windows(days: List[date], venue_start: time, venue_end: time) -> List[Tuple[datetime, datetime]]:
+    """Venue windows with the same opening hours on each of the given days."""
+    return [(datetime.combine(day, venue_start), datetime.combine(day, venue_end)) for day in sorted(days)]
 
 class Tournament:
     """Represents an esports tournament with teams and matches."""
     
-    def __init__(self, id: str, name: str, venue_start, venue_end, rest_period: int):
-        """Initialize a tournament with the given parameters."""
+    def __init__(self, id: str, name: str, venue_start, venue_end, rest_period: int,
+                 conflict_backend: str = "networkx",
+                 venue_windows: Optional[List[Tuple[datetime, datetime]]] = None):
+        """
+        Initialize a tournament with the given parameters.
+        
+        conflict_backend selects the conflict graph storage: "networkx" or the
+        compact "bitset" graph for large brackets.
+        
+        venue_windows lists the dated (open, close) times of every tournament day.
+        Without it the tournament is a single day, today, from venue_start to venue_end.
+        """
         self.id = id
         self.name = name
         self.venue_start = venue_start
         self.venue_end = venue_end
         self.rest_period = rest_period
+        self.conflict_backend = conflict_backend
+        
+        # One (open, close) window per tournament day, in date order
+        if venue_windows:
+            self.venue_windows = sorted(venue_windows)
+        else:
+            self.venue_windows = daily_venue_windows([datetime.today().date()], venue_start, venue_end)
         
         # Initialize empty lists
         self.teams = []
         self.matches = []
         
+        # Explicit match dependencies; without any, rounds and "Winner" teams order the matches
+        self.bracket = BracketDAG()
+        
         # Create conflict graph
-        self.conflict_graph = nx.Graph()
+        self._reset_conflict_graph()
+    
+    def _reset_conflict_graph(self):
+        """Start an empty conflict graph, rebuilt from the matches on the next update."""
+        self.conflict_graph = create_conflict_graph(self.conflict_backend)
+        
+        # Buckets of graph matches (keyed by object identity) for incremental edge updates
+        self._graph_matches: Dict[int, Match] = {}
+        self._team_buckets: Dict[str, Set[int]] = {}
+        self._round_buckets: Dict[int, Set[int]] = {}
+        self._id_buckets: Dict[str, Set[int]] = {}
+        self._winner_matches: Set[int] = set()
+        self._fixed_matches: Set[int] = set()
+        
+        # Graph matches whose times changed since their edges were computed
+        self._retimed: Set[int] = set()
     
     def add_teams(self, teams: List[Team]):
         """Add teams to the tournament."""
         self.teams.extend(teams)
     
+    def add_match(self, match: Match):
+        """Add a match to the tournament and connect it in the conflict graph."""
+        self.matches.append(match)
+        if id(match) not in self._graph_matches:
+            self._add_to_graph(match)
+        self._refresh_retimed()
+    
     def add_fixed_event(self, event_match: Match):
         """Add a fixed event like lunch break or finals to the tournament."""
-        self.matches.append(event_match)
-        self._update_conflict_graph()
+        self.add_match(event_match)
+    
+    def add_dependency(self, source_id: str, target_id: str, outcome: str = "winner"):
+        """
+        Record that the winner (or loser) of one match plays in another.
+        
+        Once a tournament has dependencies, only they order matches: rounds
+        and "Winner" team names no longer do.
+        """
+        had_bracket = self.has_bracket
+        self.bracket.add_dependency(source_id, target_id, outcome)
+        if had_bracket:
+            # Only the two matches gain an edge
+            for key in self._id_buckets.get(source_id, set()) | self._id_buckets.get(target_id, set()):
+                self._refresh(self._graph_matches[key])
+            self._refresh_retimed()
+        else:
+            self._reset_conflict_graph()
+            self._update_conflict_graph()
+    
+    def infer_dependencies(self) -> int:
+        """Add the dependencies named by "Winner of <id>" / "Loser of <id>" teams; returns how many."""
+        inferred = BracketDAG.from_team_names(self.matches)
+        added = 0
+        for source, target, outcome in inferred.edges:
+            if target not in self.bracket.successors(source):
+                self.add_dependency(source, target, outcome)
+                added += 1
+        return added
+    
+    @property
+    def has_bracket(self) -> bool:
+        """Whether explicit match dependencies order the matches."""
+        return self.bracket.n_edges > 0
+    
+    def sequence_levels(self, matches: List[Match]) -> Dict[str, int]:
+        """
+        Ordering level of each match: a match never has to wait for one of a
+        higher level. That is its bracket level with dependencies, its round
+        number without.
+        """
+        if not self.has_bracket:
+            return {match.id: match.round_number for match in matches}
+        levels = self.bracket.levels()
+        return {match.id: levels.get(match.id, 0) for match in matches}
     
     def mark_finals(self, match_ids: List[str]):
         """Mark specific matches as finals (fixed time)."""
+        marked = []
         for match in self.matches:
             if match.id in match_ids:
                 match.is_fixed_time = True
@@ -45,69 +137,174 @@ class Tournament:
                 # Make sure round number is high enough to be considered a final
                 if match.round_number < 3:
                     match.round_number = 3
+                marked.append(match)
+        
+        # Only the marked matches changed: recompute their edges
+        for match in marked:
+            if id(match) in self._graph_matches:
+                self._refresh(match)
+        self._refresh_retimed()
+    
+    @staticmethod
+    def _has_winner_team(match: Match) -> bool:
+        """Check if a match depends on earlier rounds through a "Winner of" team."""
+        return "Winner" in match.team1.name or "Winner" in match.team2.name
+    
+    @staticmethod
+    def _time_overlap(match1: Match, match2: Match) -> bool:
+        """Check if two scheduled matches overlap in time."""
+        if not (match1.start_time and match2.start_time):
+            return False
+        return (
+            (match1.start_time <= match2.start_time < match1.end_time) or
+            (match1.start_time < match2.end_time <= match1.end_time) or
+            (match2.start_time <= match1.start_time < match2.end_time) or
+            (match2.start_time < match1.end_time <= match2.end_time)
+        )
+    
+    def _static_conflict(self, match1: Match, match2: Match) -> bool:
+        """Conflicts that do not depend on match times."""
+        # 1. Team-based conflicts: matches with the same teams can't happen simultaneously
+        teams1 = {match1.team1.name, match1.team2.name}
+        teams2 = {match2.team1.name, match2.team2.name}
+        if teams1.intersection(teams2) and not (match1.is_break or match2.is_break):
+            return True
+        
+        # 2-3. With a bracket, only a direct dependency orders two matches
+        if self.has_bracket:
+            return self.bracket.adjacent(match1.id, match2.id)
         
-        # Update conflict graph to reflect the new constraints
+        # 2. Tournament round dependencies: different rounds can't be scheduled concurrently
+        if match1.round_number != match2.round_number:
+            return True
+        
+        # 3. "Winner of" dependencies: such matches must be sequenced after earlier rounds
+        return self._has_winner_team(match1) or self._has_winner_team(match2)
+    
+    def _conflicts(self, match1: Match, match2: Match) -> bool:
+        """Check if two matches conflict (edge in the conflict graph)."""
+        if self._static_conflict(match1, match2):
+            return True
+        
+        # 4. Fixed-time events and breaks conflict with all other matches during their time
+        return (match1.is_fixed_time or match2.is_fixed_time) and self._time_overlap(match1, match2)
+    
+    def _add_to_graph(self, match: Match):
+        """Add a match node and compute only its own edges from the buckets."""
+        key = id(match)
+        teams = {match.team1.name, match.team2.name}
+        
+        # Candidate neighbours come from hash lookups rather than a pairwise scan
+        if self.has_bracket:
+            candidates = set()
+            for other_id in self.bracket.predecessors(match.id) + self.bracket.successors(match.id):
+                candidates |= self._id_buckets.get(other_id, set())
+            if not match.is_break:
+                for team in teams:
+                    candidates |= self._team_buckets.get(team, set())
+        elif self._has_winner_team(match):
+            candidates = set(self._graph_matches)
+        else:
+            candidates = set(self._winner_matches)
+            candidates |= set(self._graph_matches) - self._round_buckets.get(match.round_number, set())
+            if not match.is_break:
+                for team in teams:
+                    candidates |= self._team_buckets.get(team, set())
+        
+        # Time-dependent conflicts with fixed-time events
+        if match.is_fixed_time:
+            overlap_candidates = self._graph_matches.keys() - candidates
+        else:
+            overlap_candidates = self._fixed_matches - candidates
+        candidates |= {other for other in overlap_candidates
+                       if self._time_overlap(match, self._graph_matches[other])}
+        
+        self.conflict_graph.add_node(match)
+        self.conflict_graph.add_edges_from((match, self._graph_matches[other]) for other in candidates)
+        
+        # Register the match in the buckets
+        self._graph_matches[key] = match
+        self._round_buckets.setdefault(match.round_number, set()).add(key)
+        self._id_buckets.setdefault(match.id, set()).add(key)
+        if not match.is_break:
+            for team in teams:
+                self._team_buckets.setdefault(team, set()).add(key)
+        if self._has_winner_team(match):
+            self._winner_matches.add(key)
+        if match.is_fixed_time:
+            self._fixed_matches.add(key)
+        
+        # Follow the match's times, like the schedules holding it
+        if not any(ref() is self for ref in match._schedules):
+            match._register(self)
+    
+    def _remove_from_graph(self, match: Match):
+        """Remove a match node, its edges and its bucket entries."""
+        key = id(match)
+        del self._graph_matches[key]
+        for bucket in [*self._team_buckets.values(), *self._round_buckets.values(),
+                       *self._id_buckets.values(), self._winner_matches, self._fixed_matches, self._retimed]:
+            bucket.discard(key)
+        if match in self.conflict_graph:
+            self.conflict_graph.remove_node(match)
+    
+    def _refresh(self, match: Match):
+        """Recompute all edges of a graph match."""
+        self._remove_from_graph(match)
+        self._add_to_graph(match)
+    
+    def _reindex(self, match: Match, attribute: str):
+        """Mark a graph match whose time changed; its edges are refreshed on the next update."""
+        if id(match) in self._graph_matches:
+            self._retimed.add(id(match))
+    
+    def _refresh_retimed(self):
+        """Recompute the edges of the matches moved in time, whose overlaps with fixed events may differ."""
+        for key in list(self._retimed):
+            self._refresh(self._graph_matches[key])
+        self._retimed.clear()
+    
+    def get_conflict_graph(self):
+        """Conflict graph brought up to date with the current matches."""
         self._update_conflict_graph()
+        return self.conflict_graph
     
     def _update_conflict_graph(self):
-        """Update the conflict graph based on current matches."""
-        # Reset the graph
-        self.conflict_graph = nx.Graph()
+        """Bring the conflict graph in line with matches assigned to the match list directly."""
+        current = {id(match): match for match in self.matches}
         
-        # Add all matches as nodes
-        for match in self.matches:
-            self.conflict_graph.add_node(match)
-        
-        # Add edges between matches that have conflicts
-        for i, match1 in enumerate(self.matches):
-            for match2 in self.matches[i+1:]:
-                # Start with no conflict
-                conflict = False
-                
-                # 1. Team-based conflicts: matches with the same teams can't happen simultaneously
-                teams1 = {match1.team1.name, match1.team2.name}
-                teams2 = {match2.team1.name, match2.team2.name}
-                
-                if teams1.intersection(teams2) and not (match1.is_break or match2.is_break):
-                    conflict = True
-                
-                # 2. Tournament round dependencies: matches from later rounds must happen after matches from earlier rounds
-                # This ensures that round 2 (semifinals) happens after round 1 (quarterfinals),
-                # and round 3 (finals) happens after round 2 (semifinals)
-                if match1.round_number != match2.round_number:
-                    conflict = True  # Different rounds can't be scheduled concurrently
-                
-                # 3. Handle "Winner of" dependencies
-                # If any team name contains "Winner", this match depends on earlier rounds
-                for team in [match1.team1, match1.team2, match2.team1, match2.team2]:
-                    if "Winner" in team.name:
-                        conflict = True  # Ensure proper sequencing for matches with "Winner of" teams
-                
-                # 4. Fixed-time events and breaks create conflicts with all other matches during their time
-                if match1.is_fixed_time or match2.is_fixed_time:
-                    # Check if they overlap in time
-                    if match1.start_time and match2.start_time:
-                        time_overlap = (
-                            (match1.start_time <= match2.start_time < match1.end_time) or
-                            (match1.start_time < match2.end_time <= match1.end_time) or
-                            (match2.start_time <= match1.start_time < match2.end_time) or
-                            (match2.start_time < match1.end_time <= match2.end_time)
-                        )
-                        if time_overlap:
-                            conflict = True
-                
-                # Add an edge to the conflict graph if any conflict was found
-                if conflict:
-                    self.conflict_graph.add_edge(match1, match2)
-    
-    def get_timeslots(self, interval_minutes: int = 5) -> List[datetime]:
-        """Generate possible timeslots based on venue hours."""
-        # Use today's date for simplicity
-        today = datetime.today().date()
-        
-        # Start time
-        current_time = datetime.combine(today, self.venue_start)
-        end_time = datetime.combine(today, self.venue_end)
+        # Drop matches that are no longer part of the tournament
+        for key in self._graph_matches.keys() - current.keys():
+            self._remove_from_graph(self._graph_matches[key])
+        
+        # Add new matches, computing edges for them alone
+        for key, match in current.items():
+            if key not in self._graph_matches:
+                self._add_to_graph(match)
+        self._refresh_retimed()
+    
+    @property
+    def n_days(self) -> int:
+        """Number of tournament days."""
+        return len(self.venue_windows)
+    
+    def day_of(self, moment: datetime) -> int:
+        """Index of the tournament day a moment falls on (the nearest earlier day between days)."""
+        days = [window_start.date() for window_start, _ in self.venue_windows]
+        return max(0, bisect_right(days, moment.date()) - 1)
+    
+    def day_tournament(self, day: int) -> 'Tournament':
+        """Single-day tournament for one venue window, with the same teams and rest period."""
+        window_start, window_end = self.venue_windows[day]
+        tournament = Tournament(self.id, self.name, window_start.time(), window_end.time(), self.rest_period,
+                                conflict_backend=self.conflict_backend, venue_windows=[(window_start, window_end)])
+        tournament.add_teams(self.teams)
+        tournament.bracket = self.bracket
+        return tournament
+    
+    def get_timeslots(self, interval_minutes: int = 5, day: int = 0) -> List[datetime]:
+        """Generate possible timeslots within the venue window of a tournament day."""
+        current_time, end_time = self.venue_windows[day]
         
         timeslots = []
         while current_time <= end_time:
@@ -118,19 +315,9 @@ class Tournament:
     
     def check_rest_period(self, schedule: Schedule, team: Team, start_time: datetime) -> bool:
         """Check if a team has enough rest before a match at the given start time."""
-        # Find all previous matches for this team
-        team_matches = [m for m in schedule.matches if 
-                       m.team1.name == team.name or 
-                       m.team2.name == team.name]
-        
-        # Check if there's enough rest time between matches
-        for match in team_matches:
-            if match.end_time:
-                rest_time = (start_time - match.end_time).total_seconds() / 60
-                if rest_time < self.rest_period:
-                    return False
-        
-        return True
+        # Any match of this team ending less than a rest period before the start is too close
+        threshold = start_time - timedelta(minutes=self.rest_period)
+        return not schedule.team_matches_ending_after(team.name, threshold)
     
     def is_valid_time(self, time: datetime) -> bool:
         """Check if the given time is within venue hours."""
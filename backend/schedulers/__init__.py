@@ -5,5 +5,8 @@ Contains scheduling algorithms for the esports tournament scheduler.
 """
 
 from .scheduler import GraphColoringScheduler, GeneticAlgorithmOptimizer
+from .context import ProblemContext
+from .fitness import PopulationEvaluator
+from .parallel import ParallelEvaluator
 
-__all__ = ['GraphColoringScheduler', 'GeneticAlgorithmOptimizer'] 
\ No newline at end of file
+__all__ = ['GraphColoringScheduler', 'GeneticAlgorithmOptimizer', 'ProblemContext', 'PopulationEvaluator', 'ParallelEvaluator'] 
\ No newline at end of file
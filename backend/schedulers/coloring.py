@@ -0,0 +1,56 @@
+"""
+DSATUR graph coloring over integer adjacency bitsets.
+
+Vertices are numbered 0..n-1 and ``masks[i]`` has bit ``j`` set when
+vertices ``i`` and ``j`` are adjacent. DSATUR repeatedly colors the
+uncolored vertex whose neighbours already use the most distinct colors,
+breaking ties by degree, and gives it the lowest color none of them use.
+A lazy max-heap keeps each step at O(log n) plus the vertex's degree.
+"""
+
+import heapq
+from typing import List, Sequence
+
+from backend.models.conflict_graph import iter_bits
+
+
+def popcount(mask: int) -> int:
+    """Number of set bits in a bitset."""
+    return bin(mask).count("1")
+
+
+def dsatur_coloring(masks: Sequence[int], priority: Sequence[int] = None) -> List[int]:
+    """
+    Color a graph given as adjacency bitsets and return the color of each vertex.
+
+    ``priority`` breaks remaining ties (lower first); it defaults to the vertex index.
+    """
+    n = len(masks)
+    priority = list(priority) if priority is not None else list(range(n))
+    degree = [popcount(mask) for mask in masks]
+    colors = [-1] * n
+
+    # Bitset of the colors already used by each vertex's neighbours
+    neighbor_colors = [0] * n
+    saturation = [0] * n
+    heap = [(0, -degree[i], priority[i], i) for i in range(n)]
+    heapq.heapify(heap)
+
+    while heap:
+        neg_saturation, _, _, i = heapq.heappop(heap)
+        if colors[i] != -1 or -neg_saturation != saturation[i]:
+            continue
+
+        # Lowest color not used by any neighbour
+        used = neighbor_colors[i]
+        color = (~used & (used + 1)).bit_length() - 1
+        colors[i] = color
+
+        bit = 1 << color
+        for j in iter_bits(masks[i]):
+            if colors[j] == -1 and not neighbor_colors[j] & bit:
+                neighbor_colors[j] |= bit
+                saturation[j] += 1
+                heapq.heappush(heap, (-saturation[j], -degree[j], priority[j], j))
+
+    return colors
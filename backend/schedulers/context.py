@@ -0,0 +1,264 @@
+"""
+Compiled problem context for the genetic algorithm optimizer.
+
+Everything that depends only on the tournament, the initial schedule and the
+disruptions is computed once here. That covers the genome order, the
+disrupted durations, the pinned start times, the original match order and
+the protected genome positions. Decoding, evaluation and mutation read
+from the context and do not rebuild it for every individual.
+
+With a "now" cutoff, matches that started before it are frozen. They are
+left out of the genome entirely and only bound the earliest start of the
+remaining matches at their venue, of their teams and of later rounds.
+A subproblem of a decomposed optimization is bounded the same way by the
+round ends of the matches left to the other subproblems.
+
+When the tournament has bracket dependencies, they replace the round
+numbers: only a match's true predecessors must end before it starts.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from backend.models.models import Match, Minutes, Schedule, Disruption, to_minutes, venue_key
+from backend.models.tournament import Tournament
+
+# Minimum setup time between consecutive matches (mirrors the optimizer)
+SETUP_TIME = 5
+
+
+def teams_overlap(match1: Match, match2: Match) -> bool:
+    """Check whether two matches share a team (by name)."""
+    return (match1.team1.name == match2.team1.name or
+            match1.team1.name == match2.team2.name or
+            match1.team2.name == match2.team1.name or
+            match1.team2.name == match2.team2.name)
+
+
+def minutes_of_day(moment) -> float:
+    """Convert a ``datetime.time`` to minutes since midnight."""
+    return moment.hour * 60 + moment.minute + moment.second / 60 + moment.microsecond / 60_000_000
+
+
+class ProblemContext:
+    """Immutable, index-ordered view of an optimization problem."""
+
+    def __init__(self, tournament: Tournament, initial_schedule: Schedule, disruptions: List[Disruption],
+                 now: Optional[datetime] = None, round_ends: Optional[Dict[int, datetime]] = None):
+        """Compile the decode invariants for a tournament, schedule and disruptions.
+
+        Matches that started before `now` are frozen out of the genome. Matches
+        of a round above one in `round_ends` start no earlier than its end.
+        """
+        self.rest_period = tournament.rest_period
+        self.venue_start_minutes = minutes_of_day(tournament.venue_start)
+        self.venue_end_minutes = minutes_of_day(tournament.venue_end)
+        all_matches = sorted(initial_schedule.matches, key=lambda m: m.id)
+
+        # All genome values are minutes relative to venue open on the schedule's first day,
+        # in the schedule's time zone (today for a schedule without times)
+        starts = [m.start_time for m in all_matches if m.start_time]
+        first_day = min(starts).date() if starts else datetime.today().date()
+        tzinfo = starts[0].tzinfo if starts else None
+        self.venue_open = datetime.combine(first_day, tournament.venue_start, tzinfo=tzinfo)
+        self.tzinfo = tzinfo
+        self.open_minute = to_minutes(self.venue_open)
+
+        # Matches already started (or played) at the cutoff keep their time and leave the genome
+        self.now = now
+        self.frozen_matches: List[Match] = [
+            m for m in all_matches if now is not None and m.start_time and m.start_time < now]
+        frozen_ids = {m.id for m in self.frozen_matches}
+
+        # Genome positions follow the id-sorted order of the remaining matches
+        self.matches: List[Match] = [m for m in all_matches if m.id not in frozen_ids]
+        self.n_matches = len(self.matches)
+        self.index_of: Dict[str, int] = {m.id: i for i, m in enumerate(self.matches)}
+
+        # Per-match duration changes from extended duration / early finish disruptions
+        self.duration_delta = np.zeros(self.n_matches, dtype=int)
+        for disruption in disruptions:
+            i = self.index_of.get(disruption.match.id)
+            if i is None:
+                continue
+            if disruption.type == "extended_duration":
+                self.duration_delta[i] += disruption.extra_minutes
+            elif disruption.type == "early_finish":
+                self.duration_delta[i] -= disruption.extra_minutes
+        self.durations = np.array([m.duration for m in self.matches], dtype=float) + self.duration_delta
+
+        # Original start times (NaN when the match was never scheduled)
+        self.original_start = np.array(
+            [m.start_minute - self.open_minute if m.start_minute is not None else np.nan for m in self.matches], dtype=float)
+        self.has_original = ~np.isnan(self.original_start)
+
+        # Late arrival matches keep their exact shifted start
+        self.late_arrival_ids: FrozenSet[str] = frozenset(
+            d.match.id for d in disruptions if d.type == "late_arrival")
+        late_arrival_times: Dict[int, datetime] = {}
+        for disruption in disruptions:
+            if disruption.type != "late_arrival":
+                continue
+            i = self.index_of.get(disruption.match.id)
+            if i is None or self.matches[i].is_fixed_time or not self.matches[i].start_time:
+                continue
+            base = late_arrival_times.get(i, self.matches[i].start_time)
+            late_arrival_times[i] = base + timedelta(minutes=disruption.extra_minutes)
+
+        # Start times that override the genome: fixed-time events first, then late arrivals
+        self.pinned_times: Dict[int, datetime] = {}
+        for i, match in enumerate(self.matches):
+            if match.is_fixed_time and match.start_time:
+                self.pinned_times[i] = match.start_time
+            elif i in late_arrival_times:
+                self.pinned_times[i] = late_arrival_times[i]
+        self.pinned = np.zeros(self.n_matches, dtype=bool)
+        self.pinned_start = np.zeros(self.n_matches, dtype=float)
+        for i, moment in self.pinned_times.items():
+            self.pinned[i] = True
+            self.pinned_start[i] = self.offset(moment)
+
+        self.fixed = np.array([m.is_fixed_time for m in self.matches], dtype=bool)
+        self.is_break = np.array([m.is_break for m in self.matches], dtype=bool)
+
+        # Bracket dependencies between remaining matches as (predecessor, successor) positions,
+        # or None when rounds order the matches
+        self.bracket = tournament.bracket if tournament.has_bracket else None
+        self.dependencies: Optional[List[Tuple[int, int]]] = None
+        if self.bracket is not None:
+            self.dependencies = [(self.index_of[source], self.index_of[target])
+                                 for source, target, _ in self.bracket.edges
+                                 if source in self.index_of and target in self.index_of]
+
+        # Earliest start of each match: venue open, or the cutoff and the frozen matches
+        self.earliest_start = np.zeros(self.n_matches, dtype=float)
+        self.frozen_duration_delta: Dict[str, int] = {}
+        if now is not None:
+            self._bound_by_frozen(disruptions)
+        if round_ends:
+            self._bound_by_rounds(round_ends)
+
+        # Release time of each match: free matches start no earlier than their original time
+        # (or the earliest start), pinned ones at their pin
+        self.release = np.maximum(self.earliest_start, np.where(self.has_original, self.original_start, 0.0))
+        self.release[self.pinned] = self.pinned_start[self.pinned]
+
+        # Original start-time order; non-fixed matches must keep their relative sequence
+        original_matches = sorted(self.matches,
+                                  key=lambda m: m.start_time if m.start_time else datetime.max)
+        self.original_order: List[str] = [m.id for m in original_matches]
+        self.chain: List[int] = [self.index_of[m.id] for m in original_matches if not m.is_fixed_time]
+        chain = self.chain
+        self.order_links: List[Tuple[int, int, int]] = [
+            (prev, cur, self.rest_period if teams_overlap(self.matches[prev], self.matches[cur]) else SETUP_TIME)
+            for prev, cur in zip(chain, chain[1:])
+        ]
+
+        # Genome positions the mutation operator must not touch
+        self.protected: FrozenSet[int] = frozenset(
+            i for i, m in enumerate(self.matches)
+            if m.is_fixed_time or m.is_break or m.id in self.late_arrival_ids)
+        self.mutable_positions: List[int] = [i for i in range(self.n_matches) if i not in self.protected]
+
+        # Disruption mix, used to pick the mutation strategy
+        self.has_extended_duration = any(d.type == "extended_duration" for d in disruptions)
+        self.has_late_arrival = any(d.type == "late_arrival" for d in disruptions)
+        self.has_early_finish = any(d.type == "early_finish" for d in disruptions)
+
+    def _bound_by_frozen(self, disruptions: List[Disruption]) -> None:
+        """Raise earliest starts to the cutoff and past the frozen matches they depend on."""
+        extra: Dict[str, int] = {}
+        for disruption in disruptions:
+            if disruption.type == "extended_duration":
+                extra[disruption.match.id] = extra.get(disruption.match.id, 0) + disruption.extra_minutes
+            elif disruption.type == "early_finish":
+                extra[disruption.match.id] = extra.get(disruption.match.id, 0) - disruption.extra_minutes
+
+        frozen_ids = {m.id for m in self.frozen_matches}
+        self.frozen_duration_delta = {match_id: delta for match_id, delta in extra.items() if match_id in frozen_ids}
+
+        # Latest frozen end per venue, per team and per round, and the end of each frozen match
+        venue_end: Dict[str, float] = {}
+        team_end: Dict[str, float] = {}
+        round_end: Dict[int, float] = {}
+        match_end: Dict[str, float] = {}
+        for match in self.frozen_matches:
+            end = match.start_minute - self.open_minute + match.duration + self.frozen_duration_delta.get(match.id, 0)
+            venue = venue_key(match.game_type)
+            venue_end[venue] = max(venue_end.get(venue, end), end)
+            for team in (match.team1.name, match.team2.name):
+                team_end[team] = max(team_end.get(team, end), end)
+            round_end[match.round_number] = max(round_end.get(match.round_number, end), end)
+            match_end[match.id] = end
+
+        cutoff = max(0.0, self.offset(self.now))
+        for i, match in enumerate(self.matches):
+            bounds = [cutoff]
+            if venue_key(match.game_type) in venue_end:
+                bounds.append(venue_end[venue_key(match.game_type)] + SETUP_TIME)
+            bounds.extend(team_end[team] + self.rest_period
+                          for team in (match.team1.name, match.team2.name) if team in team_end)
+            if self.bracket is not None:
+                bounds.extend(match_end[source] for source in self.bracket.predecessors(match.id)
+                              if source in match_end)
+            else:
+                bounds.extend(end for round_number, end in round_end.items() if round_number < match.round_number)
+            self.earliest_start[i] = max(bounds)
+
+    def _bound_by_rounds(self, round_ends: Dict[int, datetime]) -> None:
+        """Raise earliest starts past the end of every lower round outside the problem."""
+        ends = {round_number: self.offset(end) for round_number, end in round_ends.items()}
+        for i, match in enumerate(self.matches):
+            bounds = [end for round_number, end in ends.items() if round_number < match.round_number]
+            if bounds:
+                self.earliest_start[i] = max(self.earliest_start[i], max(bounds))
+
+    @staticmethod
+    def _copy(match: Match, duration: int) -> Match:
+        """Unscheduled copy of a match with the given duration."""
+        return Match(
+            id=match.id,
+            team1=match.team1,
+            team2=match.team2,
+            duration=duration,
+            game_type=match.game_type,
+            round_number=match.round_number,
+            is_fixed_time=match.is_fixed_time,
+            is_break=match.is_break,
+            description=match.description
+        )
+
+    def frozen_copies(self) -> List[Match]:
+        """Copies of the frozen matches at their own time, with their disrupted duration."""
+        copies = []
+        for match in self.frozen_matches:
+            frozen = self._copy(match, match.duration + self.frozen_duration_delta.get(match.id, 0))
+            frozen.tzinfo = match.tzinfo
+            frozen.set_minutes(match.start_minute)
+            copies.append(frozen)
+        return copies
+
+    def decoded_match(self, i: int, start: float) -> Match:
+        """Copy of the match at genome position i with its disrupted duration, starting at the given offset.
+
+        Fixed-time events and late arrivals keep their pinned start instead.
+        """
+        match = self.matches[i]
+        decoded = self._copy(match, match.duration + int(self.duration_delta[i]))
+        decoded.tzinfo = self.tzinfo
+        if i in self.pinned_times:
+            decoded.set_time(self.pinned_times[i])
+        else:
+            decoded.set_minutes(self.epoch_minutes(start))
+        return decoded
+
+    def offset(self, moment: datetime) -> float:
+        """Minutes from venue open to the given moment."""
+        return to_minutes(moment) - self.open_minute
+
+    def epoch_minutes(self, offset: float) -> Minutes:
+        """Minutes since the epoch of an offset from venue open (an int when whole)."""
+        minutes = self.open_minute + offset
+        return int(minutes) if float(minutes).is_integer() else float(minutes)
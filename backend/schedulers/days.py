@@ -0,0 +1,266 @@
+"""
+Multi-day tournaments: day assignment and per-day scheduling.
+
+A tournament with several dated venue windows is scheduled in two stages.
+``assign_days`` first gives every match a day. Fixed-time events stay on the
+day of their time, and the other matches fill the days in round order (bracket
+level order with dependencies), so a round never lands on an earlier day than
+a lower round. Teams rest and
+venues reset overnight, so every day is then an independent single-day
+problem. ``MultiDayScheduler`` assigns times to the days in parallel worker
+processes.
+
+``MultiDayOptimizer`` handles disruptions. Days before the first disrupted
+day keep their schedule. Every disrupted day is re-optimized on its own, in
+parallel. Matches pushed past a day's closing time move to the next day,
+which is then re-optimized with them; later days without disruptions or
+carried matches are left as they are.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from deap import tools
+
+from backend.models.models import Match, Schedule, Disruption, venue_key
+from backend.models.tournament import Tournament
+from backend.schedulers.context import SETUP_TIME
+from backend.schedulers.decompose import solve_component, subproblem_options, sum_logbooks
+from backend.schedulers.scheduler import GraphColoringScheduler, GeneticAlgorithmOptimizer
+
+
+def _map_days(func, tasks: List[tuple], processes: int) -> List:
+    """Apply func to every task, in worker processes unless one process is enough."""
+    processes = min(len(tasks), processes or os.cpu_count() or 1)
+    if processes <= 1:
+        return [func(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(func, *zip(*tasks)))
+
+
+def assign_days(tournament: Tournament, matches: List[Match]) -> List[List[Match]]:
+    """
+    Matches of each tournament day.
+
+    A day is full when the estimated length of its schedule would exceed its
+    window: per round, the busiest venue's match minutes (plus setup time),
+    summed over rounds, plus the fixed-time events of the day. Matches that
+    fit nowhere stay on the last day.
+    """
+    n_days = tournament.n_days
+    days: List[List[Match]] = [[] for _ in range(n_days)]
+    capacity = [(close - open_).total_seconds() / 60 for open_, close in tournament.venue_windows]
+    used = [0.0] * n_days
+
+    # Fixed-time events keep their day and take its time
+    free = []
+    for match in matches:
+        if match.is_fixed_time and match.start_time:
+            day = tournament.day_of(match.start_time)
+            days[day].append(match)
+            used[day] += match.duration
+        else:
+            free.append(match)
+
+    # Minutes per day, round and venue, and the busiest venue per day and round
+    levels = tournament.sequence_levels(free)
+    loads: List[Dict[Tuple[int, object], float]] = [{} for _ in range(n_days)]
+    busiest: List[Dict[int, float]] = [{} for _ in range(n_days)]
+    day = 0
+    for match in sorted(free, key=lambda m: levels[m.id]):
+        level = levels[match.id]
+        key = (level, venue_key(match.game_type))
+        minutes = match.duration + SETUP_TIME
+        while day < n_days - 1:
+            round_load = max(busiest[day].get(level, 0), loads[day].get(key, 0) + minutes)
+            if used[day] - busiest[day].get(level, 0) + round_load <= capacity[day]:
+                break
+            day += 1
+
+        loads[day][key] = loads[day].get(key, 0) + minutes
+        round_load = max(busiest[day].get(level, 0), loads[day][key])
+        used[day] += round_load - busiest[day].get(level, 0)
+        busiest[day][level] = round_load
+        days[day].append(match)
+    return days
+
+
+def schedule_day(tournament: Tournament, matches: List[Match], mode: str,
+                 slot_interval: int) -> Tuple[List[Tuple[str, Optional[datetime]]], List[str]]:
+    """Assign times to one day's matches inside a worker process."""
+    for match in matches:
+        tournament.add_match(match)
+    scheduler = GraphColoringScheduler(tournament, mode=mode, slot_interval=slot_interval)
+    schedule = scheduler.generate_schedule()
+    return ([(match.id, match.start_time) for match in schedule.matches],
+            [match.id for match in scheduler.unscheduled_matches])
+
+
+class MultiDayScheduler:
+    """Assign matches to tournament days, then schedule the days in parallel."""
+
+    def __init__(self, tournament: Tournament, mode: str = "dsatur", slot_interval: int = 5, processes: int = 0):
+        """
+        Initialize with a tournament.
+
+        mode and slot_interval are those of GraphColoringScheduler. Days are
+        scheduled in up to `processes` worker processes (0 = all cores, 1 = in
+        this process).
+        """
+        self.tournament = tournament
+        self.mode = mode
+        self.slot_interval = slot_interval
+        self.processes = processes
+        self.days: List[List[Match]] = []
+
+        # Matches that did not fit within their day's venue window in the last run
+        self.unscheduled_matches: List[Match] = []
+
+    def generate_schedule(self) -> Schedule:
+        """Generate a schedule over every tournament day."""
+        self.days = assign_days(self.tournament, self.tournament.matches)
+        tasks = [(self.tournament.day_tournament(day), matches, self.mode, self.slot_interval)
+                 for day, matches in enumerate(self.days) if matches]
+        results = _map_days(schedule_day, tasks, self.processes)
+
+        # Workers schedule copies of the matches; copy their times back
+        by_id = {match.id: match for match in self.tournament.matches}
+        self.unscheduled_matches = []
+        scheduled = []
+        for times, unscheduled in results:
+            for match_id, start_time in times:
+                match = by_id[match_id]
+                if start_time is not None and match.start_time != start_time:
+                    match.set_time(start_time)
+                scheduled.append(match)
+            self.unscheduled_matches.extend(by_id[match_id] for match_id in unscheduled)
+
+        schedule = Schedule()
+        for match in sorted(scheduled, key=lambda m: m.start_time):
+            schedule.add_match(match)
+        return schedule
+
+
+class MultiDayOptimizer:
+    """Re-optimize only the disrupted days of a multi-day schedule, and the days they spill into."""
+
+    def __init__(self, tournament: Tournament, initial_schedule: Schedule, disruptions: List[Disruption],
+                 optimizer_class=GeneticAlgorithmOptimizer, processes: int = 0, **options):
+        """
+        Initialize with a tournament, initial schedule, and disruptions.
+
+        Each re-optimized day is solved by an optimizer_class built with the
+        given options, on that day's venue window. Disrupted days run in up to
+        `processes` worker processes (0 = all cores, 1 = in this process).
+        """
+        self.tournament = tournament
+        self.initial_schedule = initial_schedule
+        self.disruptions = disruptions
+        self.optimizer_class = optimizer_class
+        self.processes = processes
+        self.options = options
+
+        # Matches per day of their current start time
+        self.days: List[List[Match]] = [[] for _ in range(tournament.n_days)]
+        for match in initial_schedule.matches:
+            day = tournament.day_of(match.start_time) if match.start_time else 0
+            self.days[day].append(match)
+        self.day_of_match = {match.id: day for day, matches in enumerate(self.days) for match in matches}
+        self.affected_days = sorted({self.day_of_match[d.match.id] for d in disruptions
+                                     if d.match.id in self.day_of_match})
+
+        self.optimized_days: List[int] = []
+        self.carried: Dict[int, List[str]] = {}
+        self.day_logbooks = {}
+        self.logbook = None
+        self.stop_reason = None
+
+    def _day_task(self, day: int, carried: List[Match]) -> tuple:
+        """Arguments of solve_component for one day, with matches carried over from the day before."""
+        schedule = Schedule()
+        for match in self.days[day]:
+            schedule.add_match(match)
+        for match in carried:
+            schedule.add_match(match)
+        members = {match.id for match in self.days[day]}
+        disruptions = [d for d in self.disruptions if d.match.id in members]
+        return (self.optimizer_class, self.tournament.day_tournament(day), schedule, disruptions,
+                subproblem_options(self.options, day))
+
+    def _overflow(self, day: int, schedule: Schedule) -> List[Match]:
+        """Movable matches of a day's result that end after its venue window closes."""
+        close = self.tournament.venue_windows[day][1]
+        overflow = []
+        for match in schedule.matches:
+            if match.is_fixed_time or match.is_break or not match.end_time:
+                continue
+            if match.end_time > close.replace(tzinfo=match.end_time.tzinfo):
+                overflow.append(match)
+        return overflow
+
+    def _carry(self, day: int, matches: List[Match]) -> List[Match]:
+        """Copies of overflowing matches, starting when the next day opens."""
+        opening = self.tournament.venue_windows[day][0]
+        carried = []
+        for match in matches:
+            copy = Schedule(matches=[match]).clone().matches[0]
+            copy.set_time(opening.replace(tzinfo=match.start_time.tzinfo))
+            carried.append(copy)
+        return carried
+
+    def optimize(self) -> Schedule:
+        """Re-optimize the affected days and return the schedule over every day."""
+        results: Dict[int, Schedule] = {}
+        logbooks = {}
+        reasons = {}
+
+        def store(day: int, result: Dict) -> None:
+            results[day] = result['schedule']
+            logbooks[day] = result['logbook']
+            reasons[day] = result['stop_reason']
+
+        # Disrupted days are independent of each other and run in parallel
+        tasks = [self._day_task(day, []) for day in self.affected_days]
+        for day, result in zip(self.affected_days, _map_days(solve_component, tasks, self.processes)):
+            store(day, result)
+
+        # Matches that no longer fit move to the next day, which is then solved again with them
+        first = self.affected_days[0] if self.affected_days else self.tournament.n_days
+        for day in range(first, self.tournament.n_days - 1):
+            if day not in results:
+                continue
+            overflow = self._overflow(day, results[day])
+            if not overflow:
+                continue
+            overflow_ids = {match.id for match in overflow}
+            kept = Schedule()
+            for match in results[day].matches:
+                if match.id not in overflow_ids:
+                    kept.add_match(match)
+            results[day] = kept
+
+            carried = self._carry(day + 1, overflow)
+            self.carried[day + 1] = [match.id for match in carried]
+            store(day + 1, solve_component(*self._day_task(day + 1, carried)))
+
+        self.optimized_days = sorted(results)
+        self.day_logbooks = logbooks
+        if logbooks:
+            self.logbook = sum_logbooks([logbooks[day] for day in sorted(logbooks)])
+            self.stop_reason = "/".join(sorted(set(reasons.values())))
+        else:
+            # No disruption falls on any day, so nothing was searched
+            self.logbook = tools.Logbook()
+            self.logbook.header = ['gen', 'nevals', 'min']
+            self.logbook.record(gen=0, nevals=0, min=0)
+            self.stop_reason = "no affected days"
+
+        # Days that were not re-optimized keep their matches as they were
+        schedule = Schedule()
+        for day, matches in enumerate(self.days):
+            day_schedule = results[day] if day in results else Schedule(matches=list(matches)).clone()
+            for match in day_schedule.matches:
+                schedule.add_match(match)
+        return schedule
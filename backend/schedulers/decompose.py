@@ -0,0 +1,262 @@
+"""
+Decomposed optimization of independent venue subproblems.
+
+Matches at different venues only interact through shared teams, round
+sequencing and fixed-time events. ``coupling_components`` joins the movable
+matches that share a venue or a team into connected components. Fixed-time
+events, breaks and matches frozen by a "now" cutoff never move, so they are
+copied into every subproblem as constraints rather than linking components.
+
+``DecomposedOptimizer`` solves every component as its own smaller GA or local
+search in a worker process and merges the results. Round sequencing is the
+one coupling left between components (every title has a round 1). Each
+component therefore starts its matches no earlier than the earliest end of
+every lower round in the other components: their release time plus their
+disrupted duration. A component can still push its own matches past that
+bound, so the merged schedule is checked for movable matches that start
+before a lower-round match of another component ends. When any do, the whole
+problem is solved in one piece instead. With bracket dependencies, dependent matches
+join the same component and only the dependencies order matches, so no round
+coupling is left. Idle time is minimized per component, not across venues.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from deap import tools
+
+from backend.models.bracket import BracketDAG
+from backend.models.models import Match, Schedule, Disruption, venue_key
+from backend.models.tournament import Tournament
+from backend.schedulers.context import ProblemContext
+from backend.schedulers.islands import island_seed
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+
+
+def is_constant(match: Match, now: Optional[datetime] = None) -> bool:
+    """Whether a match keeps its time in every subproblem."""
+    if match.start_time is None:
+        return False
+    if match.is_fixed_time or match.is_break:
+        return True
+    return now is not None and match.start_time < now
+
+
+def coupling_components(schedule: Schedule, now: Optional[datetime] = None,
+                        bracket: Optional[BracketDAG] = None) -> List[List[str]]:
+    """Ids of the movable matches in each connected component, ordered by first match id."""
+    parent: Dict[str, str] = {}
+
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(a: str, b: str) -> None:
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    # Link each movable match to its venue and teams; the nodes are prefixed by kind
+    movable = sorted((m for m in schedule.matches if not is_constant(m, now)), key=lambda m: m.id)
+    for match in movable:
+        node = f"match:{match.id}"
+        union(node, f"venue:{venue_key(match.game_type)}")
+        for team in (match.team1.name, match.team2.name):
+            union(node, f"team:{team}")
+
+    # Movable matches that feed each other are solved together
+    if bracket is not None:
+        movable_ids = {match.id for match in movable}
+        for source, target, _ in bracket.edges:
+            if source in movable_ids and target in movable_ids:
+                union(f"match:{source}", f"match:{target}")
+
+    components: Dict[str, List[str]] = {}
+    for match in movable:
+        components.setdefault(find(f"match:{match.id}"), []).append(match.id)
+    return sorted(components.values(), key=lambda ids: ids[0])
+
+
+def cross_round_violations(schedule: Schedule, components: List[List[str]],
+                           bracket: Optional[BracketDAG] = None) -> int:
+    """Movable matches starting before a lower-round match (or predecessor) of another component has ended."""
+    component_of = {match_id: c for c, ids in enumerate(components) for match_id in ids}
+    matches = [m for m in schedule.matches if m.id in component_of and m.start_time]
+
+    if bracket is not None:
+        by_id = {m.id: m for m in matches}
+        late = {target for source, target, _ in bracket.edges
+                if source in by_id and target in by_id and component_of[source] != component_of[target]
+                and by_id[target].start_time < by_id[source].end_time}
+        return len(late)
+
+    # Latest end per component and round
+    latest: Dict[int, Dict[int, datetime]] = {}
+    for match in matches:
+        ends = latest.setdefault(component_of[match.id], {})
+        ends[match.round_number] = max(ends.get(match.round_number, match.end_time), match.end_time)
+
+    violations = 0
+    for match in matches:
+        own = component_of[match.id]
+        if any(end > match.start_time
+               for c, ends in latest.items() if c != own
+               for round_number, end in ends.items() if round_number < match.round_number):
+            violations += 1
+    return violations
+
+
+def subproblem_options(options: dict, index: int) -> dict:
+    """Optimizer options of one subproblem, with its own seed and no nested process pools."""
+    options = dict(options)
+    options['workers'] = 1
+    if 'islands' in options:
+        options['islands'] = 1
+    if options.get('seed') is not None:
+        options['seed'] = island_seed(options['seed'], index, 0)
+    return options
+
+
+def sum_logbooks(logbooks: List[tools.Logbook]) -> tools.Logbook:
+    """One record per generation, summing evaluations and best penalties over subproblems."""
+    merged = tools.Logbook()
+    merged.header = ['gen', 'nevals', 'min']
+    for gen in range(max(len(logbook) for logbook in logbooks)):
+        # Subproblems that stopped early keep contributing their last best penalty
+        records = [logbook[min(gen, len(logbook) - 1)] for logbook in logbooks]
+        merged.record(
+            gen=gen,
+            nevals=sum(r['nevals'] for r, logbook in zip(records, logbooks) if gen < len(logbook)),
+            min=sum(r['min'] for r in records)
+        )
+    return merged
+
+
+def solve_component(optimizer_class, tournament: Tournament, schedule: Schedule,
+                    disruptions: List[Disruption], options: dict) -> Dict:
+    """Optimize one subproblem inside a worker process."""
+    optimizer = optimizer_class(tournament, schedule, disruptions, **options)
+    result = optimizer.optimize()
+    return {
+        'schedule': result,
+        'logbook': optimizer.logbook,
+        'stop_reason': optimizer.stop_reason
+    }
+
+
+class DecomposedOptimizer:
+    """Solve independent components of the problem in parallel and merge the results."""
+
+    def __init__(self, tournament: Tournament, initial_schedule: Schedule, disruptions: List[Disruption],
+                 optimizer_class=GeneticAlgorithmOptimizer, processes: int = 0, **options):
+        """
+        Initialize with a tournament, initial schedule, and disruptions.
+
+        Each component is optimized by an optimizer_class built with the given
+        options, using up to `processes` worker processes (0 = all cores, 1 =
+        in this process). Components run with one evaluation worker and one
+        island each; the options apply unchanged when the problem does not
+        decompose or when the merged schedule fails the cross-component check.
+        """
+        self.tournament = tournament
+        self.initial_schedule = initial_schedule
+        self.disruptions = disruptions
+        self.optimizer_class = optimizer_class
+        self.processes = processes
+        self.options = options
+        self.now = options.get('now')
+        self.bracket = tournament.bracket if tournament.has_bracket else None
+
+        self.components = coupling_components(initial_schedule, self.now, self.bracket)
+        self.constants = [m for m in initial_schedule.matches if is_constant(m, self.now)]
+        self.component_logbooks: List[tools.Logbook] = []
+        self.fallback = False
+        self.logbook = None
+        self.stop_reason = None
+
+    def _subproblem(self, ids: List[str]) -> tuple:
+        """Schedule and disruptions of one component, with the constant matches added."""
+        members = set(ids)
+        schedule = Schedule()
+        for match in self.initial_schedule.matches:
+            if match.id in members or is_constant(match, self.now):
+                schedule.add_match(match)
+        disruptions = [d for d in self.disruptions if d.match.id in members or is_constant(d.match, self.now)]
+        return schedule, disruptions
+
+    def _round_ends(self) -> List[Dict[int, datetime]]:
+        """Earliest end of every round in the other components, for each component."""
+        context = ProblemContext(self.tournament, self.initial_schedule, self.disruptions, self.now)
+        component_of = {match_id: c for c, ids in enumerate(self.components) for match_id in ids}
+
+        # No match can end before its release time plus its disrupted duration
+        earliest: List[Dict[int, float]] = [{} for _ in self.components]
+        for i, match in enumerate(context.matches):
+            if match.id not in component_of:
+                continue
+            ends = earliest[component_of[match.id]]
+            end = context.release[i] + context.durations[i]
+            ends[match.round_number] = max(ends.get(match.round_number, end), end)
+
+        round_ends = []
+        for c in range(len(self.components)):
+            others: Dict[int, float] = {}
+            for other, ends in enumerate(earliest):
+                if other == c:
+                    continue
+                for round_number, end in ends.items():
+                    others[round_number] = max(others.get(round_number, end), end)
+            round_ends.append({round_number: context.venue_open + timedelta(minutes=float(end))
+                               for round_number, end in others.items()})
+        return round_ends
+
+    def _solve_whole(self) -> Schedule:
+        """Optimize the undivided problem with the original options."""
+        optimizer = self.optimizer_class(self.tournament, self.initial_schedule, self.disruptions, **self.options)
+        schedule = optimizer.optimize()
+        self.logbook = optimizer.logbook
+        self.stop_reason = optimizer.stop_reason
+        return schedule
+
+    def optimize(self) -> Schedule:
+        """Optimize every component and return the merged schedule."""
+        if len(self.components) < 2:
+            return self._solve_whole()
+
+        # Bracket dependencies already keep dependent matches together; rounds couple the rest
+        round_ends = self._round_ends() if self.bracket is None else None
+        tasks = []
+        for c, ids in enumerate(self.components):
+            options = subproblem_options(self.options, c)
+            if round_ends is not None:
+                options['round_ends'] = round_ends[c]
+            tasks.append((self.optimizer_class, self.tournament) + self._subproblem(ids) + (options,))
+        processes = min(len(tasks), self.processes or os.cpu_count() or 1)
+        if processes == 1:
+            results = [solve_component(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list(pool.map(solve_component, *zip(*tasks)))
+
+        self.component_logbooks = [result['logbook'] for result in results]
+        self.logbook = sum_logbooks(self.component_logbooks)
+        self.stop_reason = "/".join(sorted({result['stop_reason'] for result in results}))
+
+        # Constant matches come back from every component; keep one copy of each
+        merged = Schedule()
+        for result in results:
+            for match in result['schedule'].matches:
+                if merged.find_match(match.id) is None:
+                    merged.add_match(match)
+
+        # Components that ignored each other's rounds are not independent after all
+        if cross_round_violations(merged, self.components, self.bracket):
+            self.fallback = True
+            return self._solve_whole()
+        return merged
@@ -0,0 +1,379 @@
+"""
+Incremental (delta) fitness evaluation for mutated individuals.
+
+A ``DeltaState`` keeps the decoded start times of one genome, every
+penalty component, the rest penalty of each team and the start-sorted
+match order. When a mutation changes a few genes, ``DeltaEvaluator.apply``
+re-decodes only the stretch of the match chain that actually moves. It then
+updates only the terms that touch the moved matches:
+- per-match terms (venue hours, fixed events, schedule changes, peak time)
+- conflicts and round order against related matches
+- the rest penalty of the teams involved
+- the idle gaps next to the moved matches in the global order
+
+The components match ``PopulationEvaluator`` exactly, up to floating-point
+summation order. Delta evaluation needs positive durations, like the sweep
+conflict count.
+"""
+
+import math
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.models.models import venue_key
+from backend.schedulers.context import ProblemContext
+from backend.schedulers.fitness import PopulationEvaluator, IDLE_THRESHOLD
+
+# Changes to more than this fraction of the genes are cheaper to evaluate in full
+MAX_CHANGED_FRACTION = 0.1
+
+
+class DeltaState:
+    """Decoded schedule and penalty components of one genome."""
+
+    __slots__ = ('genome', 'starts', 'terms', 'team_rest', 'order')
+
+    def __init__(self, genome: Tuple[int, ...], starts: np.ndarray, terms: Dict[str, float],
+                 team_rest: np.ndarray, order: List[Tuple[float, int]]):
+        self.genome = genome
+        self.starts = starts
+        self.terms = terms
+        self.team_rest = team_rest
+        self.order = order
+
+
+class DeltaEvaluator:
+    """Update the penalty of a genome from a cached state after a few genes change."""
+
+    def __init__(self, evaluator: PopulationEvaluator, context: ProblemContext, max_states: int = 1000):
+        """Precompute related matches, round neighbours and team columns.
+
+        max_states bounds the LRU cache of genome states kept for later deltas.
+        """
+        self.evaluator = evaluator
+        self.context = context
+        self.max_states = max_states
+        self._states: "OrderedDict[Tuple[int, ...], DeltaState]" = OrderedDict()
+        matches = context.matches
+        n = context.n_matches
+        self.durations = evaluator.durations
+
+        # Matches sharing a venue or a team with each match
+        groups: Dict = {}
+        for i, match in enumerate(matches):
+            groups.setdefault(('venue', venue_key(match.game_type)), []).append(i)
+            for team in {match.team1.name, match.team2.name}:
+                groups.setdefault(('team', team), []).append(i)
+        related = [set() for _ in range(n)]
+        for members in groups.values():
+            for i in members:
+                related[i].update(members)
+        self.related = [np.array(sorted(r - {i}), dtype=int) for i, r in enumerate(related)]
+
+        # Lower- and higher-round matches of each match (bracket predecessors and successors)
+        if context.dependencies is not None:
+            predecessors = [[] for _ in range(n)]
+            successors = [[] for _ in range(n)]
+            for source, target in context.dependencies:
+                predecessors[target].append(source)
+                successors[source].append(target)
+            self.lower_rounds = [np.array(sorted(p), dtype=int) for p in predecessors]
+            self.higher_rounds = [np.array(sorted(s), dtype=int) for s in successors]
+        else:
+            rounds = evaluator.rounds
+            self.lower_rounds = [np.nonzero(rounds < rounds[i])[0] for i in range(n)]
+            self.higher_rounds = [np.nonzero(rounds > rounds[i])[0] for i in range(n)]
+
+        # Team columns including duplicates (a break's placeholder plays itself)
+        team_columns: Dict[str, List[int]] = {}
+        for i, match in enumerate(matches):
+            for team in (match.team1.name, match.team2.name):
+                team_columns.setdefault(team, []).append(i)
+        self.team_columns = [np.array(cols, dtype=int) for cols in team_columns.values()]
+        team_ids = {team: t for t, team in enumerate(team_columns)}
+        self.teams_of = [{team_ids[match.team1.name], team_ids[match.team2.name]} for match in matches]
+
+        # Teams with the same number of matches, stacked for the full rest computation
+        by_size: Dict[int, List[int]] = {}
+        for t, cols in enumerate(self.team_columns):
+            if len(cols) > 1:
+                by_size.setdefault(len(cols), []).append(t)
+        self.team_buckets = [(np.array(ids, dtype=int), np.array([self.team_columns[t] for t in ids]))
+                             for ids in by_size.values()]
+
+        # Per-match term masks
+        self.fixed_mask = np.zeros(n, dtype=bool)
+        self.fixed_mask[evaluator.fixed_check] = True
+        self.important_mask = np.zeros(n, dtype=bool)
+        self.important_mask[evaluator.important] = True
+
+        # Decode chain: position of each chain match and its incoming link
+        self.chain = context.chain
+        self.chain_position = {i: k for k, i in enumerate(context.chain)}
+        self.links = {cur: (prev, buffer) for prev, cur, buffer in context.order_links}
+
+        # Plain lists for the chain walk
+        self._pinned = context.pinned.tolist()
+        self._pinned_start = context.pinned_start.tolist()
+        self._release = context.release.tolist()
+        self._durations = self.durations.tolist()
+
+    # Full evaluation
+
+    def _team_rest(self, starts: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Rest penalty of teams given as rows of match columns, as in check_rest_periods."""
+        team_starts = starts[cols]
+        order = np.argsort(team_starts, axis=-1, kind='stable')
+        sorted_starts = np.take_along_axis(team_starts, order, axis=-1)
+        sorted_ends = sorted_starts + np.take_along_axis(self.durations[cols], order, axis=-1)
+        rest = sorted_starts[..., 1:] - sorted_ends[..., :-1]
+        required = self.evaluator.rest_period
+        return np.where(rest < required, (required - rest) / required, 0).sum(axis=-1)
+
+    def _all_team_rest(self, starts: np.ndarray) -> np.ndarray:
+        """Rest penalty of every team."""
+        team_rest = np.zeros(len(self.team_columns), dtype=float)
+        for ids, cols in self.team_buckets:
+            team_rest[ids] = self._team_rest(starts, cols)
+        return team_rest
+
+    def _per_match_terms(self, starts: np.ndarray, cols: np.ndarray) -> Dict[str, float]:
+        """Sum of the per-match terms over the given matches."""
+        evaluator = self.evaluator
+        s = starts[cols]
+        e = s + self.durations[cols]
+        start_of_day = np.mod(evaluator.venue_start_minutes + s, 1440)
+        end_of_day = np.mod(evaluator.venue_start_minutes + e, 1440)
+        outside = (start_of_day < evaluator.venue_start_minutes) | (end_of_day > evaluator.venue_end_minutes)
+
+        fixed = self.fixed_mask[cols]
+        moved = fixed & (s != evaluator.original_start[cols])
+
+        has_original = evaluator.has_original[cols]
+        changes = np.abs(np.where(has_original, s - np.nan_to_num(evaluator.original_start[cols]), 0))
+
+        important = self.important_mask[cols]
+        hours = np.floor(np.mod(evaluator.venue_start_minutes + s, 1440) / 60)
+        in_peak = np.zeros(len(cols), dtype=bool)
+        for peak_start, peak_end in evaluator.peak_hours:
+            in_peak |= (peak_start <= hours) & (hours < peak_end)
+        peak = np.where(important & ~in_peak, evaluator.rounds[cols], 0)
+
+        return {
+            'venue_hours': float(outside.sum()),
+            'fixed_time': float(moved.sum()),
+            'schedule_changes': float(changes.sum()),
+            'peak_time': float(peak.sum())
+        }
+
+    def _gap(self, first: Tuple[float, int], second: Tuple[float, int]) -> float:
+        """Idle minutes between two consecutive matches in start order."""
+        gap = second[0] - (first[0] + self.durations[first[1]])
+        return gap if gap > IDLE_THRESHOLD else 0.0
+
+    def full_state(self, genome: Sequence[int]) -> DeltaState:
+        """Decode and score a genome from scratch."""
+        evaluator = self.evaluator
+        return self._state_of(tuple(genome), evaluator.decode(evaluator.as_matrix([genome]))[0])
+
+    def _state_of(self, genome: Tuple[int, ...], starts: np.ndarray) -> DeltaState:
+        """Score decoded start times from scratch."""
+        evaluator = self.evaluator
+        row = starts[None, :]
+        ends = row + self.durations
+
+        terms = {
+            'conflicts': float(evaluator.check_conflicts(row, ends)[0]),
+            'round_sequence': float(evaluator.check_round_sequence(row, ends)[0]),
+            'idle_time': float(evaluator.calculate_idle_time(row, ends)[0]),
+        }
+        terms.update(self._per_match_terms(starts, np.arange(len(starts))))
+        team_rest = self._all_team_rest(starts)
+        terms['rest_periods'] = float(team_rest.sum())
+
+        order = sorted(zip(starts.tolist(), range(len(starts))))
+        return DeltaState(genome, starts, terms, team_rest, order)
+
+    def penalty(self, state: DeltaState) -> float:
+        """Weighted penalty of a state, combined as in PopulationEvaluator.evaluate_starts."""
+        weights = self.evaluator.weights
+        terms = state.terms
+        penalty = terms['conflicts'] * weights['conflict']
+        penalty += terms['venue_hours'] * weights['venue_hours']
+        penalty += terms['rest_periods'] * weights['rest_period']
+        penalty += terms['round_sequence'] * weights['round_sequence']
+        penalty += terms['fixed_time'] * 2000
+        penalty += terms['idle_time'] * weights['idle_time']
+        penalty += terms['schedule_changes'] * weights['schedule_change']
+        penalty += terms['peak_time'] * weights['peak_time']
+        return penalty
+
+    # Incremental update
+
+    def _decode_changes(self, state: DeltaState, genome: Sequence[int], changed: List[int]) -> np.ndarray:
+        """New start times, re-decoding only the part of the chain that can move."""
+        pinned = self._pinned
+        pinned_start = self._pinned_start
+        release = self._release
+        durations = self._durations
+        starts = state.starts.copy()
+
+        def base(i: int) -> float:
+            return pinned_start[i] if pinned[i] else max(release[i], float(math.trunc(genome[i])))
+
+        chain_changes = sorted(self.chain_position[i] for i in changed if i in self.chain_position)
+        for i in changed:
+            if i not in self.chain_position:
+                starts[i] = base(i)
+        if not chain_changes:
+            return starts
+
+        # Walk the chain from the first changed gene until the schedule settles again
+        current = starts.tolist()
+        last_change = chain_changes[-1]
+        for k in range(chain_changes[0], len(self.chain)):
+            i = self.chain[k]
+            start = base(i)
+            link = self.links.get(i)
+            if link is not None:
+                prev, buffer = link
+                start = max(start, current[prev] + durations[prev] + buffer)
+            if k > last_change and start == current[i]:
+                break
+            current[i] = start
+        return np.array(current)
+
+    def _pair_delta(self, old: np.ndarray, new: np.ndarray, moved: np.ndarray) -> Tuple[float, float]:
+        """Change of the conflict and round-order pair counts for the moved matches."""
+        durations = self.durations
+        is_moved = np.zeros(len(old), dtype=bool)
+        is_moved[moved] = True
+
+        def pairs(neighbours: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+            # Pairs of a moved match and its neighbours; pairs of two moved matches are kept once
+            first = np.repeat(moved, [len(neighbours[i]) for i in moved])
+            second = np.concatenate([neighbours[i] for i in moved])
+            keep = ~is_moved[second] | (first < second)
+            return first[keep], second[keep]
+
+        def overlaps(starts: np.ndarray, a: np.ndarray, b: np.ndarray) -> int:
+            return np.count_nonzero((starts[a] < starts[b] + durations[b]) & (starts[b] < starts[a] + durations[a]))
+
+        def late(starts: np.ndarray, lower: np.ndarray, higher: np.ndarray) -> int:
+            return np.count_nonzero(starts[higher] < starts[lower] + durations[lower])
+
+        a, b = pairs(self.related)
+        conflicts = overlaps(new, a, b) - overlaps(old, a, b)
+
+        # A moved match against lower rounds, then against higher rounds
+        higher, lower = pairs(self.lower_rounds)
+        rounds = late(new, lower, higher) - late(old, lower, higher)
+        lower, higher = pairs(self.higher_rounds)
+        rounds += late(new, lower, higher) - late(old, lower, higher)
+        return float(conflicts), float(rounds)
+
+    def _update_order(self, order: List[Tuple[float, int]], old: np.ndarray, new: np.ndarray,
+                      moved: List[int]) -> float:
+        """Move matches within the start order in place and return the idle time change."""
+        delta = 0.0
+        for i in moved:
+            key = (float(old[i]), i)
+            p = bisect_left(order, key)
+            prev = order[p - 1] if p > 0 else None
+            nxt = order[p + 1] if p + 1 < len(order) else None
+            if prev is not None:
+                delta -= self._gap(prev, key)
+            if nxt is not None:
+                delta -= self._gap(key, nxt)
+            if prev is not None and nxt is not None:
+                delta += self._gap(prev, nxt)
+            del order[p]
+        for i in moved:
+            key = (float(new[i]), i)
+            insort(order, key)
+            p = bisect_left(order, key)
+            prev = order[p - 1] if p > 0 else None
+            nxt = order[p + 1] if p + 1 < len(order) else None
+            if prev is not None and nxt is not None:
+                delta -= self._gap(prev, nxt)
+            if prev is not None:
+                delta += self._gap(prev, key)
+            if nxt is not None:
+                delta += self._gap(key, nxt)
+        return delta
+
+    def apply(self, state: DeltaState, genome: Sequence[int]) -> DeltaState:
+        """State of a genome that differs from the state's genome in a few genes."""
+        changed = [i for i, (a, b) in enumerate(zip(state.genome, genome)) if a != b]
+        old = state.starts
+        new = self._decode_changes(state, genome, changed)
+        moved = np.nonzero(new != old)[0]
+
+        # A change that ripples through much of the chain is cheaper to score in full
+        if len(moved) > max(1, MAX_CHANGED_FRACTION * len(old)):
+            return self._state_of(tuple(genome), new)
+
+        terms = dict(state.terms)
+        team_rest = state.team_rest
+        order = state.order
+        if len(moved):
+            before = self._per_match_terms(old, moved)
+            after = self._per_match_terms(new, moved)
+            for name in before:
+                terms[name] += after[name] - before[name]
+
+            conflicts, rounds = self._pair_delta(old, new, moved)
+            terms['conflicts'] += conflicts
+            terms['round_sequence'] += rounds
+
+            team_rest = team_rest.copy()
+            for t in set().union(*(self.teams_of[i] for i in moved)):
+                cols = self.team_columns[t]
+                rest = float(self._team_rest(new, cols)) if len(cols) > 1 else 0.0
+                terms['rest_periods'] += rest - team_rest[t]
+                team_rest[t] = rest
+
+            order = list(order)
+            terms['idle_time'] += self._update_order(order, old, new, moved.tolist())
+
+        return DeltaState(tuple(genome), new, terms, team_rest, order)
+
+    # Cached evaluation
+
+    def accepts(self, parent: Sequence[int], genome: Sequence[int]) -> bool:
+        """Whether genome differs from parent in few enough genes for a delta update."""
+        changed = sum(1 for a, b in zip(parent, genome) if a != b)
+        return changed <= max(1, int(MAX_CHANGED_FRACTION * self.context.n_matches))
+
+    def state(self, genome: Sequence[int]) -> DeltaState:
+        """Cached state of a genome, computed in full on a miss."""
+        key = tuple(genome)
+        state = self._states.get(key)
+        if state is None:
+            state = self.full_state(key)
+            self._store(state)
+        else:
+            self._states.move_to_end(key)
+        return state
+
+    def _store(self, state: DeltaState) -> None:
+        """Keep a state for later deltas, evicting the least recently used ones."""
+        if self.max_states <= 0:
+            return
+        self._states[state.genome] = state
+        self._states.move_to_end(state.genome)
+        while len(self._states) > self.max_states:
+            self._states.popitem(last=False)
+
+    def evaluate(self, parent: Sequence[int], genome: Sequence[int]) -> float:
+        """Penalty of a genome derived from parent by changing a few genes."""
+        state = self.apply(self.state(parent), genome)
+        self._store(state)
+        return self.penalty(state)
+
+    def clear(self) -> None:
+        """Drop all cached states."""
+        self._states.clear()
@@ -0,0 +1,344 @@
+"""
+Vectorized fitness evaluation for the genetic algorithm optimizer.
+
+The scalar path in ``GeneticAlgorithmOptimizer._evaluate_schedule`` decodes
+every individual into a full ``Schedule`` of ``Match`` objects. This module
+evaluates a whole population at once: the genomes are stacked into an
+(individuals x matches) matrix of minutes from venue open and every
+constraint is computed as NumPy array operations over that matrix.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.models.arrays import ScheduleArrays
+from backend.schedulers.context import ProblemContext, teams_overlap
+from backend.schedulers.sweep import bucket_by_size, conflict_groups, late_start_counts, overlap_counts
+
+# Gaps longer than this many minutes count as idle time
+IDLE_THRESHOLD = 10
+
+# Upper bound on the number of cells processed per pairwise block
+PAIR_BLOCK_CELLS = 2_000_000
+
+
+def _time_overlap(s1: np.ndarray, e1: np.ndarray, s2: np.ndarray, e2: np.ndarray) -> np.ndarray:
+    """Element-wise version of the overlap test used by ``Schedule.conflicts_with``."""
+    return (((s1 <= s2) & (s2 < e1)) |
+            ((s1 < e2) & (e2 <= e1)) |
+            ((s2 <= s1) & (s1 < e2)) |
+            ((s2 < e1) & (e1 <= e2)))
+
+
+class PopulationEvaluator:
+    """Evaluate GA populations as NumPy integer matrices."""
+
+    def __init__(self, context: ProblemContext, weights: Dict[str, float],
+                 peak_hours: List[Tuple[int, int]]):
+        """Precompute the static pair and team arrays for a compiled problem."""
+        self.weights = dict(weights)
+        self.peak_hours = list(peak_hours)
+        self.rest_period = context.rest_period
+        self.venue_start_minutes = context.venue_start_minutes
+        self.venue_end_minutes = context.venue_end_minutes
+
+        # Decode invariants come straight from the problem context
+        matches = context.matches
+        self.n_matches = context.n_matches
+        self.match_ids = [m.id for m in matches]
+        self.open_minute = context.open_minute
+        self.durations = context.durations
+        self.original_start = context.original_start
+        self.has_original = context.has_original
+        self.pinned = context.pinned
+        self.pinned_start = context.pinned_start
+        self.fixed = context.fixed
+        self.release = context.release
+        self.order_links = context.order_links
+
+        # Venue and team groups for sweep-line conflict counting. The sweep needs
+        # positive durations; otherwise fall back to checking every related pair.
+        self.sweep_conflicts = bool(np.all(self.durations > 0))
+        venue_groups, team_groups, team_venue_groups, rematch_pairs = conflict_groups(
+            [m.game_type for m in matches], [(m.team1.name, m.team2.name) for m in matches])
+        self.venue_buckets = bucket_by_size(venue_groups)
+        self.team_buckets = bucket_by_size(team_groups)
+        self.team_venue_buckets = bucket_by_size(team_venue_groups)
+        self.rematch_pairs = self._pair_arrays(rematch_pairs)
+        if not self.sweep_conflicts:
+            self.conflict_pairs = self._pair_arrays([
+                (i, j)
+                for i in range(self.n_matches)
+                for j in range(i + 1, self.n_matches)
+                if teams_overlap(matches[i], matches[j]) or matches[i].game_type == matches[j].game_type
+            ])
+
+        # Each round is checked against all lower rounds combined, unless bracket
+        # dependencies give the exact (predecessor, successor) pairs
+        rounds = np.array([m.round_number for m in matches], dtype=int)
+        self.rounds = rounds
+        round_numbers = np.unique(rounds)
+        self.round_steps = [
+            (np.nonzero(rounds < round_number)[0], np.nonzero(rounds == round_number)[0])
+            for round_number in round_numbers[1:]
+        ]
+        self.dependency_pairs = None
+        if context.dependencies is not None:
+            self.dependency_pairs = self._pair_arrays(context.dependencies)
+
+        # Matches of each team, including duplicates when a team plays itself (breaks)
+        team_columns: Dict[str, List[int]] = {}
+        for i, match in enumerate(matches):
+            for team in [match.team1, match.team2]:
+                team_columns.setdefault(team.name, []).append(i)
+        self.team_buckets_with_duplicates = bucket_by_size(list(team_columns.values()))
+
+        # Fixed-time events and breaks must stay at their original time
+        self.fixed_check = np.nonzero((context.fixed | context.is_break) & self.has_original)[0]
+
+        # Important matches should be scheduled during peak hours
+        self.important = np.nonzero(rounds > 1)[0]
+
+    @staticmethod
+    def _pair_arrays(pairs: Sequence[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Split a list of index pairs into two index arrays."""
+        if not pairs:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+        first, second = zip(*pairs)
+        return np.array(first, dtype=int), np.array(second, dtype=int)
+
+    def as_matrix(self, population: Sequence[Sequence[int]]) -> np.ndarray:
+        """Stack a population of genomes into an (individuals x matches) matrix."""
+        return np.asarray(population, dtype=float).reshape(len(population), self.n_matches)
+
+    def decode(self, genomes: np.ndarray) -> np.ndarray:
+        """Decode a genome matrix into start times (minutes from venue open)."""
+        # Free matches start no earlier than their release time (original start or cutoff)
+        starts = np.maximum(self.release, np.trunc(genomes))
+        starts[:, self.pinned] = self.pinned_start[self.pinned]
+
+        # Keep matches in their original relative order
+        durations = self.durations
+        for prev, cur, buffer in self.order_links:
+            np.maximum(starts[:, cur], starts[:, prev] + durations[prev] + buffer, out=starts[:, cur])
+
+        return starts
+
+    def _count_overlapping_pairs(self, starts: np.ndarray, ends: np.ndarray,
+                                 pairs: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+        """Count overlapping pairs from an explicit pair list, in blocks to bound memory."""
+        first, second = pairs
+        counts = np.zeros(starts.shape[0], dtype=float)
+        if len(first) == 0:
+            return counts
+
+        block = max(1, PAIR_BLOCK_CELLS // max(1, starts.shape[0]))
+        for lo in range(0, len(first), block):
+            a = first[lo:lo + block]
+            b = second[lo:lo + block]
+            counts += _time_overlap(starts[:, a], ends[:, a], starts[:, b], ends[:, b]).sum(axis=1)
+        return counts
+
+    @staticmethod
+    def _sweep_buckets(starts: np.ndarray, ends: np.ndarray, buckets: List[np.ndarray]) -> np.ndarray:
+        """Sum sweep-line overlap counts over bucketed index groups."""
+        counts = np.zeros(starts.shape[0], dtype=float)
+        for cols in buckets:
+            counts += overlap_counts(starts[:, cols], ends[:, cols]).sum(axis=1)
+        return counts
+
+    def check_conflicts(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Number of team/venue conflicts per individual."""
+        if not self.sweep_conflicts:
+            return self._count_overlapping_pairs(starts, ends, self.conflict_pairs)
+
+        conflicts = self._sweep_buckets(starts, ends, self.venue_buckets)
+        conflicts += self._sweep_buckets(starts, ends, self.team_buckets)
+        conflicts -= self._sweep_buckets(starts, ends, self.team_venue_buckets)
+        conflicts -= self._count_overlapping_pairs(starts, ends, self.rematch_pairs)
+        return conflicts
+
+    def check_venue_hours(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Number of matches outside venue hours per individual."""
+        start_of_day = np.mod(self.venue_start_minutes + starts, 1440)
+        end_of_day = np.mod(self.venue_start_minutes + ends, 1440)
+        outside = (start_of_day < self.venue_start_minutes) | (end_of_day > self.venue_end_minutes)
+        return outside.sum(axis=1).astype(float)
+
+    def check_rest_periods(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Proportional rest period violations per individual."""
+        violations = np.zeros(starts.shape[0], dtype=float)
+        required = self.rest_period
+        for cols in self.team_buckets_with_duplicates:
+            team_starts = starts[:, cols]
+            order = np.argsort(team_starts, axis=-1, kind='stable')
+            sorted_starts = np.take_along_axis(team_starts, order, axis=-1)
+            sorted_ends = np.take_along_axis(ends[:, cols], order, axis=-1)
+            rest = sorted_starts[..., 1:] - sorted_ends[..., :-1]
+            short = rest < required
+            violations += np.where(short, (required - rest) / required, 0).sum(axis=(1, 2))
+        return violations
+
+    def check_round_sequence(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Number of higher-round matches starting before a lower round ends."""
+        if self.dependency_pairs is not None:
+            # One count per dependency whose match starts before its predecessor ends
+            sources, targets = self.dependency_pairs
+            return np.count_nonzero(starts[:, targets] < ends[:, sources], axis=1).astype(float)
+        violations = np.zeros(starts.shape[0], dtype=float)
+        for lower, current in self.round_steps:
+            # Only individuals whose round starts before the lower rounds finish need counting
+            rows = np.nonzero(starts[:, current].min(axis=1) < ends[:, lower].max(axis=1))[0]
+            if len(rows):
+                violations[rows] += late_start_counts(ends[np.ix_(rows, lower)], starts[np.ix_(rows, current)])
+        return violations
+
+    def check_fixed_time_events(self, starts: np.ndarray) -> np.ndarray:
+        """Number of fixed-time events or breaks moved from their original time."""
+        cols = self.fixed_check
+        moved = starts[:, cols] != self.original_start[cols]
+        return moved.sum(axis=1).astype(float)
+
+    def calculate_idle_time(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Total idle minutes between consecutive matches per individual."""
+        if self.n_matches < 2:
+            return np.zeros(starts.shape[0], dtype=float)
+        order = np.argsort(starts, axis=1, kind='stable')
+        sorted_starts = np.take_along_axis(starts, order, axis=1)
+        sorted_ends = np.take_along_axis(ends, order, axis=1)
+        gaps = sorted_starts[:, 1:] - sorted_ends[:, :-1]
+        return np.where(gaps > IDLE_THRESHOLD, gaps, 0).sum(axis=1)
+
+    def calculate_schedule_changes(self, starts: np.ndarray) -> np.ndarray:
+        """Total absolute shift (minutes) from the original schedule per individual."""
+        cols = self.has_original
+        return np.abs(starts[:, cols] - self.original_start[cols]).sum(axis=1)
+
+    def check_peak_time_scheduling(self, starts: np.ndarray) -> np.ndarray:
+        """Round-weighted count of important matches outside peak hours."""
+        cols = self.important
+        if len(cols) == 0:
+            return np.zeros(starts.shape[0], dtype=float)
+        hours = np.floor(np.mod(self.venue_start_minutes + starts[:, cols], 1440) / 60)
+        in_peak = np.zeros(hours.shape, dtype=bool)
+        for peak_start, peak_end in self.peak_hours:
+            in_peak |= (peak_start <= hours) & (hours < peak_end)
+        return np.where(in_peak, 0, self.rounds[cols]).sum(axis=1).astype(float)
+
+    def hard_penalty(self, starts: np.ndarray) -> np.ndarray:
+        """Weighted penalty of the hard constraints alone (zero for a feasible schedule)."""
+        ends = starts + self.durations
+        weights = self.weights
+
+        penalty = self.check_conflicts(starts, ends) * weights['conflict']
+        penalty += self.check_venue_hours(starts, ends) * weights['venue_hours']
+        penalty += self.check_rest_periods(starts, ends) * weights['rest_period']
+        penalty += self.check_round_sequence(starts, ends) * weights['round_sequence']
+        penalty += self.check_fixed_time_events(starts) * 2000
+        return penalty
+
+    def soft_penalty(self, starts: np.ndarray) -> np.ndarray:
+        """Weighted penalty of the soft constraints alone."""
+        ends = starts + self.durations
+        weights = self.weights
+
+        penalty = self.calculate_idle_time(starts, ends) * weights['idle_time']
+        penalty += self.calculate_schedule_changes(starts) * weights['schedule_change']
+        penalty += self.check_peak_time_scheduling(starts) * weights['peak_time']
+        return penalty
+
+    def earliest_decoded(self) -> np.ndarray:
+        """Earliest start of every match over all decoded schedules, as a 1 x matches matrix.
+
+        Decoding only ever moves matches later, so this is the genome of all zeros.
+        """
+        return self.decode(np.zeros((1, self.n_matches)))
+
+    def soft_penalty_bound(self, idle_time_bound: float = 0.0) -> float:
+        """
+        Lower bound on the soft penalty of any decoded schedule without hard violations.
+
+        Matches whose earliest decoded start is after their original time are
+        shifted at least that much in every schedule.
+        Fixed-time events outside the chain always decode to their pinned start,
+        so their shift and peak-hour penalty are known exactly; other important
+        matches might reach peak hours. idle_time_bound comes from the tournament
+        (see ``backend.models.bounds``).
+        """
+        earliest = self.earliest_decoded()
+        determined = self.pinned & self.fixed
+
+        cols = self.has_original
+        shift = earliest[0, cols] - self.original_start[cols]
+        changes = np.where(determined[cols], np.abs(shift), np.maximum(shift, 0)).sum()
+
+        # Every other important match is placed in peak hours, where it costs nothing
+        placed = earliest.copy()
+        if self.peak_hours:
+            free = self.important[~determined[self.important]]
+            placed[0, free] = self.peak_hours[0][0] * 60 - self.venue_start_minutes
+        peak = self.check_peak_time_scheduling(placed)[0]
+
+        weights = self.weights
+        return float(idle_time_bound * weights['idle_time'] + changes * weights['schedule_change'] +
+                     peak * weights['peak_time'])
+
+    def evaluate_starts(self, starts: np.ndarray) -> np.ndarray:
+        """Weighted penalty for already-decoded start times."""
+        return self.hard_penalty(starts) + self.soft_penalty(starts)
+
+    def starts_of(self, arrays: ScheduleArrays) -> np.ndarray:
+        """Start times (minutes from venue open) of the context's matches in a schedule, as a 1 x matches matrix."""
+        rows = [arrays.index_of[match_id] for match_id in self.match_ids]
+        return (arrays.start[rows] - self.open_minute)[None, :]
+
+    def evaluate_arrays(self, arrays: ScheduleArrays) -> float:
+        """Weighted penalty of a schedule's columnar view, without decoding match objects."""
+        return float(self.evaluate_starts(self.starts_of(arrays))[0])
+
+    def evaluate(self, population: Sequence[Sequence[int]]) -> np.ndarray:
+        """Weighted penalty for every individual in the population."""
+        if len(population) == 0:
+            return np.zeros(0, dtype=float)
+        return self.evaluate_starts(self.decode(self.as_matrix(population)))
+
+
+class FitnessCache:
+    """Bounded LRU cache of penalties keyed by genome."""
+
+    def __init__(self, max_entries: int = 10000):
+        """Initialize with the maximum number of cached genomes (0 disables caching)."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[int, ...], float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[int, ...]) -> Optional[float]:
+        """Return the cached penalty for a genome, counting the hit or miss."""
+        penalty = self._entries.get(key)
+        if penalty is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return penalty
+
+    def put(self, key: Tuple[int, ...], penalty: float) -> None:
+        """Store a penalty, evicting the least recently used genomes when full."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = penalty
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,133 @@
+"""
+Deterministic list-scheduling rescheduler for schedule adjustments.
+
+Most disruptions only push a few later matches back, so a full GA run is
+rarely needed. The rescheduler applies the disruptions (changed durations,
+late-arrival starts) and walks the matches once, in their original start order.
+It places each match at the earliest start that is no earlier than its
+original time and that respects the matches already placed:
+- the venue is free again after the setup time
+- both teams have had their rest period
+- every lower-round match (or bracket predecessor) has ended
+- no pinned fixed-time event at its venue or of its teams is hit (with rest)
+
+Matches that come free early are pulled back towards their original time.
+With a "now" cutoff, matches that already started keep their time and the
+rest start no earlier than the cutoff allows.
+The result is checked with the GA's hard-constraint penalty; callers fall
+back to the optimizer when it is not zero.
+"""
+
+import math
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.models.models import Schedule, Disruption, venue_key
+from backend.models.tournament import Tournament
+from backend.schedulers.context import ProblemContext, SETUP_TIME
+from backend.schedulers.fitness import PopulationEvaluator
+
+
+class GreedyRescheduler:
+    """Push or pull matches after disruptions in one pass over the original order."""
+
+    def __init__(self, tournament: Tournament, initial_schedule: Schedule, disruptions: List[Disruption],
+                 weights: Dict[str, float], peak_hours: List[Tuple[int, int]], now: Optional[datetime] = None):
+        """Compile the problem once; weights and peak hours are those of the GA fitness."""
+        self.tournament = tournament
+        self.context = ProblemContext(tournament, initial_schedule, disruptions, now)
+        self.evaluator = PopulationEvaluator(self.context, weights, peak_hours)
+        self.starts = None
+        self.hard_penalty = None
+
+    @property
+    def feasible(self) -> bool:
+        """Whether the last rescheduled result has no hard-constraint penalty."""
+        return self.hard_penalty == 0
+
+    def _blocking_windows(self) -> List[List[Tuple[float, float]]]:
+        """Per match, sorted open start intervals that would hit a pinned event."""
+        context = self.context
+        matches = context.matches
+        durations = context.durations
+        rest = context.rest_period
+        events = [e for e in range(context.n_matches) if context.pinned[e] and context.fixed[e]]
+
+        windows: List[List[Tuple[float, float]]] = [[] for _ in range(context.n_matches)]
+        for i, match in enumerate(matches):
+            if context.pinned[i]:
+                continue
+            teams = {match.team1.name, match.team2.name}
+            for e in events:
+                event = matches[e]
+                shares_team = bool(teams & {event.team1.name, event.team2.name})
+                if not shares_team and venue_key(event.game_type) != venue_key(match.game_type):
+                    continue
+                pad = rest if shares_team else 0
+                start = context.pinned_start[e]
+                windows[i].append((start - pad - durations[i], start + durations[e] + pad))
+            windows[i].sort()
+        return windows
+
+    def reschedule_starts(self) -> np.ndarray:
+        """Start minutes of every match (context order) after one greedy pass."""
+        context = self.context
+        matches = context.matches
+        durations = context.durations.tolist()
+        rest = context.rest_period
+        windows = self._blocking_windows()
+
+        venue_ready: Dict[str, float] = {}
+        team_ready: Dict[str, float] = {}
+        round_end: Dict[int, float] = {}
+        match_end: Dict[str, float] = {}
+        starts = np.zeros(context.n_matches, dtype=float)
+
+        for match_id in context.original_order:
+            i = context.index_of[match_id]
+            match = matches[i]
+            teams = {match.team1.name, match.team2.name}
+            venue = venue_key(match.game_type)
+
+            if context.pinned[i]:
+                start = context.pinned_start[i]
+            elif match.is_break and context.has_original[i]:
+                # Breaks stay at their original time
+                start = context.original_start[i]
+            else:
+                start = context.original_start[i] if context.has_original[i] else 0.0
+                if context.bracket is not None:
+                    waits = [match_end[source] for source in context.bracket.predecessors(match_id)
+                             if source in match_end]
+                else:
+                    waits = [end for r, end in round_end.items() if r < match.round_number]
+                start = max([start, context.earliest_start[i], venue_ready.get(venue, -math.inf)] +
+                            [team_ready.get(team, -math.inf) for team in teams] + waits)
+                for lo, hi in windows[i]:
+                    if lo < start < hi:
+                        start = hi
+
+            end = start + durations[i]
+            starts[i] = start
+            venue_ready[venue] = max(venue_ready.get(venue, -math.inf), end + SETUP_TIME)
+            for team in teams:
+                team_ready[team] = max(team_ready.get(team, -math.inf), end + rest)
+            round_end[match.round_number] = max(round_end.get(match.round_number, -math.inf), end)
+            match_end[match_id] = end
+
+        self.starts = starts
+        self.hard_penalty = float(self.evaluator.hard_penalty(starts[None, :])[0])
+        return starts
+
+    def reschedule(self) -> Schedule:
+        """Greedily adjusted schedule; check ``feasible`` before using it."""
+        context = self.context
+        starts = self.reschedule_starts()
+        schedule = Schedule()
+        for frozen in context.frozen_copies():
+            schedule.add_match(frozen)
+        for i in range(context.n_matches):
+            schedule.add_match(context.decoded_match(i, starts[i]))
+        return schedule
@@ -0,0 +1,257 @@
+"""
+Discrete time grid and slot occupancy bitmaps.
+
+Start times are only meaningful to a few minutes, yet a time genome can take
+any minute, and most neighbouring minutes give equivalent schedules. The
+grid here puts start times on a fixed interval from venue open, the same
+grid ``Tournament.get_timeslots`` lists. The coloring scheduler assigns its
+slots on it, and in grid mode the GA's genes are slot indices on it.
+
+``SlotOccupancy`` keeps one Python integer bitset per venue and per team,
+with bit k set when a match covers grid slot k. A match occupies every slot
+its interval touches, so the bitmaps over-approximate. When a candidate's
+span shares no bit with them, it cannot overlap a recorded match or cut
+into its teams' rest. That check is one AND per venue and team. A counted
+occupancy also keeps the slots shared by several matches as stacked
+bitmaps, so a recorded match can be vacated again and moving one match does
+not rebuild the bitmaps of all the others.
+"""
+
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.models.models import to_minutes, venue_key
+from backend.models.tournament import Tournament
+from backend.schedulers.context import ProblemContext
+from backend.schedulers.fitness import PopulationEvaluator
+
+# Tolerance when mapping minutes onto grid slots
+EPSILON = 1e-9
+
+
+class TimeGrid:
+    """Start times on a fixed interval (minutes) from an origin."""
+
+    def __init__(self, origin: datetime, interval: int = 5, n_slots: int = 0):
+        """Initialize with the time of slot 0, the slot length and the number of slots in a day."""
+        if interval <= 0:
+            raise ValueError(f"Grid interval must be positive: {interval}")
+        self.origin = origin
+        self.origin_minute = to_minutes(origin)
+        self.interval = interval
+        self.n_slots = n_slots
+
+    @classmethod
+    def for_tournament(cls, tournament: Tournament, interval: int = 5, day: int = 0,
+                       origin: Optional[datetime] = None) -> 'TimeGrid':
+        """The grid of ``Tournament.get_timeslots`` for a day, optionally anchored at another venue open."""
+        timeslots = tournament.get_timeslots(interval, day)
+        return cls(origin or timeslots[0], interval, len(timeslots))
+
+    @property
+    def times(self) -> List[datetime]:
+        """Time of every slot of the day."""
+        return [self.origin + timedelta(minutes=k * self.interval) for k in range(self.n_slots)]
+
+    def offset(self, moment: datetime) -> float:
+        """Minutes from the origin to a moment."""
+        return to_minutes(moment) - self.origin_minute
+
+    def slot_at(self, minutes: float) -> int:
+        """First slot starting at or after the given minutes from the origin."""
+        return math.ceil(minutes / self.interval - EPSILON)
+
+    def minutes(self, slot: int) -> int:
+        """Minutes from the origin to the start of a slot."""
+        return slot * self.interval
+
+    def span(self, start: float, end: float) -> int:
+        """Bitmap of the slots an interval of minutes touches (empty when it lies before the origin)."""
+        first = max(0, math.floor(start / self.interval + EPSILON))
+        last = math.ceil(end / self.interval - EPSILON)
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+
+class SlotOccupancy:
+    """Bitmaps of the grid slots occupied at every venue and by every team."""
+
+    def __init__(self, grid: TimeGrid, rest_period: float = 0, counted: bool = False):
+        """
+        Initialize empty bitmaps; teams need rest_period minutes between their matches.
+
+        When counted, slots shared by several matches are tracked as well, so
+        that recorded matches can be vacated again.
+        """
+        self.grid = grid
+        self.rest_period = rest_period
+        self.venues: Dict[str, int] = {}
+        self.teams: Dict[str, int] = {}
+        # Slots no match may use at all (e.g. breaks in the coloring scheduler)
+        self.blocked = 0
+        # Per venue and team, layer k has the slots covered by more than k + 1 matches
+        self.counted = counted
+        self.venue_layers: Dict[str, List[int]] = {}
+        self.team_layers: Dict[str, List[int]] = {}
+
+    def occupy(self, start: float, end: float, venue: Optional[str] = None, teams: Iterable[str] = (),
+               blocks_all: bool = False) -> None:
+        """Record a match from start to end minutes at a venue, for its teams."""
+        mask = self.grid.span(start, end)
+        if blocks_all:
+            self.blocked |= mask
+        if venue is not None:
+            self._add(self.venues, self.venue_layers, venue, mask)
+        for team in teams:
+            self._add(self.teams, self.team_layers, team, mask)
+
+    def vacate(self, start: float, end: float, venue: Optional[str] = None, teams: Iterable[str] = ()) -> None:
+        """Remove a match recorded by ``occupy`` (counted occupancies only; blocked slots stay blocked)."""
+        if not self.counted:
+            raise ValueError("Only a counted occupancy can vacate matches")
+        mask = self.grid.span(start, end)
+        if venue is not None:
+            self._remove(self.venues, self.venue_layers, venue, mask)
+        for team in teams:
+            self._remove(self.teams, self.team_layers, team, mask)
+
+    def _add(self, bitmaps: Dict[str, int], layers: Dict[str, List[int]], key: str, mask: int) -> None:
+        """Set a mask in a bitmap, carrying slots already set into the layers above."""
+        bitmap = bitmaps.get(key, 0)
+        bitmaps[key] = bitmap | mask
+        carry = bitmap & mask
+        if not self.counted or not carry:
+            return
+        stack = layers.setdefault(key, [])
+        for k, layer in enumerate(stack):
+            stack[k], carry = layer | carry, layer & carry
+            if not carry:
+                return
+        stack.append(carry)
+
+    @staticmethod
+    def _remove(bitmaps: Dict[str, int], layers: Dict[str, List[int]], key: str, mask: int) -> None:
+        """Clear a mask from the top layer down, so a slot leaves the bitmap with its last match."""
+        stack = layers.get(key, [])
+        for k in range(len(stack) - 1, -1, -1):
+            drop = stack[k] & mask
+            stack[k] ^= drop
+            mask ^= drop
+        while stack and not stack[-1]:
+            stack.pop()
+        bitmaps[key] = bitmaps.get(key, 0) & ~mask
+
+    def is_free(self, start: float, end: float, venues: Iterable[str] = (), teams: Iterable[str] = ()) -> bool:
+        """Whether a match from start to end minutes clears the venues and, with rest, the teams."""
+        mask = self.grid.span(start, end)
+        if self.blocked & mask:
+            return False
+        if any(self.venues.get(venue, 0) & mask for venue in venues):
+            return False
+        rested = self.grid.span(start - self.rest_period, end + self.rest_period)
+        return not any(self.teams.get(team, 0) & rested for team in teams)
+
+    def first_free(self, start: float, duration: float, venues: Iterable[str] = (), teams: Iterable[str] = (),
+                   limit: Optional[int] = None) -> Optional[int]:
+        """First slot from the one at `start` on (up to slot `limit`) where a match of this length is free."""
+        venues, teams = tuple(venues), tuple(teams)
+        slot = self.grid.slot_at(start)
+        limit = limit if limit is not None else slot + self.grid.n_slots
+        while slot <= limit:
+            minutes = self.grid.minutes(slot)
+            if self.is_free(minutes, minutes + duration, venues, teams):
+                return slot
+            slot += 1
+        return None
+
+
+class GridEvaluator(PopulationEvaluator):
+    """Evaluate populations whose genes are slot indices on a time grid."""
+
+    def __init__(self, context: ProblemContext, weights: Dict[str, float],
+                 peak_hours: List[Tuple[int, int]], grid: TimeGrid):
+        """Keep the grid; decoding rounds every free start up to it."""
+        super().__init__(context, weights, peak_hours)
+        self.grid = grid
+        self.interval = grid.interval
+        self.release_slot_start = np.ceil(self.release / self.interval - EPSILON) * self.interval
+
+        # Plain lists for decoding single genomes
+        self._release_slot_start = self.release_slot_start.tolist()
+        self._pinned_start = [float(start) if pinned else None
+                              for start, pinned in zip(self.pinned_start.tolist(), self.pinned.tolist())]
+        self._durations = self.durations.tolist()
+
+        # Venue and teams (none for breaks) every match occupies
+        self.slot_keys: List[Tuple[str, Tuple[str, ...]]] = [
+            (venue_key(m.game_type), () if m.is_break else (m.team1.name, m.team2.name))
+            for m in context.matches]
+
+    def to_grid(self, minutes: np.ndarray) -> np.ndarray:
+        """Round minutes up to the next grid time."""
+        return np.ceil(minutes / self.interval - EPSILON) * self.interval
+
+    def decode(self, genomes: np.ndarray) -> np.ndarray:
+        """Decode a slot-index matrix into start times (minutes from venue open)."""
+        starts = np.maximum(self.release_slot_start, np.trunc(genomes) * self.interval)
+        starts[:, self.pinned] = self.pinned_start[self.pinned]
+
+        # Keep matches in their original relative order, on the grid
+        durations = self.durations
+        for prev, cur, buffer in self.order_links:
+            np.maximum(starts[:, cur], self.to_grid(starts[:, prev] + durations[prev] + buffer), out=starts[:, cur])
+        return starts
+
+    def decode_genome(self, genome: Sequence[int]) -> List[float]:
+        """Start times of one genome, as ``decode`` gives them, without the per-link array operations."""
+        interval = self.interval
+        earliest = self._release_slot_start
+        pinned_start = self._pinned_start
+        starts = [max(earliest[i], float(math.trunc(gene) * interval)) for i, gene in enumerate(genome)]
+        for i, start in enumerate(pinned_start):
+            if start is not None:
+                starts[i] = start
+        durations = self._durations
+        for prev, cur, buffer in self.order_links:
+            ready = math.ceil((starts[prev] + durations[prev] + buffer) / interval - EPSILON) * interval
+            if ready > starts[cur]:
+                starts[cur] = float(ready)
+        return starts
+
+    def occupancy(self, starts: Sequence[float], counted: bool = False) -> SlotOccupancy:
+        """Slot bitmaps of one decoded schedule (with per-slot counts when matches will be moved)."""
+        occupancy = SlotOccupancy(self.grid, self.rest_period, counted)
+        for i, (venue, teams) in enumerate(self.slot_keys):
+            occupancy.occupy(starts[i], starts[i] + self.durations[i], venue, teams)
+        return occupancy
+
+
+def grid_mutation(individual: List[int], evaluator: GridEvaluator, positions: List[int], max_shift: int,
+                  gene_prob: float = 0.2) -> Tuple[List[int],]:
+    """
+    Shift some genes by whole slots, then move each to the first slot from there
+    that is free of the other matches at its venue and of its teams, in place.
+
+    The occupancy is built once per individual; a moved match is vacated and
+    recorded again at its new start.
+    """
+    starts = evaluator.decode_genome(individual)
+    durations = evaluator._durations
+    occupancy = evaluator.occupancy(starts, counted=True)
+    for i in positions:
+        if random.random() >= gene_prob:
+            continue
+        individual[i] = max(0, individual[i] + random.randint(-max_shift, max_shift))
+        venue, teams = evaluator.slot_keys[i]
+        occupancy.vacate(starts[i], starts[i] + durations[i], venue, teams)
+        slot = occupancy.first_free(evaluator.grid.minutes(individual[i]), durations[i], (venue,), teams)
+        if slot is not None:
+            individual[i] = slot
+            starts[i] = evaluator.grid.minutes(slot)
+        occupancy.occupy(starts[i], starts[i] + durations[i], venue, teams)
+    return (individual,)
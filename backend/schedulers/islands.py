@@ -0,0 +1,103 @@
+"""
+Island-model helpers for the genetic algorithm optimizer.
+
+Each island is a sub-population that evolves on its own for a number of
+generations (an epoch) in a worker process. Between epochs the parent
+process moves the best individuals of every island to a neighbouring island
+and collects the islands' logbooks and best individuals. Workers build their
+own optimizer from the tournament, schedule and disruptions when the pool
+starts. Only plain genome lists and fitness values cross the process
+boundary, so the DEAP ``creator`` classes never need to be pickled.
+"""
+
+import random
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from deap import tools
+
+MIGRATION_TOPOLOGIES = ("ring", "random")
+
+# Optimizer built in each worker process by the pool initializer
+_island_optimizer = None
+
+
+def init_island_worker(optimizer_class, args: tuple, kwargs: dict) -> None:
+    """Build the worker's optimizer once, when the pool starts."""
+    global _island_optimizer
+    _island_optimizer = optimizer_class(*args, **kwargs)
+
+
+def island_seed(seed: Optional[int], island: int, generation: int) -> Optional[int]:
+    """Seed for one island epoch, derived from the run seed (None keeps runs unseeded)."""
+    if seed is None:
+        return None
+    return hash((seed, island, generation)) & 0xFFFFFFFF
+
+
+def evolve_island(genomes: List[List[int]], fitnesses: List[float], generations: int,
+                  seed: Optional[int]) -> Dict:
+    """Evolve one island for a number of generations inside a worker process."""
+    optimizer = _island_optimizer
+
+    # Reseed every epoch; forked workers would otherwise share one random state
+    random.seed(seed)
+    np.random.seed(seed)
+
+    pop = optimizer._individuals(genomes, fitnesses)
+    hof = tools.HallOfFame(5)
+    stats = optimizer._make_stats()
+    records = []
+    for gen in range(1, generations + 1):
+        nevals = optimizer._generation(pop, hof)
+        records.append(dict(gen=gen, nevals=nevals, **stats.compile(pop)))
+
+    return {
+        'genomes': [list(ind) for ind in pop],
+        'fitnesses': [ind.fitness.values[0] for ind in pop],
+        'records': records,
+        'best': [(list(ind), ind.fitness.values[0]) for ind in hof]
+    }
+
+
+def migrate(populations: List[List], k: int, topology: str, rng: random.Random,
+            clone: Callable) -> None:
+    """
+    Replace the k worst individuals of each receiving island with the k best of its source.
+
+    In a "ring" island i sends to island i + 1; with "random" every island
+    sends to another island chosen at random. Migrants are picked before any
+    island is changed.
+    """
+    n = len(populations)
+    if n < 2 or k <= 0:
+        return
+
+    if topology == "ring":
+        targets = [(i + 1) % n for i in range(n)]
+    else:
+        targets = [rng.choice([j for j in range(n) if j != i]) for i in range(n)]
+
+    migrants = [[clone(ind) for ind in sorted(pop, key=lambda ind: ind.fitness.values[0])[:k]]
+                for pop in populations]
+    for source, target in enumerate(targets):
+        pop = populations[target]
+        pop.sort(key=lambda ind: ind.fitness.values[0])
+        pop[len(pop) - len(migrants[source]):] = migrants[source]
+
+
+def merge_logbooks(logbooks: Sequence[tools.Logbook]) -> tools.Logbook:
+    """Combine per-island logbooks into one record per generation."""
+    merged = tools.Logbook()
+    merged.header = logbooks[0].header
+    for records in zip(*logbooks):
+        merged.record(
+            gen=records[0]['gen'],
+            nevals=sum(r['nevals'] for r in records),
+            min=min(r['min'] for r in records),
+            avg=float(np.mean([r['avg'] for r in records])),
+            max=max(r['max'] for r in records),
+            cache_hits=sum(r['cache_hits'] for r in records),
+            cache_misses=sum(r['cache_misses'] for r in records)
+        )
+    return merged
@@ -0,0 +1,259 @@
+"""
+Local search engines for small schedule adjustments.
+
+A genetic algorithm spends thousands of evaluations on a population. For a
+single late arrival or extended match a single-solution search usually finds
+an equally good schedule much sooner. ``LocalSearchOptimizer`` runs
+simulated annealing or tabu search over the same genome encoding, fitness
+function and protected positions as ``GeneticAlgorithmOptimizer``, and
+exposes the same ``optimize()`` contract. Each move changes one or two genes
+and is scored incrementally with ``DeltaEvaluator``.
+"""
+
+import math
+import random
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from deap import creator, tools
+
+from backend.models.models import Schedule, Disruption
+from backend.models.tournament import Tournament
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+
+# Optimization engines selectable per adjust request
+ENGINES = ("ga", "annealing", "tabu", "auto")
+
+# "auto" uses local search up to this many disruptions, or from this schedule size on
+LOCAL_SEARCH_MAX_DISRUPTIONS = 2
+LOCAL_SEARCH_MIN_MATCHES = 200
+
+
+def choose_engine(engine: str, n_disruptions: int, n_matches: int) -> str:
+    """Resolve an engine name, picking one for "auto" from the disruption count and schedule size."""
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown optimization engine: {engine}")
+    if engine != "auto":
+        return engine
+    if n_disruptions <= LOCAL_SEARCH_MAX_DISRUPTIONS or n_matches >= LOCAL_SEARCH_MIN_MATCHES:
+        return "annealing"
+    return "ga"
+
+
+class LocalSearchOptimizer(GeneticAlgorithmOptimizer):
+    """Optimizer using simulated annealing or tabu search on a single schedule."""
+
+    METHODS = ("annealing", "tabu")
+
+    # Probability that a move swaps two adjacent genes instead of shifting one
+    SWAP_PROB = 0.1
+
+    def __init__(self, tournament: Tournament, initial_schedule: Schedule, disruptions: List[Disruption],
+                 method: str = "annealing", iterations: int = 5000, epoch: int = 100,
+                 initial_temperature: Optional[float] = None, final_temperature: float = 0.1,
+                 tabu_tenure: int = 10, neighbourhood: int = 20, **options):
+        """
+        Initialize with a tournament, initial schedule, and disruptions.
+
+        method is "annealing" or "tabu". The search evaluates at most `iterations`
+        neighbouring schedules. Annealing cools geometrically from initial_temperature
+        (estimated from random moves when None) to final_temperature. Tabu search
+        scores `neighbourhood` moves per step and does not move a gene again
+        within tabu_tenure steps unless that beats the best schedule.
+
+        Other options are passed on to GeneticAlgorithmOptimizer. Its stopping criteria
+        are checked every `epoch` iterations, and one epoch counts as a generation for
+        stagnation_generations and in the logbook.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown local search method: {method}")
+        if options.get('encoding', "time") != "time":
+            raise ValueError("Local search moves only apply to the time encoding")
+        options.setdefault('delta_evaluation', True)
+        super().__init__(tournament, initial_schedule, disruptions, **options)
+        self.method = method
+        self.iterations = iterations
+        self.epoch = epoch
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.tabu_tenure = tabu_tenure
+        self.neighbourhood = neighbourhood
+        self.evaluations = 0
+        # Lowest gene of every position: no move starts a match before its original time
+        self.floor = [int(math.ceil(release)) for release in self.context.release.tolist()]
+
+    # Moves and scoring
+
+    def _random_move(self, genome: List[int]) -> Tuple[List[int], Tuple[int, ...]]:
+        """Neighbouring genome and the positions it changed."""
+        positions = self.context.mutable_positions
+        neighbour = list(genome)
+        if random.random() < self.SWAP_PROB and len(positions) >= 2:
+            # Swap two adjacent unprotected positions, as in _mutate
+            pos1 = random.choice(positions)
+            adjacent = [p for p in (pos1 - 1, pos1 + 1)
+                        if 0 <= p < len(genome) and p not in self.context.protected]
+            if adjacent:
+                pos2 = random.choice(adjacent)
+                neighbour[pos1], neighbour[pos2] = (max(self.floor[pos1], neighbour[pos2]),
+                                                    max(self.floor[pos2], neighbour[pos1]))
+                return neighbour, (pos1, pos2)
+
+        # Shift one gene by a few setup-sized units
+        i = random.choice(positions)
+        shift_unit = max(5, self.tournament.rest_period / 4)
+        shift = int(random.choice((-4, -3, -2, -1, 1, 2, 3, 4)) * shift_unit)
+        neighbour[i] = max(self.floor[i], neighbour[i] + shift)
+        return neighbour, (i,)
+
+    def _score(self, state, genome: List[int]):
+        """Delta state (or None) and penalty of a neighbouring genome."""
+        self.evaluations += 1
+        if self.delta is not None:
+            state = self.delta.apply(state, genome)
+            return state, self.delta.penalty(state)
+        return None, float(self.evaluator.evaluate([genome])[0])
+
+    def _start(self) -> Tuple[List[int], float]:
+        """Best starting genome and its penalty."""
+        if self.warm_start:
+            genomes = self.repairer.repair_population(self._heuristic_seeds())
+        else:
+            genome = self._create_schedule()
+            for i in self.context.mutable_positions:
+                genome[i] = max(self.floor[i], genome[i])
+            genomes = [genome]
+        penalties = self.evaluator.evaluate(genomes)
+        self.evaluations += len(genomes)
+        best = int(np.argmin(penalties))
+        return genomes[best], float(penalties[best])
+
+    def _estimate_temperature(self, genome: List[int], penalty: float, state, samples: int = 30) -> float:
+        """Initial temperature that accepts an average uphill move about half the time."""
+        uphill = []
+        for _ in range(samples):
+            neighbour, _ = self._random_move(genome)
+            _, score = self._score(state, neighbour)
+            if score > penalty:
+                uphill.append(score - penalty)
+        if not uphill:
+            return 1.0
+        return float(np.mean(uphill)) / math.log(2)
+
+    # Search
+
+    def _anneal_step(self, search: dict) -> None:
+        """Evaluate one random move and accept it by the Metropolis criterion."""
+        neighbour, _ = self._random_move(search['genome'])
+        state, penalty = self._score(search['state'], neighbour)
+        delta = penalty - search['penalty']
+        if delta <= 0 or random.random() < math.exp(-delta / search['temperature']):
+            search.update(genome=neighbour, state=state, penalty=penalty)
+        search['temperature'] *= search['cooling']
+
+    def _tabu_step(self, search: dict, moves: int, best_penalty: float) -> None:
+        """Move to the best admissible schedule among sampled neighbours."""
+        step = search['step'] = search['step'] + 1
+        tabu_until = search['tabu_until']
+        chosen = None
+        for _ in range(moves):
+            neighbour, positions = self._random_move(search['genome'])
+            state, penalty = self._score(search['state'], neighbour)
+            # Tabu moves are only allowed when they beat the best schedule (aspiration)
+            if any(tabu_until.get(p, 0) > step for p in positions) and penalty >= best_penalty:
+                continue
+            if chosen is None or penalty < chosen[2]:
+                chosen = (neighbour, state, penalty, positions)
+        if chosen is not None:
+            neighbour, state, penalty, positions = chosen
+            search.update(genome=neighbour, state=state, penalty=penalty)
+            for p in positions:
+                tabu_until[p] = step + self.tabu_tenure
+
+    def optimize(self) -> Schedule:
+        """Run the local search to optimize the schedule."""
+        self._started = time.perf_counter()
+
+        # Seed the move generator for reproducible runs
+        if self.seed is not None:
+            random.seed(self.seed)
+            np.random.seed(self.seed)
+        self.evaluations = 0
+
+        genome, penalty = self._start()
+        search = {
+            'genome': genome,
+            'penalty': penalty,
+            'state': self.delta.full_state(genome) if self.delta is not None else None,
+            'step': 0,
+            'tabu_until': {},
+        }
+        best = creator.Individual(genome)
+        best.fitness.values = (penalty,)
+
+        annealing = self.method == "annealing"
+        if annealing:
+            temperature = self.initial_temperature
+            if temperature is None:
+                temperature = self._estimate_temperature(genome, penalty, search['state'])
+            temperature = max(temperature, self.final_temperature)
+            search['temperature'] = temperature
+            search['cooling'] = (self.final_temperature / temperature) ** (1 / max(1, self.iterations))
+
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals', 'min', 'current'] + (['temperature'] if annealing else [])
+        self.logbook = logbook
+
+        def record(gen: int, nevals: int) -> None:
+            extra = {'temperature': search['temperature']} if annealing else {}
+            logbook.record(gen=gen, nevals=nevals, min=best.fitness.values[0], current=search['penalty'], **extra)
+            print(logbook.stream)
+
+        record(0, self.evaluations)
+
+        # Epochs of local search moves, with the GA's stopping criteria checked in between
+        best_fitness = best.fitness.values[0]
+        stale = 0
+        iterations = 0
+        epoch_seconds = 0.0
+        gen = 0
+        self.stop_reason = "iterations"
+        while iterations < self.iterations:
+            reason = self._check_stop(best, stale, epoch_seconds)
+            if reason:
+                self.stop_reason = reason
+                break
+            epoch_start = time.perf_counter()
+            epoch_evaluations = self.evaluations
+
+            epoch_end = min(self.iterations, iterations + self.epoch)
+            while iterations < epoch_end:
+                if annealing:
+                    self._anneal_step(search)
+                    iterations += 1
+                else:
+                    moves = min(self.neighbourhood, epoch_end - iterations)
+                    self._tabu_step(search, moves, best.fitness.values[0])
+                    iterations += moves
+                if search['penalty'] < best.fitness.values[0]:
+                    best = creator.Individual(search['genome'])
+                    best.fitness.values = (search['penalty'],)
+
+            gen += 1
+            record(gen, self.evaluations - epoch_evaluations)
+
+            # Track stagnation of the best fitness
+            if best.fitness.values[0] < best_fitness:
+                best_fitness = best.fitness.values[0]
+                stale = 0
+            else:
+                stale += 1
+            epoch_seconds = time.perf_counter() - epoch_start
+
+        self.hall_of_fame = tools.HallOfFame(1)
+        self.hall_of_fame.update([best])
+        self._record_gap(best)
+
+        # Decode and return the best schedule found
+        return self._decode_schedule(best)
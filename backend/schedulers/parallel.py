@@ -0,0 +1,82 @@
+"""
+Process-pool fitness evaluation for the genetic algorithm optimizer.
+
+Each worker receives the immutable ``PopulationEvaluator`` once, when the
+pool starts. After that only compact integer genome matrices cross the
+process boundary, and only penalty arrays come back. Genomes are sent as
+plain NumPy arrays rather than ``creator.Individual`` instances. Worker
+processes therefore never need the DEAP classes that ``_setup_ga``
+registers globally in the parent.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from backend.schedulers.fitness import PopulationEvaluator
+
+# Evaluator installed in each worker process by the pool initializer
+_worker_evaluator: Optional[PopulationEvaluator] = None
+
+
+def _init_worker(evaluator: PopulationEvaluator) -> None:
+    """Store the problem description in the worker process."""
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _evaluate_chunk(genomes: np.ndarray) -> np.ndarray:
+    """Evaluate a chunk of genomes inside a worker process."""
+    return _worker_evaluator.evaluate_starts(_worker_evaluator.decode(genomes))
+
+
+class ParallelEvaluator:
+    """Evaluate populations across a pool of worker processes."""
+
+    def __init__(self, evaluator: PopulationEvaluator, workers: int = 0,
+                 chunk_size: Optional[int] = None):
+        """Initialize with an evaluator, a worker count (0 = all cores) and a chunk size."""
+        self.evaluator = evaluator
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """Start the worker pool and ship the problem description to each worker."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.evaluator,)
+            )
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self) -> 'ParallelEvaluator':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _chunks(self, genomes: np.ndarray) -> List[np.ndarray]:
+        """Split a genome matrix into row chunks, one or more per worker."""
+        size = self.chunk_size or -(-len(genomes) // self.workers)
+        return [genomes[lo:lo + size] for lo in range(0, len(genomes), size)]
+
+    def evaluate(self, population: Sequence[Sequence[int]]) -> np.ndarray:
+        """Weighted penalty for every individual, evaluated in the worker pool."""
+        if len(population) == 0:
+            return np.zeros(0, dtype=float)
+        self.start()
+
+        # Integer genomes keep the per-generation payload small
+        genomes = np.asarray(population, dtype=np.int32).reshape(len(population), -1)
+        results = self._pool.map(_evaluate_chunk, self._chunks(genomes))
+        return np.concatenate(list(results))
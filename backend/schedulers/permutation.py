@@ -0,0 +1,222 @@
+"""
+Permutation genome encoding for the genetic algorithm optimizer.
+
+The default genome holds one start minute per match. Most such genomes
+overlap or leave gaps, and decoding has to force the matches back into
+their original order. A permutation genome instead holds, for every venue,
+the order in which its free matches are played, followed by one gap gene
+per free match:
+
+    [venue 1 order ... | venue 2 order ... | gap of free match 1, 2, ...]
+
+A deterministic builder decodes it. Pinned matches (fixed-time events,
+late arrivals) and breaks keep their time. The builder then repeatedly takes,
+from every venue, the first match in its order whose predecessors are all
+placed. It places the one that can start earliest. A match starts no earlier
+than its original time, after the previous match at its venue (plus setup
+time), after both teams' rest and after its lower rounds (or bracket
+predecessors), plus its gap in minutes. Starts that would hit a kept match
+of the same venue or team are pushed past it. Every decoded schedule is
+therefore free of overlaps and rest violations between free matches, and
+the search only decides orders and waits.
+
+Crossover applies an order crossover (OX or PMX) to every venue's order
+and a two-point crossover to the gaps. Mutation swaps or moves matches
+within a venue's order and shifts gaps.
+"""
+
+import math
+import random
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from deap import tools
+
+from backend.models.models import venue_key
+from backend.schedulers.context import ProblemContext, SETUP_TIME
+from backend.schedulers.fitness import PopulationEvaluator
+
+# Order crossovers for the venue segments
+PERMUTATION_CROSSOVERS = ("ox", "pmx")
+
+
+class PermutationEvaluator(PopulationEvaluator):
+    """Evaluate populations of per-venue permutation genomes with gap genes."""
+
+    def __init__(self, context: ProblemContext, weights: Dict[str, float],
+                 peak_hours: List[Tuple[int, int]]):
+        """Lay out the genome and precompute what the schedule builder needs."""
+        super().__init__(context, weights, peak_hours)
+        matches = context.matches
+        durations = context.durations
+        rest = context.rest_period
+
+        # Free matches are permuted; all others keep their start
+        self.free: List[int] = list(context.mutable_positions)
+        self.n_free = len(self.free)
+        self.genome_length = 2 * self.n_free
+        self.gap_slot: Dict[int, int] = {i: self.n_free + k for k, i in enumerate(self.free)}
+
+        # Venue orders start from the original start order
+        original = {context.index_of[match_id]: position
+                    for position, match_id in enumerate(context.original_order)}
+        by_venue: Dict[str, List[int]] = {}
+        for i in sorted(self.free, key=original.__getitem__):
+            by_venue.setdefault(venue_key(matches[i].game_type), []).append(i)
+        self.segments: List[Tuple[int, int]] = []
+        self.venue_orders: List[List[int]] = []
+        for venue in sorted(by_venue):
+            start = self.segments[-1][1] if self.segments else 0
+            self.segments.append((start, start + len(by_venue[venue])))
+            self.venue_orders.append(by_venue[venue])
+
+        # Start of every kept match; free matches start no earlier than their original time (or the cutoff)
+        self.release = context.release
+        kept = [i for i in range(context.n_matches) if i not in self.gap_slot]
+
+        self.teams: List[Tuple[str, ...]] = [tuple({m.team1.name, m.team2.name}) for m in matches]
+        self.round_of: List[int] = [m.round_number for m in matches]
+
+        # Start intervals that would hit a kept match, and the ends of kept predecessors
+        self.windows: List[List[Tuple[float, float]]] = [[] for _ in range(context.n_matches)]
+        self.kept_wait = np.zeros(context.n_matches, dtype=float)
+        self.predecessors: Dict[int, List[int]] = {i: [] for i in self.free}
+        if context.dependencies is not None:
+            for source, target in context.dependencies:
+                if target in self.gap_slot:
+                    self.predecessors[target].append(source)
+        for i in self.free:
+            match = matches[i]
+            for k in kept:
+                other = matches[k]
+                shares_team = bool(set(self.teams[i]) & set(self.teams[k]))
+                if not shares_team and venue_key(other.game_type) != venue_key(match.game_type):
+                    continue
+                pad = rest if shares_team else 0
+                start = self.release[k]
+                self.windows[i].append((start - pad - durations[i], start + durations[k] + pad))
+            self.windows[i].sort()
+            if context.dependencies is None:
+                self.kept_wait[i] = max((self.release[k] + durations[k] for k in kept
+                                         if self.round_of[k] < self.round_of[i]), default=0.0)
+            else:
+                self.kept_wait[i] = max((self.release[k] + durations[k] for k in self.predecessors[i]
+                                         if k not in self.gap_slot), default=0.0)
+                self.predecessors[i] = [k for k in self.predecessors[i] if k in self.gap_slot]
+        self.by_dependencies = context.dependencies is not None
+        self.successors: Dict[int, List[int]] = {i: [] for i in self.free}
+        for i, sources in self.predecessors.items():
+            for source in sources:
+                self.successors[source].append(i)
+
+    def identity_genome(self) -> List[int]:
+        """Every venue in its original order, without gaps."""
+        return [i for venue in self.venue_orders for i in venue] + [0] * self.n_free
+
+    def as_matrix(self, population: Sequence[Sequence[int]]) -> np.ndarray:
+        """Stack a population of permutation genomes into an (individuals x genes) matrix."""
+        return np.asarray(population, dtype=float).reshape(len(population), self.genome_length)
+
+    def decode(self, genomes: np.ndarray) -> np.ndarray:
+        """Build the start times (minutes from venue open) of every permutation genome."""
+        starts = np.tile(self.release, (genomes.shape[0], 1))
+        for row, genome in enumerate(genomes.astype(int).tolist()):
+            self._build(genome, starts[row])
+        return starts
+
+    def _build(self, genome: List[int], starts: np.ndarray) -> None:
+        """Place the free matches of one genome at their earliest feasible start."""
+        durations = self.durations
+        rest = self.rest_period
+        queues = [genome[a:b] for a, b in self.segments]
+        venue_ready = [-math.inf] * len(queues)
+        team_ready: Dict[str, float] = {}
+        end_of: Dict[int, float] = {}
+
+        # Outstanding free matches per round (or per match, its unplaced predecessors)
+        pending: Dict[int, int] = {}
+        round_end: Dict[int, float] = {}
+        if self.by_dependencies:
+            waiting = {i: len(self.predecessors[i]) for i in self.free}
+        else:
+            for i in self.free:
+                pending[self.round_of[i]] = pending.get(self.round_of[i], 0) + 1
+
+        for _ in range(self.n_free):
+            lowest = min((r for r, count in pending.items() if count), default=0)
+            best = None
+            for v, queue in enumerate(queues):
+                # First match of the venue's order whose predecessors are all placed
+                for position, i in enumerate(queue):
+                    if (waiting[i] == 0) if self.by_dependencies else (self.round_of[i] <= lowest):
+                        break
+                else:
+                    continue
+                if self.by_dependencies:
+                    wait = max((end_of[k] for k in self.predecessors[i]), default=0.0)
+                else:
+                    wait = max((end for r, end in round_end.items() if r < self.round_of[i]), default=0.0)
+                start = max([self.release[i], self.kept_wait[i], wait, venue_ready[v]] +
+                            [team_ready.get(team, -math.inf) for team in self.teams[i]])
+                start += genome[self.gap_slot[i]]
+                for lo, hi in self.windows[i]:
+                    if lo < start < hi:
+                        start = hi
+                if best is None or start < best[0]:
+                    best = (start, v, position, i)
+
+            start, v, position, i = best
+            del queues[v][position]
+            end = start + durations[i]
+            starts[i] = start
+            end_of[i] = end
+            venue_ready[v] = end + SETUP_TIME
+            for team in self.teams[i]:
+                team_ready[team] = end + rest
+            if self.by_dependencies:
+                for k in self.successors[i]:
+                    waiting[k] -= 1
+            else:
+                pending[self.round_of[i]] -= 1
+                round_end[self.round_of[i]] = max(round_end.get(self.round_of[i], end), end)
+
+    def earliest_decoded(self) -> np.ndarray:
+        """Earliest start of every match over all built schedules, as a 1 x matches matrix."""
+        return self.release[None, :].copy()
+
+
+def venue_crossover(ind1: List[int], ind2: List[int], segments: Sequence[Tuple[int, int]],
+                    gap_offset: int, method: str = "ox") -> Tuple[List[int], List[int]]:
+    """Order crossover (OX or PMX) of every venue's order and two-point crossover of the gaps, in place."""
+    operator = tools.cxOrdered if method == "ox" else tools.cxPartialyMatched
+    for a, b in segments:
+        if b - a < 2:
+            continue
+        # DEAP's order crossovers work on permutations of 0..n-1
+        ids = sorted(ind1[a:b])
+        rank = {i: r for r, i in enumerate(ids)}
+        child1, child2 = operator([rank[i] for i in ind1[a:b]], [rank[i] for i in ind2[a:b]])
+        ind1[a:b] = [ids[r] for r in child1]
+        ind2[a:b] = [ids[r] for r in child2]
+    if len(ind1) - gap_offset >= 2:
+        gaps1, gaps2 = tools.cxTwoPoint(ind1[gap_offset:], ind2[gap_offset:])
+        ind1[gap_offset:] = gaps1
+        ind2[gap_offset:] = gaps2
+    return ind1, ind2
+
+
+def venue_mutation(individual: List[int], segments: Sequence[Tuple[int, int]], gap_offset: int,
+                   gap_step: int, order_prob: float = 0.5, gap_prob: float = 0.1) -> Tuple[List[int],]:
+    """Swap or move one match within some venues' order and shift some gaps, in place."""
+    for a, b in segments:
+        if b - a < 2 or random.random() >= order_prob:
+            continue
+        pos1, pos2 = random.sample(range(a, b), 2)
+        if random.random() < 0.5:
+            individual[pos1], individual[pos2] = individual[pos2], individual[pos1]
+        else:
+            individual.insert(pos2, individual.pop(pos1))
+    for k in range(gap_offset, len(individual)):
+        if random.random() < gap_prob:
+            individual[k] = max(0, individual[k] + random.choice((-2, -1, 1, 2)) * gap_step)
+    return (individual,)
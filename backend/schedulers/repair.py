@@ -0,0 +1,173 @@
+"""
+Feasibility repair for decoded GA schedules.
+
+Decoding already keeps the non-fixed matches in one chain in their original
+order, so they cannot overlap each other. The remaining hard-constraint
+violations come from the pinned fixed-time events, and from the venue
+closing time. The repairer walks the chain once. It moves each free match to
+the nearest start that clears the pinned events and still leaves room for
+its successors before the latest point the chain allows. A match may not overlap an
+event at its venue. It must keep the rest period to an event of one of its
+teams. It must respect the round order (or bracket dependencies) against the event. It must also end
+before the venue closes. Each match stays at or after the end of its chain
+predecessor (plus the setup or rest buffer), so the result decodes to
+itself. Late-arrival pins and breaks are never searched; they only follow
+the chain.
+"""
+
+import math
+from bisect import bisect_right
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.models.models import venue_key
+from backend.schedulers.context import ProblemContext
+from backend.schedulers.fitness import PopulationEvaluator
+
+# Tolerance when rounding repaired starts to whole minutes
+EPSILON = 1e-9
+
+
+class ScheduleRepairer:
+    """Move free matches to the nearest start that clears the pinned fixed-time events."""
+
+    def __init__(self, context: ProblemContext, evaluator: PopulationEvaluator):
+        """Precompute the blocking windows every free match must avoid."""
+        self.context = context
+        self.evaluator = evaluator
+        matches = context.matches
+        durations = context.durations
+        rest = context.rest_period
+        day_length = context.venue_end_minutes - context.venue_start_minutes
+
+        # Links into each chain position: (predecessor, buffer)
+        self.links = {cur: (prev, buffer) for prev, cur, buffer in context.order_links}
+
+        events = [i for i in range(context.n_matches) if context.fixed[i] and context.pinned[i]]
+
+        # For each free match: forbidden open start intervals (lo, hi) and a lower bound,
+        # starting from the release time so no match moves before its original start
+        self.windows: List[List[Tuple[float, float]]] = [[] for _ in range(context.n_matches)]
+        self.lower_bounds = context.release.copy()
+        for i in context.chain:
+            match = matches[i]
+            teams = {match.team1.name, match.team2.name}
+            windows = [(day_length - durations[i], math.inf)]
+            for e in events:
+                event = matches[e]
+                start, end = context.pinned_start[e], context.pinned_start[e] + durations[e]
+                shares_team = bool(teams & {event.team1.name, event.team2.name})
+                pad = rest if shares_team else 0
+                if shares_team or venue_key(event.game_type) == venue_key(match.game_type):
+                    windows.append((start - pad - durations[i], end + pad))
+                if context.bracket is not None:
+                    before = event.id in context.bracket.predecessors(match.id)
+                    after = event.id in context.bracket.successors(match.id)
+                else:
+                    before = event.round_number < match.round_number
+                    after = event.round_number > match.round_number
+                if before:
+                    self.lower_bounds[i] = max(self.lower_bounds[i], end)
+                elif after:
+                    windows.append((start - durations[i], math.inf))
+            self.windows[i] = windows
+
+        # Chain members that must not be searched
+        self.frozen = context.pinned | context.is_break
+
+        # Latest start of each chain match that still leaves room for its successors.
+        # Breaks must keep their original time; other matches are bounded by the
+        # open-ended windows (venue close, later-round events).
+        latest = np.full(context.n_matches, math.inf)
+        for i in context.chain:
+            if context.is_break[i] and not context.pinned[i] and context.has_original[i]:
+                latest[i] = context.original_start[i]
+            elif not self.frozen[i]:
+                latest[i] = min(lo for lo, hi in self.windows[i] if math.isinf(hi))
+        for prev, cur, buffer in reversed(context.order_links):
+            latest[prev] = min(latest[prev], latest[cur] - durations[prev] - buffer)
+        for i in context.chain:
+            if not self.frozen[i] and not math.isinf(latest[i]):
+                self.windows[i].append((latest[i], math.inf))
+            self.windows[i] = self._merge(self.windows[i])
+        self.window_starts = [[lo for lo, _ in windows] for windows in self.windows]
+
+        # Plain lists for the per-individual walk
+        self._durations = context.durations.tolist()
+        self._lower_bounds = self.lower_bounds.tolist()
+        self._pinned = context.pinned.tolist()
+        self._frozen_starts = {
+            i: context.pinned_start[i] if context.pinned[i] else context.original_start[i]
+            for i in context.chain
+            if self.frozen[i] and (context.pinned[i] or context.has_original[i])
+        }
+        self.frozen = self.frozen.tolist()
+
+    @staticmethod
+    def _merge(windows: Sequence[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        """Merge overlapping open intervals into sorted, disjoint ones."""
+        merged: List[Tuple[float, float]] = []
+        for lo, hi in sorted(w for w in windows if w[0] < w[1]):
+            if merged and lo < merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        return merged
+
+    def _nearest_start(self, i: int, target: float, lower: float) -> Optional[float]:
+        """Closest start to target that is at least lower and outside every window of match i."""
+        windows = self.windows[i]
+        start = max(target, lower)
+        k = bisect_right(self.window_starts[i], start) - 1
+        if k < 0 or not start < windows[k][1]:
+            return start
+
+        # Inside window k: step out to its left edge (if the order allows) or its right edge
+        lo, hi = windows[k]
+        left = lo if lo >= lower else None
+        right = hi if not math.isinf(hi) else None
+        if left is None or (right is not None and right - target <= target - left):
+            return right
+        return left
+
+    def repair_starts(self, starts: Sequence[float]) -> List[float]:
+        """Repair one decoded individual (a vector of start minutes)."""
+        repaired = [float(start) for start in starts]
+        durations = self._durations
+        lower_bounds = self._lower_bounds
+        for i in self.context.chain:
+            lower = 0.0
+            link = self.links.get(i)
+            if link is not None:
+                prev, buffer = link
+                lower = repaired[prev] + durations[prev] + buffer
+
+            if self.frozen[i]:
+                base = self._frozen_starts.get(i, repaired[i])
+                repaired[i] = max(base, lower)
+                continue
+
+            lower = max(lower, lower_bounds[i])
+            start = self._nearest_start(i, repaired[i], lower)
+            repaired[i] = start if start is not None else max(repaired[i], lower)
+        return repaired
+
+    def encode(self, starts: Sequence[float], genome: Sequence[int]) -> List[int]:
+        """Genome that decodes to the given starts (pinned genes are left as they were)."""
+        pinned = self._pinned
+        return [
+            int(gene) if pinned[i] else int(math.ceil(start - EPSILON))
+            for i, (gene, start) in enumerate(zip(genome, starts))
+        ]
+
+    def repair_population(self, population: Sequence[Sequence[int]]) -> List[List[int]]:
+        """Repair every genome of a population, decoding them in one batch."""
+        if len(population) == 0:
+            return []
+        starts = self.evaluator.decode(self.evaluator.as_matrix(population))
+        return [self.encode(self.repair_starts(row), genome) for row, genome in zip(starts, population)]
+
+    def repair(self, genome: Sequence[int]) -> List[int]:
+        """Repair a genome so that it decodes to the nearest feasible schedule."""
+        return self.repair_population([genome])[0]
@@ -2,25 +2,187 @@
 Scheduling algorithms for the esports tournament.
 """
 
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+import math
+import os
 import random
+import time
 from typing import Dict, List, Tuple, Set, Optional
 import networkx as nx
 import numpy as np
 from deap import base, creator, tools, algorithms
 
-from backend.models.models import Match, Team, Schedule, Disruption
+from backend.models.models import Match, Team, Schedule, Disruption, venue_key
+from backend.models.arrays import ScheduleArrays
 from backend.models.tournament import Tournament
+from backend.models.bounds import schedule_bounds
+from backend.models.conflict_graph import iter_bits
+from backend.schedulers.coloring import dsatur_coloring
+from backend.schedulers.context import ProblemContext
+from backend.schedulers.delta import DeltaEvaluator
+from backend.schedulers.fitness import IDLE_THRESHOLD, PopulationEvaluator, FitnessCache
+from backend.schedulers.islands import (MIGRATION_TOPOLOGIES, init_island_worker, evolve_island,
+                                        island_seed, migrate, merge_logbooks)
+from backend.schedulers.parallel import ParallelEvaluator
+from backend.schedulers.grid import GridEvaluator, SlotOccupancy, TimeGrid, grid_mutation
+from backend.schedulers.permutation import (PERMUTATION_CROSSOVERS, PermutationEvaluator, venue_crossover,
+                                            venue_mutation)
+from backend.schedulers.repair import ScheduleRepairer
+from backend.schedulers.sweep import conflict_groups, count_overlapping_pairs, count_late_starts
 
 class GraphColoringScheduler:
     """Scheduler using graph coloring algorithm for initial scheduling."""
     
-    def __init__(self, tournament: Tournament):
-        """Initialize with a tournament."""
+    MODES = ("dsatur", "legacy")
+    
+    def __init__(self, tournament: Tournament, mode: str = "dsatur", slot_interval: int = 5):
+        """
+        Initialize with a tournament.
+        
+        mode "dsatur" colors the conflict graph and maps colors to time slots;
+        mode "legacy" uses the original fixed morning/afternoon slots.
+        slot_interval is the grid (in minutes) of Tournament.get_timeslots.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown scheduling mode: {mode}")
         self.tournament = tournament
         self.conflict_graph = tournament.conflict_graph
+        self.mode = mode
+        self.slot_interval = slot_interval
+        
+        # Matches that did not fit within venue hours in the last run
+        self.unscheduled_matches: List[Match] = []
     
     def generate_schedule(self) -> Schedule:
+        """Generate a schedule with the configured mode."""
+        if self.mode == "legacy":
+            return self._generate_legacy_schedule()
+        return self._generate_dsatur_schedule()
+    
+    def _generate_dsatur_schedule(self) -> Schedule:
+        """Color the conflict graph with DSATUR and give each color its own time slot."""
+        self.conflict_graph = self.tournament.get_conflict_graph()
+        self.unscheduled_matches = []
+        rest = timedelta(minutes=self.tournament.rest_period)
+        
+        # Fixed-time events that already have a time stay where they are
+        pinned = [m for m in self.tournament.matches if m.is_fixed_time and m.start_time]
+        free = [m for m in self.tournament.matches if not (m.is_fixed_time and m.start_time)]
+        index_of = {id(m): i for i, m in enumerate(free)}
+        
+        # Conflict graph edges, plus same-venue pairs: one game type plays at one venue at a time
+        masks = [0] * len(free)
+        venue_masks: Dict = {}
+        for i, match in enumerate(free):
+            venue_masks[venue_key(match.game_type)] = venue_masks.get(venue_key(match.game_type), 0) | 1 << i
+        for i, match in enumerate(free):
+            mask = venue_masks[venue_key(match.game_type)] & ~(1 << i)
+            for neighbor in self.conflict_graph.neighbors(match):
+                j = index_of.get(id(neighbor))
+                if j is not None:
+                    mask |= 1 << j
+            masks[i] = mask
+        
+        levels = self.tournament.sequence_levels(free)
+        if self.tournament.has_bracket:
+            # Only direct dependencies are edges, so each bracket level is colored on its own
+            colors = [0] * len(free)
+            for level in sorted(set(levels.values())):
+                members = [i for i, m in enumerate(free) if levels[m.id] == level]
+                position = {i: k for k, i in enumerate(members)}
+                sub_masks = [sum(1 << position[j] for j in iter_bits(masks[i]) if j in position) for i in members]
+                for i, color in zip(members, dsatur_coloring(sub_masks)):
+                    colors[i] = (level, color)
+        else:
+            colors = dsatur_coloring(masks, priority=[m.round_number for m in free])
+        
+        # Slots run in round (or bracket level) order; different levels never share a color
+        groups: Dict = {}
+        for match, color in zip(free, colors):
+            groups.setdefault(color, []).append(match)
+        slots = sorted(groups.values(), key=lambda group: (min(levels[m.id] for m in group),
+                                                           min(index_of[id(m)] for m in group)))
+        
+        # Slot times come from the tournament's grid; the fixed-time events are marked on its bitmaps
+        grid = TimeGrid.for_tournament(self.tournament, self.slot_interval)
+        timeslots = grid.times
+        occupancy = SlotOccupancy(grid, self.tournament.rest_period)
+        for event in pinned:
+            occupancy.occupy(grid.offset(event.start_time), grid.offset(event.end_time), venue_key(event.game_type),
+                             () if event.is_break else (event.team1.name, event.team2.name),
+                             blocks_all=event.is_break)
+        venue_close = timeslots[-1]
+        team_ready: Dict[str, datetime] = {}
+        earliest = timeslots[0]
+        scheduled: List[Match] = []
+        
+        for k, group in enumerate(slots):
+            # Start after the previous slot and after every team has rested
+            ready = max([earliest] + [team_ready[name] for m in group if not m.is_break
+                                      for name in (m.team1.name, m.team2.name) if name in team_ready])
+            start = self._place_slot(group, ready, pinned, timeslots, rest, occupancy)
+            length = timedelta(minutes=max(m.duration for m in group))
+            if start is None or start + length > venue_close:
+                for remaining in slots[k:]:
+                    self.unscheduled_matches.extend(remaining)
+                break
+            
+            for match in group:
+                match.set_time(start)
+                scheduled.append(match)
+                if not match.is_break:
+                    for name in (match.team1.name, match.team2.name):
+                        team_ready[name] = match.end_time + rest
+            earliest = start + length
+        
+        schedule = Schedule()
+        if hasattr(self.tournament, 'fixed_events') and self.tournament.fixed_events:
+            for fixed_event in self.tournament.fixed_events:
+                schedule.add_match(fixed_event)
+        for match in sorted(pinned + scheduled, key=lambda m: m.start_time):
+            schedule.add_match(match)
+        
+        return schedule
+    
+    def _place_slot(self, group: List[Match], ready: datetime, pinned: List[Match],
+                    timeslots: List[datetime], rest: timedelta,
+                    occupancy: Optional[SlotOccupancy] = None) -> Optional[datetime]:
+        """
+        Earliest grid time from ready on where the slot clears the fixed-time events.
+        
+        The occupancy bitmaps of the events over-approximate them, so a slot they
+        leave free is accepted without checking every event.
+        """
+        length = timedelta(minutes=max(m.duration for m in group))
+        venues = {venue_key(m.game_type) for m in group}
+        teams = {name for m in group if not m.is_break for name in (m.team1.name, m.team2.name)}
+        
+        start = ready
+        while True:
+            i = bisect_left(timeslots, start)
+            if i == len(timeslots):
+                return None
+            start = timeslots[i]
+            end = start + length
+            if occupancy is not None and occupancy.is_free(occupancy.grid.offset(start), occupancy.grid.offset(end),
+                                                           venues, teams):
+                return start
+            
+            # Move past the first fixed-time event the slot would collide with
+            blocked_until = None
+            for event in pinned:
+                shares_team = bool(teams & {event.team1.name, event.team2.name}) and not event.is_break
+                padding = rest if shares_team else timedelta(0)
+                blocking = event.is_break or shares_team or venue_key(event.game_type) in venues
+                if blocking and start < event.end_time + padding and event.start_time - padding < end:
+                    blocked_until = max(blocked_until or event.end_time, event.end_time + padding)
+            if blocked_until is None:
+                return start
+            start = blocked_until
+    
+    def _generate_legacy_schedule(self) -> Schedule:
         """Generate a schedule using fixed time slots."""
         # Create a schedule
         schedule = Schedule()
@@ -42,8 +204,8 @@ class GraphColoringScheduler:
         morning_slot_index = 0
         afternoon_slot_index = 0
         
-        # Get venue date (using today's date for simplicity)
-        venue_date = datetime.today().date()
+        # Get venue date (the tournament's first day)
+        venue_date = self.tournament.venue_windows[0][0].date()
         
         # First add any fixed events from the tournament
         if hasattr(self.tournament, 'fixed_events') and self.tournament.fixed_events:
@@ -109,25 +271,163 @@ class GraphColoringScheduler:
 class GeneticAlgorithmOptimizer:
     """Optimizer using genetic algorithms for dynamic schedule adjustments."""
     
-    def __init__(self, tournament: Tournament, initial_schedule: Schedule, disruptions: List[Disruption]):
-        """Initialize with a tournament, initial schedule, and disruptions."""
+    # Genome encodings: start minutes, per-venue permutations, or slot indices on a time grid
+    ENCODINGS = ("time", "permutation", "grid")
+    
+    # Random perturbations used to diversify warm-start seeds
+    SEED_PERTURB_PROB = 0.3
+    SEED_PERTURB_MINUTES = 30
+    
+    # Parameters for the GA
+    POPULATION_SIZE = 100   # Increased population size for better exploration
+    CROSSOVER_PROB = 0.7    # Crossover probability (cxpb + mutpb must not exceed 1.0)
+    MUTATION_PROB = 0.3     # Higher mutation rate for better exploration
+    
+    # Constraint weights for fitness function
+    WEIGHTS = {
+        'conflict': 1000,      # Hard constraint: Team/venue conflicts
+        'venue_hours': 800,    # Hard constraint: Venue availability hours
+        'rest_period': 600,    # Hard constraint: Rest periods between matches
+        'round_sequence': 700, # Hard constraint: Round sequencing
+        'idle_time': 0.5,      # Soft constraint: Minimize idle time
+        'schedule_change': 0.1,# Soft constraint: Minimize changes to original schedule
+        'peak_time': 0.3       # Soft constraint: Schedule important matches during peak hours
+    }
+    
+    # Define peak hours (e.g., 6-8 PM is peak viewership)
+    PEAK_HOURS = [(18, 20)]  # List of (start_hour, end_hour) tuples
+    
+    def __init__(self, tournament: Tournament, initial_schedule: Schedule, disruptions: List[Disruption],
+                 workers: int = 1, chunk_size: Optional[int] = None, seed: Optional[int] = None,
+                 cache_size: int = 10000, generations: int = 100, time_budget: Optional[float] = None,
+                 stagnation_generations: Optional[int] = None, target_fitness: Optional[float] = None,
+                 stop_when_feasible: bool = False, islands: int = 1, migration_interval: int = 10,
+                 migration_size: int = 2, migration_topology: str = "ring", warm_start: bool = True,
+                 repair_offspring: bool = False, delta_evaluation: bool = False,
+                 now: Optional[datetime] = None, stop_at_bound: bool = True, bound_tolerance: float = 1e-3,
+                 encoding: str = "time", permutation_crossover: str = "ox", grid_interval: int = 5,
+                 round_ends: Optional[Dict[int, datetime]] = None):
+        """
+        Initialize with a tournament, initial schedule, and disruptions.
+        
+        Set workers above 1 (or to 0 for all cores) to evaluate fitness in a process pool,
+        with chunk_size genomes per task. A seed makes optimize() reproducible.
+        cache_size bounds the per-optimizer fitness cache (0 disables it).
+        
+        optimize() runs at most `generations` generations and stops early, returning the
+        best schedule found so far, when the wall-clock time_budget (seconds) would be
+        exceeded, when the best fitness has not improved for stagnation_generations,
+        when it reaches target_fitness, or (with stop_when_feasible) when the best
+        schedule has no hard-constraint penalty. With stop_at_bound (the default) it
+        also stops once the best schedule is feasible and its soft penalty is within
+        bound_tolerance (relative) of the lower bound, since nothing better exists.
+        
+        With islands above 1, that many sub-populations evolve in separate processes and
+        send their migration_size best individuals to another island every
+        migration_interval generations, along a "ring" or "random" topology. In island
+        mode the stopping criteria are checked between migrations.
+        
+        With warm_start (the default) the initial population is built from constructive
+        heuristics and random perturbations, each repaired to the nearest feasible
+        schedule; otherwise every individual starts as the disrupted schedule.
+        With repair_offspring, children are repaired the same way after crossover
+        and mutation.
+        
+        With delta_evaluation, a mutant that changed only a few genes is scored by
+        updating its parent's cached penalty terms instead of a full evaluation.
+        
+        With a `now` cutoff, matches that started before it are frozen: they leave the
+        genome and keep their time, and the remaining matches start no earlier than the
+        cutoff or than the frozen matches they depend on allow. The fitness then covers
+        only the remaining horizon.
+        
+        round_ends maps round numbers to the end of that round outside this problem (the
+        other subproblems of a decomposed optimization); matches of later rounds start
+        no earlier than it.
+        
+        encoding selects the genome: "time" holds a start minute per match; "permutation"
+        holds every venue's match order plus gap genes and is decoded by an
+        earliest-feasible-start builder (see ``backend.schedulers.permutation``), varied
+        with an "ox" or "pmx" permutation_crossover; "grid" holds a slot index per match
+        on a grid_interval-minute grid from venue open (see ``backend.schedulers.grid``),
+        mutated towards slots its venue and teams leave free. Repair and delta evaluation
+        only apply to the time encoding.
+        """
+        if migration_topology not in MIGRATION_TOPOLOGIES:
+            raise ValueError(f"Unknown migration topology: {migration_topology}")
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"Unknown genome encoding: {encoding}")
+        if permutation_crossover not in PERMUTATION_CROSSOVERS:
+            raise ValueError(f"Unknown permutation crossover: {permutation_crossover}")
         self.tournament = tournament
         self.initial_schedule = initial_schedule
         self.disruptions = disruptions
         
-        # Constraint weights for fitness function
-        self.weights = {
-            'conflict': 1000,      # Hard constraint: Team/venue conflicts
-            'venue_hours': 800,    # Hard constraint: Venue availability hours
-            'rest_period': 600,    # Hard constraint: Rest periods between matches
-            'round_sequence': 700, # Hard constraint: Round sequencing
-            'idle_time': 0.5,      # Soft constraint: Minimize idle time
-            'schedule_change': 0.1,# Soft constraint: Minimize changes to original schedule
-            'peak_time': 0.3       # Soft constraint: Schedule important matches during peak hours
-        }
+        # Parallel evaluation and reproducibility settings
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self._parallel = None
+        
+        # Stopping criteria
+        self.generations = generations
+        self.time_budget = time_budget
+        self.stagnation_generations = stagnation_generations
+        self.target_fitness = target_fitness
+        self.stop_when_feasible = stop_when_feasible
+        self.stop_at_bound = stop_at_bound
+        self.bound_tolerance = bound_tolerance
+        self.stop_reason = None
+        self._started = None
+        
+        # Island model settings
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.migration_topology = migration_topology
+        self.hall_of_fame = None
+        self.island_logbooks = []
+        
+        # Constraint weights and peak hours for the fitness function
+        self.weights = dict(self.WEIGHTS)
+        self.peak_hours = list(self.PEAK_HOURS)
+        
+        # Decode invariants compiled once and shared by decode, evaluate and mutate
+        self.now = now
+        self.round_ends = round_ends
+        self.context = ProblemContext(tournament, initial_schedule, disruptions, now, round_ends)
+        self._seed_genome = None
+        
+        # Vectorized evaluator used to score whole populations at once, for the chosen genome
+        self.encoding = encoding
+        self.permutation_crossover = permutation_crossover
+        self.grid = TimeGrid.for_tournament(tournament, grid_interval, origin=self.context.venue_open)
+        if encoding == "permutation":
+            self.evaluator = PermutationEvaluator(self.context, self.weights, self.peak_hours)
+        elif encoding == "grid":
+            self.evaluator = GridEvaluator(self.context, self.weights, self.peak_hours, self.grid)
+        else:
+            self.evaluator = PopulationEvaluator(self.context, self.weights, self.peak_hours)
+        
+        # Lower bounds of the problem, and the best schedule's soft penalty and gap to them after a run
+        durations = {m.id: float(d) for m, d in zip(self.context.matches, self.context.durations)}
+        self.bounds = schedule_bounds(tournament, self.context.matches, durations, IDLE_THRESHOLD)
+        self.soft_bound = self.evaluator.soft_penalty_bound(self.bounds.idle_time)
+        self.soft_penalty = None
+        self.optimality_gap = None
+        
+        # Repair of genomes towards feasibility, used to seed the population and after variation
+        self.warm_start = warm_start
+        self.repair_offspring = repair_offspring and encoding == "time"
+        self.repairer = ScheduleRepairer(self.context, self.evaluator)
         
-        # Define peak hours (e.g., 6-8 PM is peak viewership)
-        self.peak_hours = [(18, 20)]  # List of (start_hour, end_hour) tuples
+        # Incremental scoring of mutants; needs positive durations, like the sweep conflict count
+        self.delta = (DeltaEvaluator(self.evaluator, self.context)
+                      if delta_evaluation and self.evaluator.sweep_conflicts and encoding == "time" else None)
+        
+        # Fitness memoization, scoped to this optimizer so requests never share entries
+        self.cache = FitnessCache(cache_size)
+        self.logbook = None
         
         # Initialize genetic algorithm components
         self._setup_ga()
@@ -148,43 +448,150 @@ class GeneticAlgorithmOptimizer:
         # Register schedule representation and initialization
         self.toolbox.register("schedule", self._create_schedule)
         self.toolbox.register("individual", tools.initIterate, creator.Individual, self.toolbox.schedule)
-        self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
+        if self.warm_start:
+            self.toolbox.register("population", self._initial_population)
+        else:
+            self.toolbox.register("population", tools.initRepeat, list, self.toolbox.individual)
         
         # Register genetic operators
         self.toolbox.register("evaluate", self._evaluate_schedule)
+        self.toolbox.register("map", self._map)
         self.toolbox.register("mate", self._crossover)
         self.toolbox.register("mutate", self._mutate)
         self.toolbox.register("select", tools.selTournament, tournsize=3)
     
+    def _map(self, func, iterable):
+        """Toolbox map that scores fitness evaluations as a single batch."""
+        individuals = list(iterable)
+        if func is self.toolbox.evaluate:
+            return self.evaluate_population(individuals)
+        return list(map(func, individuals))
+    
+    def evaluate_population(self, population: List[List[int]]) -> List[Tuple[float,]]:
+        """Evaluate a whole population, scoring only genomes missing from the cache."""
+        keys = [tuple(individual) for individual in population]
+        penalties = [self.cache.get(key) for key in keys]
+        
+        # Evaluate each distinct uncached genome once
+        pending = {}
+        for key, penalty in zip(keys, penalties):
+            if penalty is None and key not in pending:
+                pending[key] = len(pending)
+        
+        # Score mutants from their parent's cached terms when only a few genes changed
+        scored = {}
+        if self.delta is not None:
+            for individual in population:
+                parent = getattr(individual, 'delta_parent', None)
+                if parent is None:
+                    continue
+                del individual.delta_parent
+                key = tuple(individual)
+                if key in pending and key not in scored and self.delta.accepts(parent, key):
+                    scored[key] = self.delta.evaluate(parent, key)
+                    self.cache.put(key, scored[key])
+            pending = {key: i for i, key in enumerate(key for key in pending if key not in scored)}
+        
+        if pending:
+            genomes = list(pending)
+            if self._parallel is not None:
+                scores = self._parallel.evaluate(genomes)
+            else:
+                scores = self.evaluator.evaluate(genomes)
+            for key, score in zip(genomes, scores):
+                self.cache.put(key, float(score))
+            scored.update((key, float(score)) for key, score in zip(genomes, scores))
+        
+        if scored:
+            penalties = [scored[key] if penalty is None else penalty
+                         for key, penalty in zip(keys, penalties)]
+        
+        return [(penalty,) for penalty in penalties]
+    
     def _create_schedule(self):
         """Create an individual (schedule representation)."""
-        # Apply disruptions to create a "disrupted" schedule with late arrivals handled directly
-        disrupted_schedule = self._apply_disruptions(self.initial_schedule.clone())
+        # The disrupted starting point is the same for every individual, so build it once
+        if self._seed_genome is None:
+            if self.encoding == "permutation":
+                self._seed_genome = self.evaluator.identity_genome()
+            elif self.encoding == "grid":
+                self._seed_genome = [self.grid.slot_at(gene) for gene in self._encode_disrupted_schedule()]
+            else:
+                self._seed_genome = self._encode_disrupted_schedule()
         
-        # Get all matches
-        matches = disrupted_schedule.matches
+        return list(self._seed_genome)
+    
+    def _heuristic_seeds(self) -> List[List[int]]:
+        """Genomes from the constructive heuristics, before repair."""
+        propagated = self._create_schedule()
+        
+        # Left-shift compaction: every match as early as the order allows, but not before its original time
+        compacted = [
+            int(self.context.original_start[i]) if self.context.has_original[i] else gene
+            for i, gene in enumerate(propagated)
+        ]
         
-        # Sort matches by id to ensure consistent order
-        matches.sort(key=lambda m: m.id)
+        # Earliest-feasible list schedule: every free match at its release time
+        mutable = set(self.context.mutable_positions)
+        release = self.context.release
+        earliest = [int(math.ceil(release[i])) if i in mutable else gene for i, gene in enumerate(propagated)]
         
-        # Track which matches had late arrival disruptions
-        late_arrival_matches = [d.match.id for d in self.disruptions if d.type == "late_arrival"]
+        return [propagated, compacted, earliest]
+    
+    def _perturbed_seed(self) -> List[int]:
+        """Random perturbation of the propagated disruption schedule's decoded start times."""
+        propagated = self._create_schedule()
+        starts = self.evaluator.decode(self.evaluator.as_matrix([propagated]))[0]
+        genome = [gene if self.context.pinned[i] else int(np.ceil(start))
+                  for i, (gene, start) in enumerate(zip(propagated, starts))]
+        for i in self.context.mutable_positions:
+            if random.random() < self.SEED_PERTURB_PROB:
+                genome[i] = max(0, genome[i] + random.randint(-self.SEED_PERTURB_MINUTES,
+                                                              self.SEED_PERTURB_MINUTES))
+        return genome
+    
+    def _initial_population(self, n: int) -> List:
+        """Build a diverse, repaired initial population from constructive heuristics."""
+        if self.encoding == "permutation":
+            # The original venue orders, then mutants of them; the builder needs no repair
+            genomes = [self._create_schedule()]
+            while len(genomes) < n:
+                genomes.append(self._mutate_permutation(self._create_schedule(), order_prob=1.0, gap_prob=0.2)[0])
+            return [creator.Individual(genome) for genome in genomes]
+        if self.encoding == "grid":
+            # The disrupted schedule on the grid, then copies moved to free slots
+            genomes = [self._create_schedule()]
+            while len(genomes) < n:
+                genomes.append(self._mutate_grid(self._create_schedule(), gene_prob=self.SEED_PERTURB_PROB)[0])
+            return [creator.Individual(genome) for genome in genomes]
+        
+        genomes = self._heuristic_seeds()[:n]
+        while len(genomes) < n:
+            genomes.append(self._perturbed_seed())
+        
+        return [creator.Individual(genome) for genome in self.repairer.repair_population(genomes)]
+    
+    def _encode_disrupted_schedule(self) -> List[int]:
+        """Encode the initial schedule with disruptions applied as minutes from venue open."""
+        # Apply disruptions to create a "disrupted" schedule with late arrivals handled directly
+        disrupted_schedule = self._apply_disruptions(self.initial_schedule.clone())
         
-        # Represent the schedule as a list of start times (minutes from venue open)
-        venue_open = datetime.combine(datetime.today().date(), self.tournament.venue_start)
+        # Get the matches of the genome (frozen matches are left out), in id order
+        disrupted = {m.id: m for m in disrupted_schedule.matches}
+        matches = [disrupted[m.id] for m in self.context.matches]
         
         # Encode as minutes from venue open
         encoded_schedule = []
         for match in matches:
-            if match.start_time:
-                minutes = int((match.start_time - venue_open).total_seconds() / 60)
-                encoded_schedule.append(minutes)
+            if match.start_minute is not None:
+                encoded_schedule.append(int(match.start_minute - self.context.open_minute))
             else:
                 # If no start time, use a default
                 encoded_schedule.append(0)
         
         # Store late arrival match indices to avoid optimizing them
-        self.late_arrival_indices = [i for i, match in enumerate(matches) if match.id in late_arrival_matches]
+        self.late_arrival_indices = [i for i, match in enumerate(matches)
+                                     if match.id in self.context.late_arrival_ids]
         
         return encoded_schedule
     
@@ -255,57 +662,6 @@ class GeneticAlgorithmOptimizer:
                 
         return schedule
     
-    def _maintain_original_order(self, schedule: Schedule, original_order: List[str]) -> None:
-        """
-        Ensure matches maintain their original relative ordering after disruptions.
-        This is critical for late arrivals and other disruptions to not reorder matches.
-        """
-        # Get current matches
-        current_matches = {m.id: m for m in schedule.matches}
-        
-        # Go through matches in original order
-        for i in range(len(original_order)):
-            current_id = original_order[i]
-            current_match = current_matches.get(current_id)
-            
-            if not current_match or current_match.is_fixed_time:
-                continue  # Skip fixed events or missing matches
-            
-            # Find the previous match in the original order
-            prev_match = None
-            for j in range(i-1, -1, -1):
-                prev_id = original_order[j]
-                if prev_id in current_matches and not current_matches[prev_id].is_fixed_time:
-                    prev_match = current_matches[prev_id]
-                    break
-            
-            # If no previous match, continue
-            if not prev_match:
-                continue
-                
-            # If current match now starts before previous match ends (plus rest/setup time)
-            setup_time = 5  # Basic setup time
-            if prev_match.end_time:
-                # Determine if teams overlap (need rest period or just setup time)
-                teams_overlap = (
-                    prev_match.team1.name == current_match.team1.name or
-                    prev_match.team1.name == current_match.team2.name or
-                    prev_match.team2.name == current_match.team1.name or
-                    prev_match.team2.name == current_match.team2.name
-                )
-                
-                # Calculate minimum start time
-                if teams_overlap:
-                    min_start = prev_match.end_time + timedelta(minutes=self.tournament.rest_period)
-                else:
-                    min_start = prev_match.end_time + timedelta(minutes=setup_time)
-                
-                # Fix ordering if current match would start before previous match ends
-                if current_match.start_time < min_start:
-                    print(f"Fixing order: {current_match.id} was starting before {prev_match.id} finished")
-                    print(f"Moving {current_match.id} from {current_match.start_time} to {min_start}")
-                    current_match.set_time(min_start)
-    
     def _adjust_affected_matches(self, schedule: Schedule, disrupted_match: Match, original_time: datetime) -> None:
         """Adjust affected matches after a disruption while maintaining chronological order."""
         # Sort matches by start time to maintain chronological order
@@ -574,84 +930,47 @@ class GeneticAlgorithmOptimizer:
                     print(f"VALIDATION: Fixed rest period issue - {current_id} needs {buffer} min after {prev_id}")
                     current_match.set_time(min_start)
 
-    def _decode_schedule(self, encoded_schedule: List[int]) -> Schedule:
-        """Decode an encoded schedule back to a Schedule object."""
+    def _decode_schedule(self, encoded_schedule: List[int], include_frozen: bool = True) -> Schedule:
+        """Decode an encoded schedule back to a Schedule object (with the frozen matches unless excluded)."""
         schedule = Schedule()
-        venue_open = datetime.combine(datetime.today().date(), self.tournament.venue_start)
-        
-        # Sort matches by id to ensure consistent order
-        matches = sorted(self.initial_schedule.matches, key=lambda m: m.id)
-        
-        # Store original schedule ordering by start time for reference
-        original_schedule = self.initial_schedule.clone()
-        original_matches = sorted(original_schedule.matches, key=lambda m: m.start_time if m.start_time else datetime.max)
-        original_match_order = [m.id for m in original_matches]
-        
-        # Get matches with late arrivals to preserve their exact times
-        late_arrival_matches = [d.match.id for d in self.disruptions if d.type == "late_arrival"]
-        
-        # Apply all late arrival disruptions first to track original times
-        if late_arrival_matches:
-            temp_schedule = self.initial_schedule.clone()
-            
-            # Apply only late arrival disruptions to get their exact times
-            for disruption in [d for d in self.disruptions if d.type == "late_arrival"]:
-                match = temp_schedule.find_match(disruption.match.id)
-                if match and not match.is_fixed_time and match.start_time:
-                    new_start = match.start_time + timedelta(minutes=disruption.extra_minutes)
-                    match.set_time(new_start)
-            
-            # Store the exact late arrival times to preserve them
-            late_arrival_times = {match.id: match.start_time for match in temp_schedule.matches 
-                                  if match.id in late_arrival_matches}
-        else:
-            late_arrival_times = {}
-        
-        for i, match in enumerate(matches):
-            # Create a new match with the same properties
-            new_match = Match(
-                id=match.id,
-                team1=match.team1,
-                team2=match.team2,
-                duration=match.duration,
-                game_type=match.game_type,
-                round_number=match.round_number,
-                is_fixed_time=match.is_fixed_time,
-                is_break=match.is_break,
-                description=match.description
-            )
-            
-            # Apply disruptions if applicable
-            for disruption in self.disruptions:
-                if disruption.match.id == new_match.id:
-                    if disruption.type == "extended_duration":
-                        new_match.duration += disruption.extra_minutes
-                    elif disruption.type == "early_finish":
-                        new_match.duration -= disruption.extra_minutes
-            
-            # Set start time - with special handling for different cases
-            if new_match.is_fixed_time and match.start_time:
-                # Fixed-time events use the original start time
-                new_match.set_time(match.start_time)
-            elif new_match.id in late_arrival_times:
-                # Late arrival matches use their exact shifted time
-                new_match.set_time(late_arrival_times[new_match.id])
+        context = self.context
+        decoded = []
+        
+        # Permutation and grid genomes are decoded into start times by their evaluator
+        built = None
+        if self.encoding != "time":
+            built = self.evaluator.decode(self.evaluator.as_matrix([encoded_schedule]))[0]
+        
+        # Matches frozen at the cutoff keep their time and disrupted duration
+        if include_frozen:
+            for frozen in context.frozen_copies():
+                schedule.add_match(frozen)
+        
+        for i in range(context.n_matches):
+            if built is not None:
+                start = built[i]
             else:
-                # For regular matches, use the GA-calculated time
-                minutes = max(0, int(encoded_schedule[i]))
-                start_time = venue_open + timedelta(minutes=minutes)
-                new_match.set_time(start_time)
+                # For regular matches, use the GA-calculated time, but not before the release time
+                start = max(context.release[i], int(encoded_schedule[i]))
             
+            # A new match with the disrupted duration; fixed-time events and late arrivals
+            # keep their exact start time
+            new_match = context.decoded_match(i, start)
+            decoded.append(new_match)
             schedule.add_match(new_match)
         
-        # Ensure original match ordering is preserved (crucial for late arrivals)
-        self._maintain_original_order(schedule, original_match_order)
+        # Ensure original match ordering is preserved (crucial for late arrivals):
+        # each non-fixed match starts after its predecessor plus rest/setup time
+        for prev, cur, buffer in (context.order_links if built is None else ()):
+            min_start = decoded[prev].end_minute + buffer
+            if decoded[cur].start_minute < min_start:
+                decoded[cur].set_minutes(min_start)
         
         return schedule
     
     def _evaluate_schedule(self, individual: List[int]) -> Tuple[float,]:
         """Evaluate a schedule's fitness with weighted constraints."""
-        schedule = self._decode_schedule(individual)
+        schedule = self._decode_schedule(individual, include_frozen=False)
         
         # Penalty score starts at 0, higher is worse
         penalty = 0
@@ -694,8 +1013,40 @@ class GeneticAlgorithmOptimizer:
         
         return (penalty,)
     
+    def _original_match(self, match_id: str) -> Optional[Match]:
+        """Look up a match of the initial schedule by ID."""
+        i = self.context.index_of.get(match_id)
+        return self.context.matches[i] if i is not None else None
+    
     def _check_conflicts(self, schedule: Schedule) -> float:
-        """Check for team and venue conflicts."""
+        """Check for team and venue conflicts with a sweep line per venue and team."""
+        # Matches without a start time never conflict
+        matches = [m for m in schedule.matches if m.start_minute is not None]
+        
+        # The sweep line assumes every match has a positive length
+        if any(m.end_minute <= m.start_minute for m in matches):
+            return self._check_conflicts_pairwise(schedule)
+        
+        venue_groups, team_groups, team_venue_groups, rematch_pairs = conflict_groups(
+            [m.game_type for m in matches], [(m.team1.name, m.team2.name) for m in matches])
+        
+        def overlaps(group: List[int]) -> int:
+            return count_overlapping_pairs([matches[i].start_minute for i in group],
+                                           [matches[i].end_minute for i in group])
+        
+        # Venue overlaps plus team overlaps, minus pairs that share both
+        conflicts = sum(overlaps(group) for group in venue_groups)
+        conflicts += sum(overlaps(group) for group in team_groups)
+        conflicts -= sum(overlaps(group) for group in team_venue_groups)
+        
+        # Rematches at different venues were counted once per shared team
+        conflicts -= sum(1 for i, j in rematch_pairs
+                         if matches[i].start_minute < matches[j].end_minute and
+                         matches[j].start_minute < matches[i].end_minute)
+        return conflicts
+    
+    def _check_conflicts_pairwise(self, schedule: Schedule) -> float:
+        """Check for team and venue conflicts by comparing every pair of matches."""
         conflicts = 0
         for i, match1 in enumerate(schedule.matches):
             for match2 in schedule.matches[i+1:]:
@@ -726,9 +1077,9 @@ class GeneticAlgorithmOptimizer:
         
         # Check rest periods for each team
         for team, matches in team_matches.items():
-            sorted_matches = sorted(matches, key=lambda m: m.start_time)
+            sorted_matches = sorted(matches, key=lambda m: m.start_minute)
             for i in range(1, len(sorted_matches)):
-                rest_time = (sorted_matches[i].start_time - sorted_matches[i-1].end_time).total_seconds() / 60
+                rest_time = sorted_matches[i].start_minute - sorted_matches[i-1].end_minute
                 required_rest = self.tournament.rest_period
                 if rest_time < required_rest:
                     # Calculate proportional violation
@@ -740,6 +1091,14 @@ class GeneticAlgorithmOptimizer:
     def _check_round_sequence(self, schedule: Schedule) -> float:
         """Check if matches are scheduled in correct round sequence."""
         violations = 0
+        if self.tournament.has_bracket:
+            # Each dependency counts once when its match starts before the feeding match ends
+            by_id = {m.id: m for m in schedule.matches}
+            for source, target, _ in self.tournament.bracket.edges:
+                if source in by_id and target in by_id and by_id[target].start_minute < by_id[source].end_minute:
+                    violations += 1
+            return violations
+        
         # Group matches by round
         round_matches = {}
         for match in schedule.matches:
@@ -747,35 +1106,31 @@ class GeneticAlgorithmOptimizer:
                 round_matches[match.round_number] = []
             round_matches[match.round_number].append(match)
         
-        # Check if higher rounds start after lower rounds end
+        # Check if higher rounds start after all lower rounds end
+        lower_ends = []
         for round_num in sorted(round_matches.keys()):
-            for higher_round in range(round_num + 1, max(round_matches.keys()) + 1):
-                for match_lower in round_matches[round_num]:
-                    for match_higher in round_matches[higher_round]:
-                        if match_higher.start_time < match_lower.end_time:
-                            violations += 1
+            starts = [m.start_minute for m in round_matches[round_num]]
+            
+            # Only count pairs when this round starts before the lower rounds finish
+            if lower_ends and min(starts) < max(lower_ends):
+                violations += count_late_starts(lower_ends, starts)
+            
+            lower_ends.extend(m.end_minute for m in round_matches[round_num])
         
         return violations
     
     def _calculate_idle_time(self, schedule: Schedule) -> float:
         """Calculate total idle time between matches."""
-        idle_time = 0
-        sorted_matches = sorted(schedule.matches, key=lambda m: m.start_time)
-        
-        for i in range(1, len(sorted_matches)):
-            gap = (sorted_matches[i].start_time - sorted_matches[i-1].end_time).total_seconds() / 60
-            if gap > 10:  # More than 10 minutes is considered idle time
-                idle_time += gap
-        
-        return idle_time
+        # More than 10 minutes is considered idle time
+        return ScheduleArrays.from_schedule(schedule).idle_time(IDLE_THRESHOLD)
     
     def _calculate_schedule_changes(self, schedule: Schedule) -> float:
         """Calculate how much the schedule changed from the original."""
         total_shift = 0
         for match in schedule.matches:
-            orig_match = self.initial_schedule.find_match(match.id)
-            if orig_match and orig_match.start_time and match.start_time:
-                time_diff = abs((match.start_time - orig_match.start_time).total_seconds() / 60)
+            orig_match = self._original_match(match.id)
+            if orig_match and orig_match.start_minute is not None and match.start_minute is not None:
+                time_diff = abs(match.start_minute - orig_match.start_minute)
                 total_shift += time_diff
         
         return total_shift
@@ -810,9 +1165,9 @@ class GeneticAlgorithmOptimizer:
         
         for match in schedule.matches:
             if match.is_fixed_time or match.is_break:
-                orig_match = self.initial_schedule.find_match(match.id)
-                if orig_match and orig_match.start_time and match.start_time:
-                    time_diff = abs((match.start_time - orig_match.start_time).total_seconds())
+                orig_match = self._original_match(match.id)
+                if orig_match and orig_match.start_minute is not None and match.start_minute is not None:
+                    time_diff = abs(match.start_minute - orig_match.start_minute)
                     if time_diff > 0:
                         violations += 1
         
@@ -820,35 +1175,46 @@ class GeneticAlgorithmOptimizer:
     
     def _crossover(self, ind1: List[int], ind2: List[int]) -> Tuple[List[int], List[int]]:
         """Perform crossover between two schedules using two-point crossover."""
+        # Crossover children differ from both parents in many genes and are evaluated in full
+        for individual in (ind1, ind2):
+            if hasattr(individual, 'delta_parent'):
+                del individual.delta_parent
+        if self.encoding == "permutation":
+            return venue_crossover(ind1, ind2, self.evaluator.segments, self.evaluator.n_free,
+                                   self.permutation_crossover)
         return tools.cxTwoPoint(ind1, ind2)
     
+    def _mutate_grid(self, individual: List[int], gene_prob: float = 0.2) -> Tuple[List[int],]:
+        """Shift slot genes by up to a rest period and move them to slots their venue and teams leave free."""
+        max_shift = max(1, round(self.tournament.rest_period / self.grid.interval))
+        return grid_mutation(individual, self.evaluator, self.context.mutable_positions, max_shift, gene_prob)
+    
+    def _mutate_permutation(self, individual: List[int], order_prob: float = 0.5,
+                            gap_prob: float = 0.1) -> Tuple[List[int],]:
+        """Swap or move matches within venue orders and shift gap genes by setup-sized units."""
+        gap_step = int(max(5, self.tournament.rest_period / 4))
+        return venue_mutation(individual, self.evaluator.segments, self.evaluator.n_free, gap_step,
+                              order_prob, gap_prob)
+    
     def _mutate(self, individual: List[int]) -> Tuple[List[int],]:
         """Mutate a schedule with adaptive mutation based on disruptions."""
+        if self.encoding == "permutation":
+            return self._mutate_permutation(individual)
+        if self.encoding == "grid":
+            return self._mutate_grid(individual)
+        
         # Get tournament rest period for use in mutations
         rest_period = self.tournament.rest_period
         
-        # Use different mutation strategies based on the type of disruptions
-        has_extended_duration = any(d.type == "extended_duration" for d in self.disruptions)
-        has_late_arrival = any(d.type == "late_arrival" for d in self.disruptions)
-        has_early_finish = any(d.type == "early_finish" for d in self.disruptions)
-        
-        # Get positions to avoid mutating (fixed-time events and late arrivals)
-        protected_positions = []
-        matches = sorted(self.initial_schedule.matches, key=lambda m: m.id)
-        
-        # Fixed-time matches are always protected
-        for i, match in enumerate(matches):
-            if match.is_fixed_time or match.is_break:
-                protected_positions.append(i)
-        
-        # Late arrival matches are also protected
-        late_arrival_matches = [d.match.id for d in self.disruptions if d.type == "late_arrival"]
-        for i, match in enumerate(matches):
-            if match.id in late_arrival_matches:
-                protected_positions.append(i)
+        # Disruption mix and protected positions (fixed-time events and late arrivals)
+        context = self.context
+        has_extended_duration = context.has_extended_duration
+        has_early_finish = context.has_early_finish
+        protected_positions = context.protected
         
-        # Remove duplicates
-        protected_positions = list(set(protected_positions))
+        # Remember the parent genome so the mutant can be scored incrementally
+        if self.delta is not None:
+            individual.delta_parent = tuple(individual)
         
         # For all mutations, respect protected positions
         for i in range(len(individual)):
@@ -876,13 +1242,14 @@ class GeneticAlgorithmOptimizer:
         
         # Only allow swaps of non-protected matches
         if random.random() < 0.1 and len(individual) > 1:
-            # Find eligible positions to swap (non-protected matches)
-            eligible_positions = [i for i in range(len(individual)) if i not in protected_positions]
+            # Eligible positions to swap (non-protected matches)
+            eligible_positions = context.mutable_positions
             
             if len(eligible_positions) >= 2:
                 # Select two adjacent eligible positions
                 pos1 = random.choice(eligible_positions)
-                adjacent = [p for p in eligible_positions if abs(p - pos1) == 1]
+                adjacent = [p for p in (pos1 - 1, pos1 + 1)
+                            if 0 <= p < len(individual) and p not in protected_positions]
                 
                 if adjacent:
                     pos2 = random.choice(adjacent)
@@ -892,43 +1259,231 @@ class GeneticAlgorithmOptimizer:
     
     def optimize(self) -> Schedule:
         """Run the genetic algorithm to optimize the schedule."""
+        self._started = time.perf_counter()
+        
+        # Seed the generators used by the DEAP operators for reproducible runs
+        if self.seed is not None:
+            random.seed(self.seed)
+            np.random.seed(self.seed)
+        
+        # Start the worker pool once per run when parallel evaluation is enabled
+        if self.workers != 1:
+            self._parallel = ParallelEvaluator(self.evaluator, self.workers, self.chunk_size)
+        
+        try:
+            schedule = self._run_ga()
+            self._record_gap(self.hall_of_fame[0])
+            return schedule
+        finally:
+            if self._parallel is not None:
+                self._parallel.close()
+                self._parallel = None
+    
+    def _evaluate_invalid(self, individuals: List) -> int:
+        """Evaluate individuals without a valid fitness and return how many were evaluated."""
+        invalid = [ind for ind in individuals if not ind.fitness.valid]
+        fitnesses = self.toolbox.map(self.toolbox.evaluate, invalid)
+        for ind, fit in zip(invalid, fitnesses):
+            ind.fitness.values = fit
+        return len(invalid)
+    
+    def _is_feasible(self, individual) -> bool:
+        """Check if an individual decodes to a schedule without hard-constraint penalty."""
+        starts = self.evaluator.decode(self.evaluator.as_matrix([individual]))
+        return self.evaluator.hard_penalty(starts)[0] == 0
+    
+    def _bound_gap(self, individual) -> Tuple[bool, float, float]:
+        """Feasibility, soft penalty and relative gap to the soft-penalty lower bound of an individual."""
+        starts = self.evaluator.decode(self.evaluator.as_matrix([individual]))
+        feasible = self.evaluator.hard_penalty(starts)[0] == 0
+        soft = float(self.evaluator.soft_penalty(starts)[0])
+        gap = (soft - self.soft_bound) / soft if soft > self.soft_bound else 0.0
+        return feasible, soft, gap
+    
+    def _record_gap(self, best) -> None:
+        """Keep the soft penalty and optimality gap of the returned schedule."""
+        _, self.soft_penalty, self.optimality_gap = self._bound_gap(best)
+    
+    def _check_stop(self, best, stale: int, generation_seconds: float) -> Optional[str]:
+        """Name of the stopping criterion that fired, or None to keep evolving."""
+        if self.target_fitness is not None and best.fitness.values[0] <= self.target_fitness:
+            return "target_fitness"
+        if self.stop_at_bound:
+            feasible, _, gap = self._bound_gap(best)
+            if feasible and gap <= self.bound_tolerance:
+                return "lower_bound"
+        if self.stop_when_feasible and self._is_feasible(best):
+            return "feasible"
+        if self.stagnation_generations is not None and stale >= self.stagnation_generations:
+            return "stagnation"
+        
+        # Stop if another generation would overrun the time budget
+        if self.time_budget is not None:
+            elapsed = time.perf_counter() - self._started
+            if elapsed + generation_seconds > self.time_budget:
+                return "time_budget"
+        return None
+    
+    def _make_stats(self) -> tools.Statistics:
+        """Statistics recorded in the logbook every generation."""
+        stats = tools.Statistics(lambda ind: ind.fitness.values)
+        stats.register("min", np.min)
+        stats.register("avg", np.mean)
+        stats.register("max", np.max)
+        
+        # Cumulative fitness cache counters (evaluations saved so far)
+        stats.register("cache_hits", lambda _: self.cache.hits)
+        stats.register("cache_misses", lambda _: self.cache.misses)
+        return stats
+    
+    def _generation(self, pop: List, hof: tools.HallOfFame) -> int:
+        """Run one (mu + lambda) generation in place and return the number of evaluations."""
+        # Vary the population and keep the best mu of parents and offspring
+        offspring = algorithms.varOr(pop, self.toolbox, len(pop), self.CROSSOVER_PROB, self.MUTATION_PROB)
+        if self.repair_offspring:
+            self._repair_individuals([ind for ind in offspring if not ind.fitness.valid])
+        nevals = self._evaluate_invalid(offspring)
+        hof.update(offspring)
+        pop[:] = self.toolbox.select(pop + offspring, len(pop))
+        return nevals
+    
+    def _repair_individuals(self, individuals: List) -> None:
+        """Repair varied individuals in place, towards the nearest feasible schedule."""
+        for individual, genome in zip(individuals, self.repairer.repair_population(individuals)):
+            individual[:] = genome
+    
+    def _run_ga(self) -> Schedule:
+        """Evolve the population and decode the best individual found so far."""
+        if self.islands > 1:
+            return self._run_islands()
+        
         # Create initial population
-        pop_size = 100  # Increased population size for better exploration
-        pop = self.toolbox.population(n=pop_size)
+        pop = self.toolbox.population(n=self.POPULATION_SIZE)
         
         # Setup Hall of Fame to preserve the best individual
         hof = tools.HallOfFame(1)
+        self.hall_of_fame = hof
         
         # Set up statistics to track
-        stats = tools.Statistics(lambda ind: ind.fitness.values)
-        stats.register("min", np.min)
-        stats.register("avg", np.mean)
-        stats.register("max", np.max)
+        stats = self._make_stats()
+        
+        # Generational (mu + lambda) loop, as in eaMuPlusLambda, with early stopping
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals'] + stats.fields
+        self.logbook = logbook
+        
+        generation_start = time.perf_counter()
+        nevals = self._evaluate_invalid(pop)
+        hof.update(pop)
+        logbook.record(gen=0, nevals=nevals, **stats.compile(pop))
+        print(logbook.stream)
+        
+        best_fitness = hof[0].fitness.values[0]
+        stale = 0
+        self.stop_reason = "generations"
+        
+        for gen in range(1, self.generations + 1):
+            reason = self._check_stop(hof[0], stale, time.perf_counter() - generation_start)
+            if reason:
+                self.stop_reason = reason
+                break
+            generation_start = time.perf_counter()
+            
+            nevals = self._generation(pop, hof)
+            logbook.record(gen=gen, nevals=nevals, **stats.compile(pop))
+            print(logbook.stream)
+            
+            # Track stagnation of the best fitness
+            if hof[0].fitness.values[0] < best_fitness:
+                best_fitness = hof[0].fitness.values[0]
+                stale = 0
+            else:
+                stale += 1
         
-        # Parameters for the GA
-        crossover_prob = 0.8    # Higher crossover probability
-        mutation_prob = 0.3     # Higher mutation rate for better exploration
-        generations = 100       # More generations for better convergence
-        
-        # Define elitism - preserve the top 10% individuals
-        elite_size = int(pop_size * 0.1)
-        
-        # Run the algorithm with elitism using eaMuPlusLambda
-        pop, logbook = algorithms.eaMuPlusLambda(
-            pop, 
-            self.toolbox,
-            mu=pop_size,          # Number of individuals to select
-            lambda_=pop_size,     # Number of children to produce
-            cxpb=crossover_prob,  # Crossover probability
-            mutpb=mutation_prob,  # Mutation probability
-            ngen=generations,     # Number of generations
-            stats=stats,
-            halloffame=hof,
-            verbose=True
-        )
+        # Decode and return the best schedule found so far
+        return self._decode_schedule(hof[0])
+    
+    def _individuals(self, genomes: List[List[int]], fitnesses: List[float]) -> List:
+        """Rebuild DEAP individuals with known fitness from plain genomes."""
+        individuals = []
+        for genome, fitness in zip(genomes, fitnesses):
+            individual = creator.Individual(genome)
+            individual.fitness.values = (fitness,)
+            individuals.append(individual)
+        return individuals
+    
+    def _run_islands(self) -> Schedule:
+        """Evolve one sub-population per island in worker processes, with periodic migration."""
+        stats = self._make_stats()
+        rng = random.Random(self.seed)
+        
+        # Every island starts from its own population, evaluated here in one batch
+        populations = [self.toolbox.population(n=self.POPULATION_SIZE) for _ in range(self.islands)]
+        self._evaluate_invalid([ind for pop in populations for ind in pop])
+        
+        # Merged hall of fame across islands, and one logbook per island
+        self.hall_of_fame = tools.HallOfFame(5)
+        self.island_logbooks = []
+        for pop in populations:
+            logbook = tools.Logbook()
+            logbook.header = ['gen', 'nevals'] + stats.fields
+            logbook.record(gen=0, nevals=len(pop), **stats.compile(pop))
+            self.island_logbooks.append(logbook)
+            self.hall_of_fame.update(pop)
+        
+        best_fitness = self.hall_of_fame[0].fitness.values[0]
+        stale = 0
+        gen = 0
+        epoch_seconds = 0.0
+        self.stop_reason = "generations"
+        
+        processes = min(self.islands, os.cpu_count() or 1)
+        worker_args = (type(self), (self.tournament, self.initial_schedule, self.disruptions),
+                       {'cache_size': self.cache.max_entries, 'repair_offspring': self.repair_offspring,
+                        'delta_evaluation': self.delta is not None, 'now': self.now, 'round_ends': self.round_ends,
+                        'encoding': self.encoding, 'permutation_crossover': self.permutation_crossover,
+                        'grid_interval': self.grid.interval})
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_island_worker,
+                                 initargs=worker_args) as pool:
+            while gen < self.generations:
+                reason = self._check_stop(self.hall_of_fame[0], stale, epoch_seconds)
+                if reason:
+                    self.stop_reason = reason
+                    break
+                epoch_start = time.perf_counter()
+                
+                # Evolve every island for one migration interval
+                span = min(self.migration_interval, self.generations - gen)
+                futures = [
+                    pool.submit(evolve_island,
+                                [list(ind) for ind in pop],
+                                [ind.fitness.values[0] for ind in pop],
+                                span,
+                                island_seed(self.seed, island, gen))
+                    for island, pop in enumerate(populations)
+                ]
+                for island, future in enumerate(futures):
+                    result = future.result()
+                    populations[island] = self._individuals(result['genomes'], result['fitnesses'])
+                    self.hall_of_fame.update(populations[island])
+                    self.hall_of_fame.update(self._individuals(*zip(*result['best'])))
+                    for record in result['records']:
+                        record['gen'] += gen
+                        self.island_logbooks[island].record(**record)
+                    print(f"island {island}: " + self.island_logbooks[island].stream)
+                gen += span
+                
+                # Exchange the top individuals along the migration topology
+                migrate(populations, self.migration_size, self.migration_topology, rng, self.toolbox.clone)
+                
+                if self.hall_of_fame[0].fitness.values[0] < best_fitness:
+                    best_fitness = self.hall_of_fame[0].fitness.values[0]
+                    stale = 0
+                else:
+                    stale += span
+                epoch_seconds = time.perf_counter() - epoch_start
         
-        # Get the best individual from the Hall of Fame
-        best = hof[0]
+        self.logbook = merge_logbooks(self.island_logbooks)
         
-        # Decode and return the best schedule
-        return self._decode_schedule(best)
+        # Decode and return the best schedule found on any island
+        return self._decode_schedule(self.hall_of_fame[0])
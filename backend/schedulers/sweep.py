@@ -0,0 +1,130 @@
+"""
+Sweep-line interval counting used by the constraint checks.
+
+The original checks compared every pair of matches. The helpers here sort
+start and end times once per group and count overlapping or out-of-order
+pairs from the merged event order, in O(n log n) per group. The same counts
+are available for plain Python lists (one schedule) and for NumPy arrays
+whose last axis holds the intervals of a group (many individuals at once).
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.models.models import venue_key
+
+
+def count_overlapping_pairs(starts: Sequence, ends: Sequence) -> int:
+    """
+    Count pairs of intervals [start, end) that overlap.
+
+    All intervals must have a positive length. Values can be numbers or datetimes.
+    """
+    sorted_starts = sorted(starts)
+    sorted_ends = sorted(ends)
+
+    # Interval j overlaps every interval that started strictly earlier and has not ended yet
+    total = 0
+    for start in sorted_starts:
+        total += bisect_left(sorted_starts, start) - bisect_right(sorted_ends, start)
+
+    # Intervals starting at the same moment always overlap each other
+    for count in Counter(sorted_starts).values():
+        total += count * (count - 1) // 2
+
+    return total
+
+
+def count_late_starts(lower_ends: Sequence, starts: Sequence) -> int:
+    """Count (lower, start) pairs where a start comes before a lower interval has ended."""
+    sorted_ends = sorted(lower_ends)
+    return sum(len(sorted_ends) - bisect_right(sorted_ends, start) for start in starts)
+
+
+def overlap_counts(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Count overlapping interval pairs along the last axis.
+
+    Ends are ordered before starts at equal times, so touching intervals do not
+    overlap. The running number of open intervals at each start event is the
+    number of earlier intervals it overlaps. All intervals must have a positive length.
+    """
+    m = starts.shape[-1]
+    if m < 2:
+        return np.zeros(starts.shape[:-1], dtype=float)
+
+    events = np.concatenate([ends, starts], axis=-1)
+    order = np.argsort(events, axis=-1, kind='stable')
+    is_start = order >= m
+    active = np.cumsum(np.where(is_start, 1, -1), axis=-1)
+    return np.where(is_start, active - 1, 0).sum(axis=-1).astype(float)
+
+
+def late_start_counts(lower_ends: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Count (lower, start) pairs where the start is before the lower end, along the last axis."""
+    n_lower = lower_ends.shape[-1]
+    if n_lower == 0 or starts.shape[-1] == 0:
+        return np.zeros(starts.shape[:-1], dtype=float)
+
+    events = np.concatenate([lower_ends, starts], axis=-1)
+    order = np.argsort(events, axis=-1, kind='stable')
+    is_end = order < n_lower
+    ends_before = np.cumsum(is_end, axis=-1)
+    return np.where(is_end, 0, n_lower - ends_before).sum(axis=-1).astype(float)
+
+
+def bucket_by_size(groups: Sequence[Sequence[int]]) -> List[np.ndarray]:
+    """Stack index groups of equal size into (groups x size) arrays for batched sweeps."""
+    by_size: Dict[int, List[Sequence[int]]] = {}
+    for group in groups:
+        if len(group) > 1:
+            by_size.setdefault(len(group), []).append(group)
+    return [np.array(same_size, dtype=int) for _, same_size in sorted(by_size.items())]
+
+
+def conflict_groups(venues: Sequence[Hashable], teams: Sequence[Tuple[str, str]]):
+    """
+    Group match indices for sweep-line conflict counting.
+
+    Two matches conflict when they overlap in time and share a venue or a team.
+    Overlaps are counted per venue, then per team. Pairs that share both a team
+    and a venue are counted twice that way, so they are subtracted again through
+    (team, venue) groups. For a team that only plays at one venue, the team group
+    and its (team, venue) group cancel out, so only teams that play at several
+    venues are returned. Rematches between the same two teams at different venues
+    share two teams. Those pairs are returned separately so the caller can
+    subtract their overlap once.
+
+    Returns (venue_groups, team_groups, team_venue_groups, rematch_pairs).
+    """
+    venue_groups: Dict[Hashable, List[int]] = {}
+    team_venues: Dict[str, Dict[Hashable, List[int]]] = {}
+    pairings: Dict[frozenset, List[int]] = {}
+
+    venues = [venue_key(venue) for venue in venues]
+    for i, (venue, (team1, team2)) in enumerate(zip(venues, teams)):
+        venue_groups.setdefault(venue, []).append(i)
+        for team in {team1, team2}:
+            team_venues.setdefault(team, {}).setdefault(venue, []).append(i)
+        if team1 != team2:
+            pairings.setdefault(frozenset((team1, team2)), []).append(i)
+
+    team_groups: List[List[int]] = []
+    team_venue_groups: List[List[int]] = []
+    for by_venue in team_venues.values():
+        if len(by_venue) > 1:
+            team_groups.append(sorted(i for members in by_venue.values() for i in members))
+            team_venue_groups.extend(by_venue.values())
+
+    rematch_pairs = [
+        (i, j)
+        for members in pairings.values()
+        for a, i in enumerate(members)
+        for j in members[a + 1:]
+        if venues[i] != venues[j]
+    ]
+
+    return list(venue_groups.values()), team_groups, team_venue_groups, rematch_pairs
@@ -0,0 +1,209 @@
+"""
+Schedule and tournament builders shared by the test modules.
+"""
+
+import contextlib
+import io
+import random
+from datetime import datetime, time as dt_time, timedelta
+
+import numpy as np
+
+from backend.models.models import Team, Match, Schedule, GameType, venue_key
+from backend.models.tournament import Tournament
+
+# A fixed date, so that nothing can silently depend on today's date
+DAY = datetime(2026, 3, 6, 9, 0)
+
+
+def setup_bracket():
+    """Set up a two-game bracket with a lunch break and a fixed final."""
+    tournament = Tournament(
+        id="bracket",
+        name="Bracket Tournament",
+        venue_start=dt_time(9, 0),
+        venue_end=dt_time(20, 0),
+        rest_period=30
+    )
+    teams = [
+        Team(id=i, name=f"Team {i}", game_type=GameType.MOBILE_LEGENDS if i <= 4 else GameType.VALORANT)
+        for i in range(1, 9)
+    ]
+    tournament.add_teams(teams)
+
+    schedule = Schedule()
+    specs = [
+        ("M1", teams[0], teams[1], GameType.MOBILE_LEGENDS, 1, 0),
+        ("M2", teams[2], teams[3], GameType.MOBILE_LEGENDS, 1, 60),
+        ("V1", teams[4], teams[5], GameType.VALORANT, 1, 0),
+        ("V2", teams[6], teams[7], GameType.VALORANT, 1, 70),
+    ]
+    for match_id, team1, team2, game_type, round_number, offset in specs:
+        match = Match(id=match_id, team1=team1, team2=team2, duration=50,
+                      game_type=game_type, round_number=round_number)
+        match.set_time(DAY + timedelta(minutes=offset))
+        schedule.add_match(match)
+
+    winner_a = Team(id=9, name="Winner M1", game_type=GameType.MOBILE_LEGENDS)
+    winner_b = Team(id=10, name="Winner M2", game_type=GameType.MOBILE_LEGENDS)
+    semi = Match(id="M3", team1=winner_a, team2=winner_b, duration=50,
+                 game_type=GameType.MOBILE_LEGENDS, round_number=2)
+    semi.set_time(DAY + timedelta(minutes=240))
+    schedule.add_match(semi)
+
+    final = Match(id="V3", team1=Team(id=11, name="Winner V1", game_type=GameType.VALORANT),
+                  team2=Team(id=12, name="Winner V2", game_type=GameType.VALORANT), duration=60,
+                  game_type=GameType.VALORANT, round_number=3, is_fixed_time=True, description="Final")
+    final.set_time(DAY + timedelta(minutes=540))
+    schedule.add_match(final)
+
+    placeholder = Team(id=0, name="Placeholder", game_type="")
+    lunch = Match(id="E1", team1=placeholder, team2=placeholder, duration=60,
+                  game_type=GameType.MOBILE_LEGENDS, round_number=0,
+                  is_fixed_time=True, is_break=True, description="Lunch Break")
+    lunch.set_time(DAY + timedelta(minutes=180))
+    schedule.add_match(lunch)
+
+    return tournament, schedule
+
+
+def bracketed():
+    """The two-title fitness bracket with its "Winner" teams registered as dependencies."""
+    tournament, schedule = setup_bracket()
+    for source, target in (("M1", "M3"), ("M2", "M3"), ("V1", "V3"), ("V2", "V3")):
+        tournament.add_dependency(source, target)
+    return tournament, schedule
+
+
+def random_population(optimizer, size, seed):
+    """Build a population of perturbed copies of the seeded genome."""
+    rng = random.Random(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        base = optimizer._create_schedule()
+    return [[max(0, gene + rng.randint(-120, 120)) for gene in base] for _ in range(size)]
+
+
+def val_schedule(starts, final_at=120, final_round=2):
+    """Valorant matches at the given offsets plus a fixed final for teams 0 and 1."""
+    teams = [Team(id=i, name=f"Team {i}", game_type=GameType.VALORANT) for i in range(8)]
+    schedule = Schedule()
+    for k, offset in enumerate(starts):
+        match = Match(id=f"V{k}", team1=teams[2 * k], team2=teams[2 * k + 1], duration=40,
+                      game_type=GameType.VALORANT, round_number=1)
+        match.set_time(DAY + timedelta(minutes=offset))
+        schedule.add_match(match)
+    final = Match(id="VF", team1=teams[0], team2=teams[1], duration=60, game_type=GameType.VALORANT,
+                  round_number=final_round, is_fixed_time=True)
+    final.set_time(DAY + timedelta(minutes=final_at))
+    schedule.add_match(final)
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0),
+                            rest_period=15)
+    return tournament, schedule
+
+
+def benchmark_bracket(n_per_game):
+    """Two venues of sequential matches with a fixed show match and a fixed final."""
+    tournament = Tournament(id="bench", name="bench", venue_start=dt_time(9, 0), venue_end=dt_time(22, 0),
+                            rest_period=15)
+    schedule = Schedule()
+    for game_type, duration in ((GameType.MOBILE_LEGENDS, 30), (GameType.VALORANT, 40)):
+        teams = [Team(id=i, name=f"{game_type.value} {i}", game_type=game_type) for i in range(2 * n_per_game)]
+        for k in range(n_per_game):
+            match = Match(id=f"{game_type.value}{k:02d}", team1=teams[2 * k], team2=teams[2 * k + 1],
+                          duration=duration, game_type=game_type, round_number=1)
+            match.set_time(DAY + timedelta(minutes=(duration + 10) * k))
+            schedule.add_match(match)
+    show = Match(id="S1", team1=Team(id=100, name="Guest A", game_type=GameType.MOBILE_LEGENDS),
+                 team2=Team(id=101, name="Guest B", game_type=GameType.MOBILE_LEGENDS), duration=45,
+                 game_type=GameType.MOBILE_LEGENDS, round_number=1, is_fixed_time=True)
+    show.set_time(DAY + timedelta(minutes=240))
+    schedule.add_match(show)
+    final = Match(id="F1", team1=Team(id=102, name="Winner A", game_type=GameType.VALORANT),
+                  team2=Team(id=103, name="Winner B", game_type=GameType.VALORANT), duration=60,
+                  game_type=GameType.VALORANT, round_number=3, is_fixed_time=True)
+    final.set_time(DAY + timedelta(minutes=720))
+    schedule.add_match(final)
+    return tournament, schedule
+
+
+def bracket_tournament(n_per_game, rounds=3, venue_end=dt_time(22, 0), lunch=True):
+    """Unscheduled ML and Valorant matches over a few rounds, optionally with a fixed lunch break."""
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=venue_end,
+                            rest_period=15)
+    matches = []
+    for game_type, duration in ((GameType.MOBILE_LEGENDS, 20), (GameType.VALORANT, 40)):
+        teams = [Team(id=i, name=f"{game_type.value} Team {i}", game_type=game_type)
+                 for i in range(n_per_game)]
+        for k in range(n_per_game):
+            matches.append(Match(id=f"{game_type.value}{k}", team1=teams[k], team2=teams[(k + 1) % n_per_game],
+                                 duration=duration, game_type=game_type,
+                                 round_number=1 + k * rounds // n_per_game))
+    tournament.matches = matches
+
+    if lunch:
+        placeholder = Team(id=0, name="Placeholder", game_type="")
+        lunch_break = Match(id="E1", team1=placeholder, team2=placeholder, duration=60,
+                            game_type=GameType.MOBILE_LEGENDS, round_number=0,
+                            is_fixed_time=True, is_break=True, description="Lunch")
+        lunch_break.set_time(datetime.combine(datetime.today().date(), dt_time(12, 0)))
+        tournament.add_fixed_event(lunch_break)
+    return tournament
+
+
+def assert_feasible(tournament, schedule):
+    """Assert venue hours, venue and team overlaps, rest periods and round order."""
+    rest = timedelta(minutes=tournament.rest_period)
+    open_at = datetime.combine(datetime.today().date(), tournament.venue_start)
+    close_at = datetime.combine(datetime.today().date(), tournament.venue_end)
+    matches = schedule.matches
+    for match in matches:
+        assert open_at <= match.start_time and match.end_time <= close_at
+    for i, m1 in enumerate(matches):
+        for m2 in matches[i + 1:]:
+            overlap = m1.start_time < m2.end_time and m2.start_time < m1.end_time
+            if m1.is_break or m2.is_break:
+                assert not overlap
+                continue
+            if venue_key(m1.game_type) == venue_key(m2.game_type):
+                assert not overlap
+            if {m1.team1.name, m1.team2.name} & {m2.team1.name, m2.team2.name}:
+                assert m1.end_time + rest <= m2.start_time or m2.end_time + rest <= m1.start_time
+            if m1.round_number < m2.round_number and not m1.is_fixed_time:
+                assert m1.end_time <= m2.start_time
+
+
+def random_schedule(n_matches, seed):
+    """Random matches of eight teams over three game types (including the "Val" string)."""
+    rng = random.Random(seed)
+    teams = [Team(id=i, name=f"Team {i}", game_type=GameType.MOBILE_LEGENDS) for i in range(8)]
+    schedule = Schedule()
+    for k in range(n_matches):
+        team1, team2 = rng.sample(teams, 2)
+        match = Match(id=f"M{k}", team1=team1, team2=team2, duration=rng.choice([20, 40]),
+                      game_type=rng.choice([GameType.MOBILE_LEGENDS, GameType.VALORANT, "Val"]),
+                      round_number=1)
+        match.set_time(DAY + timedelta(minutes=10 * rng.randint(0, 40)))
+        schedule.add_match(match)
+    return schedule
+
+
+def rebuilt_edges(tournament):
+    """Reference: compare every pair of matches, as the full rebuild did."""
+    edges = set()
+    for i, match1 in enumerate(tournament.matches):
+        for match2 in tournament.matches[i + 1:]:
+            if tournament._conflicts(match1, match2):
+                edges.add(frozenset((match1.id, match2.id)))
+    return edges
+
+
+def graph_edges(tournament):
+    """Edges of the tournament's conflict graph as match id pairs."""
+    return {frozenset((match1.id, match2.id)) for match1, match2 in tournament.conflict_graph.edges}
+
+
+def best_penalty(optimizer, schedule):
+    """Total and hard penalty of a decoded schedule under the optimizer's evaluator."""
+    starts = np.array([[optimizer.context.offset(m.start_time) for m in
+                        sorted(schedule.matches, key=lambda m: m.id)]])
+    return optimizer.evaluator.evaluate_starts(starts)[0], optimizer.evaluator.hard_penalty(starts)[0]
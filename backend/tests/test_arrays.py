@@ -0,0 +1,120 @@
+"""
+Tests for the columnar schedule view and the code that consumes it.
+"""
+
+import contextlib
+import csv
+import io
+from datetime import timedelta
+
+import numpy as np
+
+from backend.models import ScheduleArrays
+from backend.models.models import Disruption, GameType
+from backend.schedulers.fitness import IDLE_THRESHOLD
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.utils.data_importer import export_schedule_to_csv
+from backend.tests.helpers import random_schedule, setup_bracket
+
+
+def linear_idle_time(schedule, threshold):
+    """Reference implementation: sort the match objects and sum the gaps."""
+    ordered = sorted(schedule.matches, key=lambda m: m.start_time)
+    gaps = [(b.start_time - a.end_time) / timedelta(minutes=1) for a, b in zip(ordered, ordered[1:])]
+    return sum(gap for gap in gaps if gap > threshold)
+
+
+def test_arrays_round_trip_to_schedule():
+    schedule = random_schedule(40, seed=1)
+    schedule.matches[3].description = "Semi Final"
+    schedule.matches[5].is_fixed_time = True
+    arrays = ScheduleArrays.from_schedule(schedule)
+
+    assert len(arrays) == 40
+    assert arrays.teams[arrays.team1[7]] is schedule.matches[7].team1
+    # "Val" and GameType.VALORANT play at one venue
+    valorant = [i for i, m in enumerate(schedule.matches) if m.game_type in ("Val", GameType.VALORANT)]
+    assert len(set(arrays.venue[valorant].tolist())) == 1 and len(arrays.venues) == 2
+    assert np.array_equal(arrays.end - arrays.start, arrays.duration)
+
+    copy = arrays.to_schedule()
+    assert [m.id for m in copy.matches] == [m.id for m in schedule.matches]
+    for original, restored in zip(schedule.matches, copy.matches):
+        assert (restored.start_time, restored.end_time) == (original.start_time, original.end_time)
+        assert (restored.team1, restored.team2, restored.game_type, restored.round_number) == \
+            (original.team1, original.team2, original.game_type, original.round_number)
+        assert (restored.is_fixed_time, restored.is_break, restored.description) == \
+            (original.is_fixed_time, original.is_break, original.description)
+    # The copy has its own indexes
+    assert copy.get_affected_matches(copy.matches[0]) == \
+        [copy.find_match(m.id) for m in schedule.get_affected_matches(schedule.matches[0])]
+
+
+def test_metrics_match_the_object_implementations():
+    schedule = random_schedule(60, seed=2)
+    arrays = ScheduleArrays.from_schedule(schedule)
+    assert arrays.idle_time() == linear_idle_time(schedule, 0)
+    assert arrays.idle_time(IDLE_THRESHOLD) == linear_idle_time(schedule, IDLE_THRESHOLD)
+    assert arrays.makespan() == (max(m.end_time for m in schedule.matches) -
+                                 min(m.start_time for m in schedule.matches)) / timedelta(minutes=1)
+
+    moved = schedule.clone()
+    for match in moved.matches[:5]:
+        match.set_time(match.start_time + timedelta(minutes=30))
+    assert ScheduleArrays.from_schedule(moved).moved_from(arrays) == 5
+
+
+def test_fitness_reads_the_arrays_of_a_decoded_schedule():
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(match=schedule.find_match("M1"), type="extended_duration", extra_minutes=25)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=3)
+    genome = optimizer._create_schedule()
+    with contextlib.redirect_stdout(io.StringIO()):
+        decoded = optimizer._decode_schedule(genome)
+        expected = optimizer._evaluate_schedule(genome)[0]
+    assert np.isclose(optimizer.evaluator.evaluate_arrays(ScheduleArrays.from_schedule(decoded)), expected)
+
+
+def test_export_from_arrays_matches_export_from_schedule(tmp_path):
+    schedule = random_schedule(25, seed=3)
+    export_schedule_to_csv(schedule, tmp_path / "schedule.csv")
+    export_schedule_to_csv(ScheduleArrays.from_schedule(schedule), tmp_path / "arrays.csv")
+    assert (tmp_path / "schedule.csv").read_text() == (tmp_path / "arrays.csv").read_text()
+
+    with open(tmp_path / "schedule.csv", newline="") as file:
+        rows = list(csv.DictReader(file))
+    starts = [row["Start Time"] for row in rows]
+    assert starts == sorted(starts) and len(rows) == 25
+    match = schedule.find_match(rows[0]["Match ID"])
+    assert [rows[0]["Game"], rows[0]["Team 1"], rows[0]["End Time"], rows[0]["Duration"]] == \
+        [str(match.game_type), match.team1.name, match.end_time.strftime('%Y-%m-%d %H:%M:%S'), str(match.duration)]
+
+
+def benchmark(n_matches=10_000, repeats=5):
+    """Idle time and duration from the match objects and from the columnar view."""
+    import time
+
+    schedule = random_schedule(n_matches, seed=0)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        linear_idle_time(schedule, 0)
+        max(m.end_time for m in schedule.matches) - min(m.start_time for m in schedule.matches)
+    objects = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        arrays = ScheduleArrays.from_schedule(schedule)
+    build = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        arrays.idle_time()
+        arrays.makespan()
+    columns = (time.perf_counter() - start) / repeats
+
+    print(f"{n_matches} matches: objects {objects * 1000:.1f} ms, "
+          f"arrays {columns * 1000:.1f} ms (+{build * 1000:.1f} ms to build once)")
+
+
+if __name__ == "__main__":
+    benchmark()
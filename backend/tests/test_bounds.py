@@ -0,0 +1,83 @@
+"""
+Tests for the schedule lower bounds and the optimizer's stop at a provably optimal schedule.
+"""
+
+from datetime import datetime, time as dt_time, timedelta
+
+import numpy as np
+
+from backend.models.bounds import schedule_bounds
+from backend.models.models import Team, Match, Schedule, Disruption, GameType
+from backend.models.tournament import Tournament
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+
+
+def make_match(match_id, team1, team2, duration, game_type=GameType.MOBILE_LEGENDS, round_number=1):
+    return Match(id=match_id, team1=Team(id=team1, name=f"Team {team1}", game_type=game_type),
+                 team2=Team(id=team2, name=f"Team {team2}", game_type=game_type),
+                 duration=duration, game_type=game_type, round_number=round_number)
+
+
+def test_bounds_from_venues_teams_and_sequence():
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0), rest_period=15)
+    matches = [make_match("M1", 1, 2, 30), make_match("M2", 1, 3, 30), make_match("M3", 4, 5, 30, round_number=2),
+               make_match("V1", 6, 7, 50, GameType.VALORANT)]
+    bounds = schedule_bounds(tournament, matches)
+    assert bounds.venue_load == 90
+    assert bounds.team_load == 30 + 15 + 30
+    # Round 2 waits for the longest first-round match
+    assert bounds.critical_path == 50 + 30
+    assert bounds.makespan == 90 and bounds.idle_time == 0
+
+    # With a bracket only the chain M1 -> M3 orders matches, and durations can be overridden
+    tournament.add_dependency("M1", "M3")
+    bounds = schedule_bounds(tournament, matches, {"M1": 45})
+    assert bounds.critical_path == 75 and bounds.venue_load == 105
+
+    # Three matches of one team with a long rest leave gaps no schedule can close
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0), rest_period=60)
+    matches = [make_match(f"M{k}", 1, 2 + k, 30) for k in range(3)]
+    bounds = schedule_bounds(tournament, matches, idle_threshold=10)
+    assert bounds.makespan == 3 * 30 + 2 * 60
+    assert bounds.idle_time == 2 * 60 - 2 * 10
+
+
+def late_arrival_problem():
+    """Two back-to-back matches at one venue; the first starts 20 minutes late."""
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0), rest_period=15)
+    schedule = Schedule()
+    day = datetime.combine(datetime.today().date(), dt_time(10, 0))
+    for k in range(2):
+        match = make_match(f"M{k + 1}", 2 * k, 2 * k + 1, 30)
+        match.set_time(day + timedelta(minutes=60 * k))
+        schedule.add_match(match)
+    disruptions = [Disruption(match=schedule.find_match("M1"), type="late_arrival", extra_minutes=20)]
+    return tournament, schedule, disruptions
+
+
+def test_stops_when_best_schedule_reaches_the_bound():
+    tournament, schedule, disruptions = late_arrival_problem()
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=3)
+    # The late start is a schedule change no schedule can avoid
+    assert optimizer.soft_bound == GeneticAlgorithmOptimizer.WEIGHTS['schedule_change'] * 20
+
+    result = optimizer.optimize()
+    assert optimizer.stop_reason == "lower_bound"
+    assert len(optimizer.logbook) == 1
+    assert optimizer.optimality_gap == 0
+    assert optimizer.soft_penalty == optimizer.soft_bound
+
+    starts = np.array([[optimizer.context.offset(m.start_time) for m in sorted(result.matches, key=lambda m: m.id)]])
+    assert optimizer.evaluator.hard_penalty(starts)[0] == 0
+
+
+def test_bound_stop_can_be_disabled():
+    tournament, schedule, disruptions = late_arrival_problem()
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=3, generations=3,
+                                          stop_at_bound=False)
+    optimizer.optimize()
+    assert optimizer.stop_reason == "generations"
+    assert len(optimizer.logbook) == 4
+    # The gap is still reported, and the bound is never above the schedule found
+    assert optimizer.soft_bound <= optimizer.soft_penalty
+    assert optimizer.optimality_gap == 0
@@ -0,0 +1,174 @@
+"""
+Tests for bracket dependencies: the DAG itself and the checks that use it instead of round numbers.
+"""
+
+import contextlib
+import io
+from datetime import datetime, time as dt_time, timedelta
+
+import numpy as np
+import pytest
+
+from backend.models.bracket import BracketDAG
+from backend.models.models import GameType, Match, Team
+from backend.models.tournament import Tournament
+from backend.schedulers.context import ProblemContext
+from backend.schedulers.decompose import coupling_components
+from backend.schedulers.fitness import PopulationEvaluator
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer, GraphColoringScheduler
+from backend.tests.helpers import bracketed, graph_edges, random_population, rebuilt_edges
+
+
+def single_elimination():
+    """Quarter-finals Q1-Q4 feed semi-finals S1 and S2, which feed the final F; the Q1 loser plays L."""
+    bracket = BracketDAG()
+    for quarter, semi in (("Q1", "S1"), ("Q2", "S1"), ("Q3", "S2"), ("Q4", "S2")):
+        bracket.add_dependency(quarter, semi)
+    bracket.add_dependency("S1", "F")
+    bracket.add_dependency("S2", "F")
+    bracket.add_dependency("Q1", "L", "loser")
+    return bracket
+
+
+def test_topological_order_levels_and_critical_path():
+    bracket = single_elimination()
+    order = bracket.topological_order()
+    for source, target, _ in bracket.edges:
+        assert order.index(source) < order.index(target)
+    assert bracket.levels() == {"Q1": 0, "Q2": 0, "Q3": 0, "Q4": 0, "L": 1, "S1": 1, "S2": 1, "F": 2}
+    assert bracket.predecessors("S1") == ["Q1", "Q2"]
+    assert bracket.successors("Q1") == ["S1", "L"]
+    assert bracket.adjacent("F", "S2") and not bracket.adjacent("Q1", "F")
+
+    durations = {"Q1": 40, "Q2": 40, "Q3": 60, "Q4": 40, "S1": 50, "S2": 50, "F": 90, "L": 20}
+    starts = bracket.earliest_starts(durations, release={"Q4": 30}, gap=10)
+    assert starts["S1"] == 50 and starts["S2"] == 80 and starts["F"] == 140
+    assert bracket.critical_path(durations) == (200.0, ["Q3", "S2", "F"])
+    assert bracket.critical_path_length(durations, gap=10) == 220
+
+    sub = bracket.subgraph(["Q1", "S1", "F"])
+    assert sub.edges == [("Q1", "S1", "winner"), ("S1", "F", "winner")]
+
+
+def test_invalid_dependencies_are_rejected():
+    bracket = single_elimination()
+    with pytest.raises(ValueError):
+        bracket.add_dependency("S1", "S1")
+    with pytest.raises(ValueError):
+        bracket.add_dependency("F", "S1", "draw")
+    bracket.add_dependency("F", "Q1")
+    with pytest.raises(ValueError, match="cycle"):
+        bracket.topological_order()
+
+
+def test_dependencies_from_team_names():
+    teams = [Team(id=i, name=f"Team {i}", game_type=GameType.VALORANT) for i in range(4)]
+    matches = [
+        Match(id="M1", team1=teams[0], team2=teams[1], duration=40, game_type=GameType.VALORANT,
+              round_number=1),
+        Match(id="M2", team1=teams[2], team2=teams[3], duration=40, game_type=GameType.VALORANT,
+              round_number=1),
+        Match(id="M3", team1=Team(id=5, name="Winner of M1", game_type=GameType.VALORANT),
+              team2=Team(id=6, name="Winner M2", game_type=GameType.VALORANT), duration=40,
+              game_type=GameType.VALORANT, round_number=2),
+        # "Winner A" names no match of the bracket
+        Match(id="M4", team1=Team(id=7, name="Loser of M3", game_type=GameType.VALORANT),
+              team2=Team(id=8, name="Winner A", game_type=GameType.VALORANT), duration=40,
+              game_type=GameType.VALORANT, round_number=3),
+    ]
+    bracket = BracketDAG.from_team_names(matches)
+    assert sorted(bracket.edges) == [("M1", "M3", "winner"), ("M2", "M3", "winner"), ("M3", "M4", "loser")]
+
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0), rest_period=15)
+    tournament.matches = matches
+    assert not tournament.has_bracket
+    assert tournament.infer_dependencies() == 3
+    assert tournament.infer_dependencies() == 0
+    assert tournament.sequence_levels(matches) == {"M1": 0, "M2": 0, "M3": 1, "M4": 2}
+
+
+@pytest.mark.parametrize("backend", ["networkx", "bitset"])
+def test_conflict_graph_uses_only_dependency_edges(backend):
+    day = datetime.combine(datetime.today().date(), dt_time(9, 0))
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0),
+                            rest_period=15, conflict_backend=backend)
+    teams = [Team(id=i, name=f"Team {i}", game_type=GameType.VALORANT) for i in range(8)]
+    for k in range(4):
+        tournament.add_match(Match(id=f"Q{k + 1}", team1=teams[2 * k], team2=teams[2 * k + 1], duration=40,
+                                   game_type=GameType.VALORANT, round_number=1))
+    for k, name in enumerate(("S1", "S2")):
+        tournament.add_match(Match(id=name, team1=Team(id=10 + k, name=f"{name} A", game_type=GameType.VALORANT),
+                                   team2=Team(id=20 + k, name=f"{name} B", game_type=GameType.VALORANT), duration=50,
+                                   game_type=GameType.VALORANT, round_number=2))
+    lunch = Match(id="E1", team1=Team(id=0, name="Placeholder", game_type=""),
+                  team2=Team(id=0, name="Placeholder", game_type=""), duration=60,
+                  game_type=GameType.VALORANT, round_number=0, is_fixed_time=True, is_break=True)
+    lunch.set_time(day + timedelta(hours=3))
+    tournament.add_fixed_event(lunch)
+
+    # Different rounds conflict before the bracket is known
+    assert frozenset(("Q3", "S1")) in graph_edges(tournament)
+
+    tournament.add_dependency("Q1", "S1")
+    tournament.add_dependency("Q2", "S1")
+    tournament.add_dependency("Q3", "S2")
+    tournament.add_dependency("Q4", "S2", "loser")
+    assert graph_edges(tournament) == rebuilt_edges(tournament)
+    assert graph_edges(tournament) == {frozenset(pair) for pair in
+                                       (("Q1", "S1"), ("Q2", "S1"), ("Q3", "S2"), ("Q4", "S2"))}
+
+    # Matches placed in the lunch break pick up their time edges as before
+    tournament.matches[0].set_time(day + timedelta(hours=3, minutes=10))
+    tournament.get_conflict_graph()
+    assert frozenset(("Q1", "E1")) in graph_edges(tournament)
+    assert graph_edges(tournament) == rebuilt_edges(tournament)
+
+
+def test_round_sequence_counts_only_dependencies():
+    tournament, schedule = bracketed()
+    context = ProblemContext(tournament, schedule, [])
+    evaluator = PopulationEvaluator(context, GeneticAlgorithmOptimizer.WEIGHTS, GeneticAlgorithmOptimizer.PEAK_HOURS)
+    starts = np.array([[context.offset(m.start_time) for m in context.matches]])
+    ends = starts + evaluator.durations
+    assert evaluator.check_round_sequence(starts, ends)[0] == 0
+
+    # M3 moved before M2 ends breaks one dependency; the round-0 lunch no longer orders anything
+    moved = starts.copy()
+    moved[0, context.index_of["M3"]] = 70
+    assert evaluator.check_round_sequence(moved, moved + evaluator.durations)[0] == 1
+
+    # The vectorized and scalar fitness agree
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [])
+    population = random_population(optimizer, 30, seed=7)
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [optimizer._evaluate_schedule(individual)[0] for individual in population]
+    actual = [fitness[0] for fitness in optimizer.evaluate_population(population)]
+    assert np.allclose(actual, expected)
+
+    # Dependent matches are solved in the same decomposition component
+    assert coupling_components(schedule, bracket=tournament.bracket) == [["M1", "M2", "M3"], ["V1", "V2"]]
+
+
+def test_coloring_runs_independent_levels_side_by_side():
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0), rest_period=15)
+    teams = [Team(id=i, name=f"Team {i}", game_type=GameType.VALORANT) for i in range(8)]
+    for k in range(2):
+        for title, game_type, offset, round_number in (("M", GameType.MOBILE_LEGENDS, 0, 1),
+                                                       ("V", GameType.VALORANT, 4, 2)):
+            tournament.add_match(Match(id=f"{title}{k + 1}", team1=teams[offset + 2 * k],
+                                       team2=teams[offset + 2 * k + 1], duration=40,
+                                       game_type=game_type, round_number=round_number))
+    final = Match(id="MF", team1=Team(id=20, name="Winner of M1", game_type=GameType.MOBILE_LEGENDS),
+                  team2=Team(id=21, name="Winner of M2", game_type=GameType.MOBILE_LEGENDS), duration=40,
+                  game_type=GameType.MOBILE_LEGENDS, round_number=2)
+    tournament.add_match(final)
+    tournament.infer_dependencies()
+
+    schedule = GraphColoringScheduler(tournament).generate_schedule()
+    by_id = {m.id: m for m in schedule.matches}
+    assert by_id["MF"].start_time >= max(by_id["M1"].end_time, by_id["M2"].end_time)
+    # The second-round Valorant matches depend on nothing and share slots with the first round;
+    # by rounds, the five matches would take five slots
+    assert by_id["V1"].start_time == by_id["M1"].start_time
+    assert max(m.end_time for m in schedule.matches) - min(m.start_time for m in schedule.matches) \
+        == timedelta(minutes=3 * 40)
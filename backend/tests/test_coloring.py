@@ -0,0 +1,91 @@
+"""
+Tests for DSATUR coloring and the coloring-based schedule generator.
+"""
+
+import random
+import time
+from datetime import time as dt_time
+
+import pytest
+
+from backend.schedulers.coloring import dsatur_coloring
+from backend.schedulers.scheduler import GraphColoringScheduler
+from backend.tests.helpers import assert_feasible, bracket_tournament
+
+
+def random_masks(n, density, seed):
+    rng = random.Random(seed)
+    masks = [0] * n
+    for i in range(n):
+        for j in range(i + 1, n):
+            if rng.random() < density:
+                masks[i] |= 1 << j
+                masks[j] |= 1 << i
+    return masks
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_dsatur_coloring_is_proper(seed):
+    masks = random_masks(60, 0.3, seed)
+    colors = dsatur_coloring(masks)
+    for i, mask in enumerate(masks):
+        for j in range(len(masks)):
+            if mask >> j & 1:
+                assert colors[i] != colors[j]
+
+
+def test_dsatur_colors_bipartite_and_complete_graphs_optimally():
+    # Even cycle: two colors
+    n = 10
+    cycle = [(1 << (i - 1) % n) | (1 << (i + 1) % n) for i in range(n)]
+    assert len(set(dsatur_coloring(cycle))) == 2
+
+    complete = [((1 << 8) - 1) & ~(1 << i) for i in range(8)]
+    assert sorted(dsatur_coloring(complete)) == list(range(8))
+
+
+def test_dsatur_schedule_places_every_match_feasibly():
+    tournament = bracket_tournament(12)
+    scheduler = GraphColoringScheduler(tournament)
+    schedule = scheduler.generate_schedule()
+
+    assert not scheduler.unscheduled_matches
+    assert {m.id for m in schedule.matches} == {m.id for m in tournament.matches}
+    assert_feasible(tournament, schedule)
+
+
+def test_dsatur_schedule_reports_matches_beyond_venue_hours():
+    tournament = bracket_tournament(12, venue_end=dt_time(13, 0))
+    scheduler = GraphColoringScheduler(tournament)
+    schedule = scheduler.generate_schedule()
+
+    assert scheduler.unscheduled_matches
+    placed = {m.id for m in schedule.matches}
+    assert placed.isdisjoint(m.id for m in scheduler.unscheduled_matches)
+    assert len(placed) + len(scheduler.unscheduled_matches) == len(tournament.matches)
+    assert_feasible(tournament, schedule)
+
+
+def test_dsatur_schedule_scales_to_hundreds_of_matches():
+    tournament = bracket_tournament(150, lunch=False, venue_end=dt_time(23, 59))
+    tournament.venue_start = dt_time(0, 0)
+    tournament.get_conflict_graph()
+
+    start = time.perf_counter()
+    scheduler = GraphColoringScheduler(tournament, slot_interval=1)
+    schedule = scheduler.generate_schedule()
+    elapsed = time.perf_counter() - start
+
+    assert len(schedule.matches) + len(scheduler.unscheduled_matches) == 300
+    assert elapsed < 5
+
+
+def test_legacy_mode_keeps_fixed_slots():
+    tournament = bracket_tournament(4, lunch=False)
+    schedule = GraphColoringScheduler(tournament, mode="legacy").generate_schedule()
+
+    assert [m.start_time.strftime("%H:%M") for m in schedule.matches] == \
+        ["09:00", "10:00", "11:00", "13:00", "14:20", "15:40"]
+
+    with pytest.raises(ValueError):
+        GraphColoringScheduler(tournament, mode="greedy")
@@ -0,0 +1,103 @@
+"""
+Tests and benchmark for the bitset conflict graph backend.
+
+Run this module directly to compare memory and build time of the bitset
+graph against networkx for growing brackets.
+"""
+
+import random
+import time
+import tracemalloc
+from datetime import datetime, time as dt_time, timedelta
+
+import networkx as nx
+import pytest
+
+from backend.models.models import Team, Match, GameType
+from backend.models.tournament import Tournament
+from backend.models.conflict_graph import BitsetConflictGraph, create_conflict_graph
+
+
+def bracket_matches(n_matches, seed):
+    """Random matches across a few rounds, as a bracket would have."""
+    rng = random.Random(seed)
+    day = datetime.combine(datetime.today().date(), dt_time(9, 0))
+    teams = [Team(id=i, name=f"Team {i}", game_type=GameType.MOBILE_LEGENDS)
+             for i in range(max(4, n_matches // 2))]
+    matches = []
+    for k in range(n_matches):
+        team1, team2 = rng.sample(teams, 2)
+        match = Match(id=f"M{k}", team1=team1, team2=team2, duration=30,
+                      game_type=GameType.MOBILE_LEGENDS, round_number=rng.randint(1, 4),
+                      is_fixed_time=rng.random() < 0.05)
+        match.set_time(day + timedelta(minutes=10 * rng.randint(0, 60)))
+        matches.append(match)
+    return matches
+
+
+def build(backend, matches):
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0),
+                            rest_period=15, conflict_backend=backend)
+    tournament.matches = list(matches)
+    tournament._update_conflict_graph()
+    return tournament.conflict_graph
+
+
+def test_bitset_graph_matches_networkx():
+    matches = bracket_matches(80, seed=1)
+    reference = build("networkx", matches)
+    graph = build("bitset", matches)
+
+    assert graph.number_of_nodes() == reference.number_of_nodes()
+    assert graph.number_of_edges() == reference.number_of_edges()
+    for match in matches:
+        assert {m.id for m in graph.neighbors(match)} == {m.id for m in reference.neighbors(match)}
+        assert graph.degree(match) == reference.degree(match)
+
+    converted = graph.to_networkx()
+    assert {frozenset((a.id, b.id)) for a, b in converted.edges} == \
+        {frozenset((a.id, b.id)) for a, b in reference.edges}
+
+    nodes, indptr, indices = graph.to_csr()
+    for k, match in enumerate(nodes):
+        assert {nodes[j].id for j in indices[indptr[k]:indptr[k + 1]]} == \
+            {m.id for m in reference.neighbors(match)}
+
+
+def test_bitset_graph_removal():
+    matches = bracket_matches(6, seed=2)
+    graph = BitsetConflictGraph()
+    graph.add_edges_from([(matches[0], matches[1]), (matches[1], matches[2]), (matches[0], matches[2])])
+
+    graph.remove_edge(matches[0], matches[1])
+    assert not graph.has_edge(matches[1], matches[0])
+    graph.remove_node(matches[2])
+    assert matches[2] not in graph
+    assert graph.number_of_edges() == 0
+    assert graph.nodes == matches[:2]
+    with pytest.raises(nx.NetworkXError):
+        graph.remove_edge(matches[0], matches[1])
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_conflict_graph("adjacency-matrix")
+
+
+def benchmark(sizes=(16, 128, 1024)):
+    """Compare build time and retained memory of both backends."""
+    print(f"{'matches':>8} {'backend':>9} {'edges':>8} {'build (ms)':>11} {'memory (KiB)':>13}")
+    for n in sizes:
+        matches = bracket_matches(n, seed=n)
+        for backend in ("networkx", "bitset"):
+            tracemalloc.start()
+            start = time.perf_counter()
+            graph = build(backend, matches)
+            build_ms = (time.perf_counter() - start) * 1000
+            retained, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{n:>8} {backend:>9} {graph.number_of_edges():>8} {build_ms:>11.2f} {retained / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,177 @@
+"""
+Tests for multi-day tournaments: venue windows, day assignment and per-day scheduling.
+"""
+
+import contextlib
+import io
+from datetime import date, datetime, time as dt_time, timedelta
+
+import pytest
+
+from backend.models.models import Disruption, GameType, Match, Schedule, Team
+from backend.models.tournament import Tournament, daily_venue_windows
+from backend.schedulers.days import MultiDayOptimizer, MultiDayScheduler, assign_days
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+
+# A weekend in the past, so nothing can silently fall back to today's date
+DAYS = [date(2026, 3, 6), date(2026, 3, 7), date(2026, 3, 8)]
+
+
+def league(rounds=3, per_round=4):
+    """One Valorant venue open 9:00-12:30 on each day, with `per_round` 40-minute matches per round."""
+    tournament = Tournament(id="league", name="league", venue_start=dt_time(9, 0), venue_end=dt_time(12, 30),
+                            rest_period=15, venue_windows=daily_venue_windows(DAYS, dt_time(9, 0), dt_time(12, 30)))
+    for r in range(1, rounds + 1):
+        teams = [Team(id=100 * r + i, name=f"R{r} Team {i}", game_type=GameType.VALORANT)
+                 for i in range(2 * per_round)]
+        tournament.add_teams(teams)
+        for k in range(per_round):
+            tournament.add_match(Match(id=f"R{r}M{k}", team1=teams[2 * k], team2=teams[2 * k + 1], duration=40,
+                                       game_type=GameType.VALORANT, round_number=r))
+    return tournament
+
+
+def scheduled_league():
+    tournament = league()
+    schedule = MultiDayScheduler(tournament, processes=1).generate_schedule()
+    return tournament, schedule
+
+
+def times(schedule):
+    return {m.id: (m.start_time, m.duration) for m in schedule.matches}
+
+
+def test_venue_windows_and_days():
+    tournament = league()
+    assert tournament.n_days == 3
+    assert tournament.day_of(datetime(2026, 3, 7, 18, 0)) == 1
+    assert tournament.day_of(datetime(2026, 3, 1, 9, 0)) == 0
+    assert tournament.day_of(datetime(2026, 3, 20, 9, 0)) == 2
+    slots = tournament.get_timeslots(60, day=2)
+    assert slots[0] == datetime(2026, 3, 8, 9, 0)
+    assert slots[-1] == datetime(2026, 3, 8, 12, 0)
+
+    day = tournament.day_tournament(1)
+    assert day.venue_windows == [(datetime(2026, 3, 7, 9, 0), datetime(2026, 3, 7, 12, 30))]
+    assert day.teams == tournament.teams and not day.matches
+
+    # Without windows a tournament is one day, today
+    single = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0), rest_period=15)
+    assert single.venue_windows == [(datetime.combine(datetime.today().date(), dt_time(9, 0)),
+                                     datetime.combine(datetime.today().date(), dt_time(20, 0)))]
+
+
+def test_days_fill_in_round_order():
+    tournament = league()
+    days = assign_days(tournament, tournament.matches)
+    # Four 45-minute slots per round fill most of a 210-minute day
+    assert [[m.id for m in matches] for matches in days] == [
+        [f"R{r}M{k}" for k in range(4)] for r in (1, 2, 3)]
+
+    # A fixed event stays on its own day and takes its time; what does not fit stays on the last day
+    tournament = league(rounds=4)
+    final = Match(id="F", team1=Team(id=1, name="A", game_type=GameType.VALORANT),
+                  team2=Team(id=2, name="B", game_type=GameType.VALORANT), duration=60,
+                  game_type=GameType.VALORANT, round_number=5, is_fixed_time=True)
+    final.set_time(datetime(2026, 3, 7, 12, 0))
+    tournament.add_match(final)
+    days = assign_days(tournament, tournament.matches)
+    assert "F" in [m.id for m in days[1]]
+    assert [m.round_number for m in days[1]] == [5, 2, 2, 2]
+    assert [m.round_number for m in days[2]] == [2] + [3] * 4 + [4] * 4
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_days_are_scheduled_within_their_windows(processes):
+    tournament = league()
+    scheduler = MultiDayScheduler(tournament, processes=processes)
+    schedule = scheduler.generate_schedule()
+
+    assert not scheduler.unscheduled_matches
+    assert len(schedule.matches) == 12
+    for match in schedule.matches:
+        opening, closing = tournament.venue_windows[match.round_number - 1]
+        assert opening <= match.start_time and match.end_time <= closing
+
+    # Times are set on the tournament's own match objects
+    assert all(m.start_time is not None for m in tournament.matches)
+
+
+def test_disruption_reoptimizes_only_its_day():
+    tournament, schedule = scheduled_league()
+    before = times(schedule)
+    disruptions = [Disruption(match=schedule.find_match("R2M3"), type="extended_duration", extra_minutes=20)]
+    optimizer = MultiDayOptimizer(tournament, schedule, disruptions, processes=1, seed=0, generations=5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+
+    assert optimizer.affected_days == [1]
+    assert optimizer.optimized_days == [1]
+    assert len(result.matches) == len(schedule.matches)
+    after = times(result)
+    for match_id in before:
+        if not match_id.startswith("R2"):
+            assert after[match_id] == before[match_id]
+    assert after["R2M3"][1] == 60
+    assert all(result.find_match(f"R2M{k}").start_time.date() == DAYS[1] for k in range(4))
+    assert len(optimizer.logbook) == 6
+
+
+def test_matches_pushed_past_closing_move_to_the_next_day():
+    tournament, schedule = scheduled_league()
+    disruptions = [Disruption(match=schedule.find_match("R2M0"), type="extended_duration", extra_minutes=200)]
+    optimizer = MultiDayOptimizer(tournament, schedule, disruptions, processes=1, seed=0, generations=5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+
+    assert optimizer.optimized_days == [1, 2]
+    assert optimizer.carried[2]
+    assert sorted(m.id for m in result.matches) == sorted(m.id for m in schedule.matches)
+    for match_id in optimizer.carried[2]:
+        assert result.find_match(match_id).start_time.date() == DAYS[2]
+
+    # The first day was never touched
+    for k in range(4):
+        assert result.find_match(f"R1M{k}").start_time == schedule.find_match(f"R1M{k}").start_time
+
+
+def test_optimizer_keeps_the_schedule_date():
+    tournament, schedule = scheduled_league()
+    day = Schedule()
+    for match in schedule.matches:
+        if match.round_number == 1:
+            day.add_match(match)
+    disruptions = [Disruption(match=day.find_match("R1M0"), type="extended_duration", extra_minutes=10)]
+    optimizer = GeneticAlgorithmOptimizer(tournament.day_tournament(0), day, disruptions, seed=0, generations=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+    assert optimizer.context.venue_open == datetime(2026, 3, 6, 9, 0)
+    assert all(m.start_time.date() == DAYS[0] for m in result.matches)
+    assert result.find_match("R1M0").start_time - schedule.find_match("R1M0").start_time < timedelta(hours=1)
+
+
+def test_undisrupted_days_still_report_a_logbook(tmp_path, monkeypatch):
+    tournament, schedule = scheduled_league()
+    optimizer = MultiDayOptimizer(tournament, schedule, [], processes=1, seed=0, generations=5)
+    result = optimizer.optimize()
+    assert optimizer.optimized_days == []
+    assert times(result) == times(schedule)
+    assert len(optimizer.logbook) == 1
+    assert optimizer.stop_reason == "no affected days"
+
+    # An optimizing adjust request without disruptions (the API logs to its working directory)
+    monkeypatch.chdir(tmp_path)
+    from backend.api.scheduler_api import app
+    matches = [{'id': m.id, 'duration': m.duration, 'gameType': 'Val', 'roundNumber': m.round_number,
+                'team1': {'id': m.team1.id, 'name': m.team1.name, 'gameType': 'Val'},
+                'team2': {'id': m.team2.id, 'name': m.team2.name, 'gameType': 'Val'},
+                'startTime': m.start_time.isoformat()} for m in schedule.matches]
+    response = app.test_client().post('/api/python/schedule/adjust', json={
+        'tournament': {'venueHours': ['09:00', '12:30'], 'restPeriod': 15,
+                       'days': [day.isoformat() for day in DAYS]},
+        'schedule': {'matches': matches}, 'disruptions': [], 'optimize': True, 'now': '2026-03-06T08:00:00',
+        'optimizer': {'generations': 5, 'seed': 0}})
+    assert response.status_code == 200
+    adjustment = response.get_json()['adjustment']
+    assert adjustment['path'] == 'ga'
+    assert adjustment['stopReason'] == "no affected days"
@@ -0,0 +1,171 @@
+"""
+Tests and benchmark for decomposed optimization of independent venues.
+
+Run this module directly to compare whole and decomposed solve times.
+"""
+
+import contextlib
+import io
+from datetime import time as dt_time, timedelta
+
+import numpy as np
+import pytest
+
+from backend.models.models import Disruption, Match, Schedule, Team
+from backend.models.tournament import Tournament
+from backend.schedulers.context import ProblemContext
+from backend.schedulers.decompose import DecomposedOptimizer, coupling_components, cross_round_violations
+from backend.schedulers.fitness import PopulationEvaluator
+from backend.schedulers.local_search import LocalSearchOptimizer
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.tests.helpers import DAY, benchmark_bracket
+
+TITLES = ("ML", "Val", "Dota", "CS")
+
+
+def multi_title(n_per_title, titles=TITLES):
+    """Sequential round-1 matches per title, with a fixed lunch break at the first venue."""
+    tournament = Tournament(id="multi", name="multi", venue_start=dt_time(9, 0), venue_end=dt_time(22, 0),
+                            rest_period=15)
+    schedule = Schedule()
+    for title in titles:
+        teams = [Team(id=i, name=f"{title} {i}", game_type=title) for i in range(2 * n_per_title)]
+        for k in range(n_per_title):
+            match = Match(id=f"{title}{k:02d}", team1=teams[2 * k], team2=teams[2 * k + 1],
+                          duration=40, game_type=title, round_number=1)
+            match.set_time(DAY + timedelta(minutes=50 * k))
+            schedule.add_match(match)
+    placeholder = Team(id=0, name="Placeholder", game_type="")
+    lunch = Match(id="E1", team1=placeholder, team2=placeholder, duration=60, game_type=titles[0],
+                  round_number=1, is_fixed_time=True, is_break=True, description="Lunch Break")
+    lunch.set_time(DAY + timedelta(minutes=50 * n_per_title))
+    schedule.add_match(lunch)
+    return tournament, schedule
+
+
+def full_hard_penalty(tournament, schedule):
+    context = ProblemContext(tournament, schedule, [])
+    evaluator = PopulationEvaluator(context, GeneticAlgorithmOptimizer.WEIGHTS, GeneticAlgorithmOptimizer.PEAK_HOURS)
+    starts = np.array([[context.offset(m.start_time) for m in context.matches]])
+    return evaluator.hard_penalty(starts)[0]
+
+
+def test_components_follow_venues_and_shared_teams():
+    tournament, schedule = benchmark_bracket(4)
+    components = coupling_components(schedule)
+    # The fixed show match and final belong to no component
+    assert components == [[f"ML{k:02d}" for k in range(4)], [f"Val{k:02d}" for k in range(4)]]
+
+    # A team playing in both titles joins the venues
+    schedule.find_match("Val00").team1 = schedule.find_match("ML00").team1
+    assert len(coupling_components(schedule)) == 1
+
+    # Matches started before the cutoff are constants too
+    _, schedule = benchmark_bracket(4)
+    components = coupling_components(schedule, now=DAY + timedelta(minutes=1))
+    assert components == [[f"ML{k:02d}" for k in range(1, 4)], [f"Val{k:02d}" for k in range(1, 4)]]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_decomposed_solve_merges_every_component(processes):
+    tournament, schedule = multi_title(3)
+    disruptions = [Disruption(match=schedule.find_match("Val00"), type="extended_duration", extra_minutes=30)]
+    optimizer = DecomposedOptimizer(tournament, schedule, disruptions, processes=processes,
+                                    seed=0, generations=5)
+    assert len(optimizer.components) == len(TITLES)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+
+    assert not optimizer.fallback
+    assert sorted(m.id for m in result.matches) == sorted(m.id for m in schedule.matches)
+    assert result.find_match("E1").start_time == schedule.find_match("E1").start_time
+    assert result.find_match("Val00").duration == 70
+    assert full_hard_penalty(tournament, result) <= full_hard_penalty(tournament, schedule)
+    assert len(optimizer.component_logbooks) == len(TITLES)
+    assert len(optimizer.logbook) == 6
+    last_mins = [logbook.select('min')[-1] for logbook in optimizer.component_logbooks]
+    assert optimizer.logbook[-1]['min'] == pytest.approx(sum(last_mins))
+
+
+def test_local_search_components_and_single_component_passthrough():
+    tournament, schedule = multi_title(3, titles=("ML", "Val"))
+    disruptions = [Disruption(match=schedule.find_match("ML01"), type="late_arrival", extra_minutes=20)]
+    optimizer = DecomposedOptimizer(tournament, schedule, disruptions, optimizer_class=LocalSearchOptimizer,
+                                    processes=1, seed=0, iterations=200)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+    assert len(result.matches) == len(schedule.matches)
+    assert result.find_match("ML01").start_time - schedule.find_match("ML01").start_time >= timedelta(minutes=20)
+
+    tournament, schedule = multi_title(3, titles=("ML",))
+    optimizer = DecomposedOptimizer(tournament, schedule, [], processes=1, seed=0, generations=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer.optimize()
+    assert len(optimizer.components) == 1
+    assert not optimizer.component_logbooks
+    assert len(optimizer.logbook) == 3
+
+
+def semi_final_schedule():
+    tournament, schedule = multi_title(2, titles=("ML", "Val"))
+    # A second-round ML match at minute 200 must wait for every round-1 Valorant match
+    semi = Match(id="ML99", team1=Team(id=90, name="ML W0", game_type="ML"),
+                 team2=Team(id=91, name="ML W1", game_type="ML"), duration=40, game_type="ML", round_number=2)
+    semi.set_time(DAY + timedelta(minutes=200))
+    schedule.add_match(semi)
+    return tournament, schedule
+
+
+def test_components_wait_for_lower_rounds_of_other_components():
+    tournament, schedule = semi_final_schedule()
+    components = coupling_components(schedule)
+    assert cross_round_violations(schedule, components) == 0
+
+    # Val01 now ends at minute 240, so the ML component starts its semi-final after it
+    disruptions = [Disruption(match=schedule.find_match("Val01"), type="extended_duration", extra_minutes=150)]
+    optimizer = DecomposedOptimizer(tournament, schedule, disruptions, processes=1, seed=0, generations=3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+    assert not optimizer.fallback
+    assert len(optimizer.component_logbooks) == 2
+    assert result.find_match("ML99").start_time >= DAY + timedelta(minutes=240)
+    assert cross_round_violations(result, components) == 0
+
+
+def test_cross_component_round_violations_fall_back_to_the_whole_problem():
+    tournament, schedule = semi_final_schedule()
+    # Val00 now ends at minute 190 and pushes Val01 past the semi-final's start, which the bounds do not foresee
+    disruptions = [Disruption(match=schedule.find_match("Val00"), type="extended_duration", extra_minutes=150)]
+    optimizer = DecomposedOptimizer(tournament, schedule, disruptions, processes=1, seed=0, generations=3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+    assert optimizer.fallback
+    assert len(result.matches) == len(schedule.matches)
+
+
+def benchmark(n_per_title=(10, 20, 40), generations=30):
+    """Compare one GA over every title with one GA per title in parallel, by time and penalty."""
+    import time
+
+    print(f"{'matches':>8} {'whole (s)':>10} {'penalty':>10} {'decomposed (s)':>15} {'penalty':>10}")
+    for n in n_per_title:
+        tournament, schedule = multi_title(n)
+        disruptions = [Disruption(match=schedule.find_match("Val00"), type="extended_duration", extra_minutes=30)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            whole = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=0, generations=generations)
+            decomposed = DecomposedOptimizer(tournament, schedule, disruptions, seed=0, generations=generations)
+            row = []
+            for optimizer in (whole, decomposed):
+                start = time.perf_counter()
+                result = optimizer.optimize()
+                elapsed = time.perf_counter() - start
+
+                # Both results are scored by the undivided problem's fitness
+                context = whole.context
+                starts = np.array([[context.offset(result.find_match(m.id).start_time) for m in context.matches]])
+                row += [elapsed, whole.evaluator.evaluate_starts(starts)[0]]
+        print(f"{len(schedule.matches):>8} {row[0]:>10.2f} {row[1]:>10.1f} {row[2]:>15.2f} {row[3]:>10.1f}")
+
+
+if __name__ == "__main__":
+    benchmark()
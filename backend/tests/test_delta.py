@@ -0,0 +1,124 @@
+"""
+Tests and benchmark for incremental (delta) fitness evaluation.
+
+Run this module directly to compare delta and full evaluation times.
+"""
+
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+from deap import tools
+
+from backend.models.models import Disruption
+from backend.schedulers.delta import DeltaEvaluator
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.tests.helpers import benchmark_bracket, random_population, setup_bracket
+
+
+def mutate_genes(genome, positions, rng, k):
+    """Copy of a genome with k of the given positions shifted at random."""
+    child = list(genome)
+    for i in rng.sample(positions, min(k, len(positions))):
+        child[i] = max(0, child[i] + rng.randint(-90, 90))
+    return child
+
+
+def starts_of(optimizer, genome):
+    return optimizer.evaluator.decode(optimizer.evaluator.as_matrix([genome]))[0]
+
+
+@pytest.mark.parametrize("disruption_specs", [
+    [],
+    [("M1", "late_arrival", 15)],
+    [("M1", "extended_duration", 25)],
+    [("V1", "early_finish", 10), ("M2", "late_arrival", 20)],
+])
+def test_delta_matches_full_evaluation(disruption_specs):
+    tournament, schedule = setup_bracket()
+    disruptions = [
+        Disruption(type=kind, match=schedule.find_match(match_id), extra_minutes=minutes)
+        for match_id, kind, minutes in disruption_specs
+    ]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions)
+    delta = DeltaEvaluator(optimizer.evaluator, optimizer.context)
+    rng = random.Random(len(disruption_specs))
+
+    # Chains of mutations, each scored from the state of its parent
+    positions = list(range(optimizer.context.n_matches))
+    for genome in random_population(optimizer, 10, seed=3):
+        state = delta.full_state(genome)
+        for _ in range(20):
+            child = mutate_genes(genome, positions, rng, rng.randint(1, 3))
+            state = delta.apply(state, child)
+            expected = optimizer.evaluator.evaluate([child])[0]
+            assert np.isclose(delta.penalty(state), expected)
+            assert np.array_equal(state.starts, starts_of(optimizer, child))
+            genome = child
+
+
+def test_delta_matches_full_evaluation_on_a_large_bracket():
+    tournament, schedule = benchmark_bracket(40)
+    disruptions = [Disruption(match=schedule.find_match("ML00"), type="extended_duration", extra_minutes=40)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions)
+    delta = DeltaEvaluator(optimizer.evaluator, optimizer.context)
+    rng = random.Random(0)
+
+    genome = optimizer._create_schedule()
+    for _ in range(50):
+        child = mutate_genes(genome, optimizer.context.mutable_positions, rng, 1)
+        assert np.isclose(delta.evaluate(genome, child), optimizer.evaluator.evaluate([child])[0])
+        genome = child
+
+
+def test_optimizer_delta_evaluation_gives_the_same_fitness():
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(match=schedule.find_match("M1"), type="extended_duration", extra_minutes=25)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=0, delta_evaluation=True)
+    assert optimizer.delta is not None
+
+    random.seed(0)
+    pop = optimizer.toolbox.population(n=30)
+    hof = tools.HallOfFame(1)
+    optimizer._evaluate_invalid(pop)
+    for _ in range(5):
+        optimizer._generation(pop, hof)
+    fitnesses = [ind.fitness.values[0] for ind in pop]
+    assert np.allclose(fitnesses, optimizer.evaluator.evaluate(pop))
+    assert not any(hasattr(ind, "delta_parent") for ind in pop)
+
+
+def benchmark(sizes=(50, 100, 200, 400), mutations=200):
+    """Time full evaluation against delta evaluation of single-gene mutations."""
+    import time
+
+    print(f"{'matches':>8} {'full (ms)':>10} {'delta (ms)':>11} {'speedup':>8}")
+    for n in sizes:
+        tournament, schedule = benchmark_bracket(n)
+        disruptions = [Disruption(match=schedule.find_match("ML00"), type="extended_duration",
+                                  extra_minutes=40)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions)
+        delta = DeltaEvaluator(optimizer.evaluator, optimizer.context)
+        rng = random.Random(0)
+        parent = optimizer._create_schedule()
+        children = [mutate_genes(parent, optimizer.context.mutable_positions, rng, 1) for _ in range(mutations)]
+
+        start = time.perf_counter()
+        for child in children:
+            optimizer.evaluator.evaluate([child])
+        full = (time.perf_counter() - start) / mutations
+
+        state = delta.full_state(parent)
+        start = time.perf_counter()
+        for child in children:
+            delta.penalty(delta.apply(state, child))
+        incremental = (time.perf_counter() - start) / mutations
+
+        print(f"{2 * n + 2:>8} {full * 1000:>10.3f} {incremental * 1000:>11.3f} {full / incremental:>7.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
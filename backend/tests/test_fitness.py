@@ -0,0 +1,76 @@
+"""
+Tests for the vectorized population fitness evaluator.
+"""
+
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from backend.models.models import Disruption
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.schedulers.parallel import ParallelEvaluator
+from backend.schedulers.fitness import FitnessCache
+from backend.tests.helpers import random_population, setup_bracket
+
+
+@pytest.mark.parametrize("disruption_specs", [
+    [],
+    [("M1", "late_arrival", 15)],
+    [("M1", "extended_duration", 25)],
+    [("V1", "early_finish", 10), ("M2", "late_arrival", 20)],
+])
+def test_vectorized_matches_scalar(disruption_specs):
+    tournament, schedule = setup_bracket()
+    disruptions = [
+        Disruption(type=kind, match=schedule.find_match(match_id), extra_minutes=minutes)
+        for match_id, kind, minutes in disruption_specs
+    ]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions)
+    population = random_population(optimizer, 40, seed=len(disruption_specs))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [optimizer._evaluate_schedule(individual)[0] for individual in population]
+    actual = [fitness[0] for fitness in optimizer.evaluate_population(population)]
+
+    assert np.allclose(actual, expected)
+
+
+def test_parallel_matches_sequential():
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(type="extended_duration", match=schedule.find_match("M1"), extra_minutes=25)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, workers=2, chunk_size=7)
+    population = random_population(optimizer, 30, seed=3)
+
+    expected = optimizer.evaluator.evaluate(population)
+    with ParallelEvaluator(optimizer.evaluator, workers=2, chunk_size=7) as parallel:
+        actual = parallel.evaluate(population)
+
+    assert np.allclose(actual, expected)
+
+
+def test_fitness_cache_evicts_least_recently_used():
+    cache = FitnessCache(max_entries=2)
+    cache.put((1,), 1.0)
+    cache.put((2,), 2.0)
+    assert cache.get((1,)) == 1.0
+    cache.put((3,), 3.0)
+
+    assert cache.get((2,)) is None
+    assert cache.get((1,)) == 1.0
+    assert cache.get((3,)) == 3.0
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_evaluate_population_reuses_cached_genomes():
+    tournament, schedule = setup_bracket()
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [])
+    population = random_population(optimizer, 10, seed=5)
+
+    first = optimizer.evaluate_population(population)
+    second = optimizer.evaluate_population(population + population[:3])
+
+    assert second == first + first[:3]
+    assert optimizer.cache.hits == 13
+    assert optimizer.cache.misses == 10
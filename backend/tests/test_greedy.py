@@ -0,0 +1,86 @@
+"""
+Tests for the greedy list-scheduling rescheduler used as the adjust fast path.
+"""
+
+from datetime import timedelta
+
+from backend.models.models import Disruption
+from backend.schedulers.greedy import GreedyRescheduler
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.tests.helpers import benchmark_bracket, val_schedule
+
+
+def reschedule(tournament, schedule, disruptions):
+    greedy = GreedyRescheduler(tournament, schedule, disruptions, GeneticAlgorithmOptimizer.WEIGHTS,
+                               GeneticAlgorithmOptimizer.PEAK_HOURS)
+    return greedy, greedy.reschedule()
+
+
+def shift_of(result, schedule, match_id):
+    return (result.find_match(match_id).start_time - schedule.find_match(match_id).start_time) / timedelta(minutes=1)
+
+
+def test_extended_match_pushes_only_what_it_must():
+    tournament, schedule = val_schedule([0, 45, 100], final_at=400)
+    disruptions = [Disruption(match=schedule.find_match("V0"), type="extended_duration", extra_minutes=20)]
+    greedy, result = reschedule(tournament, schedule, disruptions)
+
+    # V0 now ends at 60 and V1 follows after the setup time; the ripple shrinks to 10 minutes at V2
+    assert greedy.feasible
+    assert result.find_match("V0").duration == 60
+    assert shift_of(result, schedule, "V1") == 20
+    assert shift_of(result, schedule, "V2") == 10
+    assert shift_of(result, schedule, "VF") == 0
+
+
+def test_late_arrival_keeps_its_exact_start_and_early_finish_never_pulls_early():
+    tournament, schedule = val_schedule([0, 45, 100], final_at=400)
+    disruptions = [Disruption(match=schedule.find_match("V1"), type="late_arrival", extra_minutes=30)]
+    greedy, result = reschedule(tournament, schedule, disruptions)
+    assert greedy.feasible
+    assert shift_of(result, schedule, "V1") == 30
+    assert shift_of(result, schedule, "V2") == 20
+
+    disruptions = [Disruption(match=schedule.find_match("V0"), type="early_finish", extra_minutes=10)]
+    greedy, result = reschedule(tournament, schedule, disruptions)
+    assert greedy.feasible
+    assert [shift_of(result, schedule, m.id) for m in schedule.matches] == [0, 0, 0, 0]
+
+
+def test_matches_are_moved_past_pinned_events():
+    tournament, schedule = val_schedule([0, 45], final_at=100, final_round=1)
+    disruptions = [Disruption(match=schedule.find_match("V0"), type="extended_duration", extra_minutes=20)]
+    greedy, result = reschedule(tournament, schedule, disruptions)
+
+    # V1 would start at 65 and run into the fixed match at 100, so it follows it instead
+    assert greedy.feasible
+    assert result.find_match("VF").start_time == schedule.find_match("VF").start_time
+    assert shift_of(result, schedule, "V1") == 160 - 45
+
+
+def test_infeasible_result_is_reported():
+    # Far more matches than fit before the venue closes
+    tournament, schedule = benchmark_bracket(30)
+    disruptions = [Disruption(match=schedule.find_match("ML00"), type="extended_duration", extra_minutes=40)]
+    greedy, result = reschedule(tournament, schedule, disruptions)
+    assert not greedy.feasible
+    assert greedy.hard_penalty > 0
+    assert len(result.matches) == len(schedule.matches)
+
+
+def test_greedy_and_optimizer_build_the_same_matches_from_the_same_starts():
+    tournament, schedule = val_schedule([0, 45, 100], final_at=400)
+    now = schedule.find_match("V1").start_time
+    disruptions = [Disruption(match=schedule.find_match("V0"), type="extended_duration", extra_minutes=20),
+                   Disruption(match=schedule.find_match("V2"), type="late_arrival", extra_minutes=30)]
+    greedy = GreedyRescheduler(tournament, schedule, disruptions, GeneticAlgorithmOptimizer.WEIGHTS,
+                               GeneticAlgorithmOptimizer.PEAK_HOURS, now=now)
+    result = greedy.reschedule()
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, now=now)
+    decoded = optimizer._decode_schedule([int(start) for start in greedy.starts])
+
+    # V0 is frozen with its extended duration and V2 keeps its late start
+    assert [m.id for m in greedy.context.frozen_matches] == ["V0"]
+    assert result.find_match("V0").duration == 60
+    assert shift_of(result, schedule, "V2") == 30
+    assert sorted(result.matches, key=lambda m: m.id) == sorted(decoded.matches, key=lambda m: m.id)
@@ -0,0 +1,124 @@
+"""
+Tests for the time grid, slot occupancy bitmaps and the GA's grid encoding.
+"""
+
+import contextlib
+import io
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backend.models.models import Disruption
+from backend.schedulers import grid as grid_module
+from backend.schedulers.grid import SlotOccupancy, TimeGrid
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer, GraphColoringScheduler
+from backend.tests.helpers import assert_feasible, bracket_tournament, setup_bracket, val_schedule
+
+
+def test_grid_matches_tournament_timeslots():
+    tournament = bracket_tournament(4)
+    grid = TimeGrid.for_tournament(tournament, 15)
+    assert grid.times == tournament.get_timeslots(15)
+    assert grid.slot_at(0) == 0 and grid.slot_at(1) == 1 and grid.slot_at(30) == 2
+    assert grid.minutes(3) == 45
+    # 10 to 40 minutes touches the slots starting at 0, 15 and 30
+    assert grid.span(10, 40) == 0b111
+    assert grid.span(15, 30) == 0b10
+    assert grid.span(-30, -10) == 0
+
+
+def test_occupancy_checks_venues_teams_rest_and_blocked_slots():
+    grid = TimeGrid(datetime(2026, 3, 6, 9, 0), interval=5, n_slots=100)
+    occupancy = SlotOccupancy(grid, rest_period=15)
+    occupancy.occupy(60, 100, "venue A", ("Team 1", "Team 2"))
+    occupancy.occupy(200, 260, "venue A", blocks_all=True)
+
+    # Same venue: only back to back
+    assert not occupancy.is_free(90, 130, ["venue A"])
+    assert occupancy.is_free(100, 140, ["venue A"])
+    # Same team at another venue: needs the rest period
+    assert not occupancy.is_free(105, 140, ["venue B"], ["Team 2"])
+    assert occupancy.is_free(115, 140, ["venue B"], ["Team 2"])
+    # A break blocks every venue and team
+    assert not occupancy.is_free(220, 230, ["venue B"])
+
+    assert occupancy.first_free(70, 40, ["venue A"], ["Team 3"]) == 20
+    assert occupancy.first_free(180, 30, ["venue B"]) == 52
+    assert occupancy.first_free(180, 30, ["venue B"], limit=40) is None
+
+
+def test_counted_occupancy_vacates_matches():
+    grid = TimeGrid(datetime(2026, 3, 6, 9, 0), interval=10, n_slots=100)
+    occupancy = SlotOccupancy(grid, rest_period=15, counted=True)
+    occupancy.occupy(0, 45, "venue A", ("Team 1", "Team 2"))
+    occupancy.occupy(45, 80, "venue A", ("Team 3", "Team 4"))
+    before = (dict(occupancy.venues), dict(occupancy.teams))
+
+    # Slot 4 is shared by both matches and stays occupied at the venue
+    occupancy.vacate(0, 45, "venue A", ("Team 1", "Team 2"))
+    assert occupancy.venues["venue A"] == grid.span(45, 80)
+    assert occupancy.teams["Team 1"] == 0 and occupancy.is_free(0, 40, ["venue A"], ["Team 1"])
+
+    occupancy.occupy(0, 45, "venue A", ("Team 1", "Team 2"))
+    assert (occupancy.venues, occupancy.teams) == before
+    with pytest.raises(ValueError):
+        SlotOccupancy(grid).vacate(0, 45, "venue A")
+
+
+def test_coloring_bitmaps_only_skip_the_exact_event_check(monkeypatch):
+    tournament = bracket_tournament(12)
+    scheduler = GraphColoringScheduler(tournament, slot_interval=5)
+    expected = {m.id: m.start_time for m in scheduler.generate_schedule().matches}
+
+    # Without the bitmap fast path every slot is checked against every event
+    monkeypatch.setattr(grid_module.SlotOccupancy, "is_free", lambda *args, **kwargs: False)
+    tournament = bracket_tournament(12)
+    schedule = GraphColoringScheduler(tournament, slot_interval=5).generate_schedule()
+    assert {m.id: m.start_time for m in schedule.matches} == expected
+    assert_feasible(tournament, schedule)
+
+
+def test_grid_genomes_decode_onto_the_grid():
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(match=schedule.find_match("M1"), type="extended_duration", extra_minutes=23)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=2, encoding="grid",
+                                          grid_interval=10)
+    evaluator = optimizer.evaluator
+    random.seed(2)
+    population = optimizer.toolbox.population(n=20)
+    starts = evaluator.decode(evaluator.as_matrix(population))
+    free = ~optimizer.context.pinned
+    assert np.all(starts[:, free] % 10 == 0)
+    assert [evaluator.decode_genome(individual) for individual in population] == starts.tolist()
+
+    # The vectorized and scalar fitness agree on slot genomes
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [optimizer._evaluate_schedule(individual)[0] for individual in population]
+    actual = [fitness[0] for fitness in optimizer.evaluate_population(population)]
+    assert np.allclose(actual, expected)
+
+    optimizer.generations = 5
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+    open_at = optimizer.context.venue_open
+    for match in result.matches:
+        if not match.is_fixed_time:
+            assert (match.start_time - open_at) % timedelta(minutes=10) == timedelta(0)
+
+
+def test_grid_mutation_moves_genes_to_free_slots():
+    tournament, schedule = val_schedule([0, 60], final_at=120)
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [], encoding="grid", grid_interval=5)
+    index = optimizer.context.index_of
+    genome = optimizer._create_schedule()
+    assert genome == [0, 12, 24]
+
+    # V1 shifted anywhere must end up clear of V0 and of the final at the venue
+    random.seed(0)
+    for _ in range(20):
+        mutant = optimizer._mutate_grid(list(genome), gene_prob=1.0)[0]
+        start = mutant[index["V1"]] * 5
+        assert start + 40 <= 120 or start >= 180
+        assert start >= 40 or start + 40 <= mutant[index["V0"]] * 5
@@ -0,0 +1,89 @@
+"""
+Tests for receding-horizon rescheduling with a "now" cutoff.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from backend.models.models import Disruption
+from backend.schedulers.greedy import GreedyRescheduler
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.tests.helpers import DAY, random_population, setup_bracket, val_schedule
+
+
+def minutes(result, match_id):
+    return (result.find_match(match_id).start_time - DAY) / timedelta(minutes=1)
+
+
+def extended_val_schedule():
+    # V0 and V1 have started by minute 50; V1 runs 20 minutes over and now ends at 105
+    tournament, schedule = val_schedule([0, 45, 100], final_at=400)
+    disruptions = [Disruption(match=schedule.find_match("V1"), type="extended_duration", extra_minutes=20)]
+    return tournament, schedule, disruptions, DAY + timedelta(minutes=50)
+
+
+def test_started_matches_leave_the_genome_and_come_back_unchanged():
+    tournament, schedule, disruptions, now = extended_val_schedule()
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=0, generations=5, now=now)
+    context = optimizer.context
+    assert [m.id for m in context.frozen_matches] == ["V0", "V1"]
+    assert context.n_matches == 2
+
+    # V2 waits for the venue after the extended V1
+    assert context.earliest_start[context.index_of["V2"]] == 110
+
+    result = optimizer.optimize()
+    assert sorted(m.id for m in result.matches) == ["V0", "V1", "V2", "VF"]
+    assert minutes(result, "V0") == 0
+    assert minutes(result, "V1") == 45
+    assert result.find_match("V1").duration == 60
+    assert minutes(result, "V2") >= 110
+    assert minutes(result, "VF") == 400
+
+
+def test_live_matches_respect_the_cutoff_and_frozen_rest():
+    tournament, schedule = setup_bracket()
+    day = schedule.find_match("M1").start_time
+    # M1 and V1 have started; the rest wait for their venue to be set up again
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [], seed=0, now=day + timedelta(minutes=30))
+    context = optimizer.context
+    assert {m.id for m in context.frozen_matches} == {"M1", "V1"}
+
+    earliest = context.earliest_start
+    assert earliest[context.index_of["M2"]] == 55
+    assert earliest[context.index_of["V2"]] == 55
+    assert earliest[context.index_of["M3"]] == 55
+
+    # Genes below the bound decode to the bound, for both fitness paths
+    genomes = random_population(optimizer, 20, seed=1) + [[0] * context.n_matches]
+    starts = optimizer.evaluator.decode(optimizer.evaluator.as_matrix(genomes))
+    pinned = np.array(context.pinned)
+    assert np.all(starts[:, ~pinned] >= earliest[~pinned])
+    vectorized = optimizer.evaluator.evaluate(genomes)
+    scalar = [optimizer._evaluate_schedule(genome)[0] for genome in genomes]
+    assert np.allclose(vectorized, scalar)
+
+
+def test_cutoff_before_the_first_match_changes_nothing():
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(match=schedule.find_match("M1"), type="extended_duration", extra_minutes=25)]
+    plain = GeneticAlgorithmOptimizer(tournament, schedule, disruptions)
+    early = GeneticAlgorithmOptimizer(tournament, schedule, disruptions,
+                                      now=schedule.find_match("M1").start_time - timedelta(hours=1))
+    assert not early.context.frozen_matches
+    genomes = random_population(plain, 10, seed=2)
+    assert np.allclose(plain.evaluator.evaluate(genomes), early.evaluator.evaluate(genomes))
+
+
+def test_greedy_pass_keeps_frozen_matches():
+    tournament, schedule, disruptions, now = extended_val_schedule()
+    greedy = GreedyRescheduler(tournament, schedule, disruptions, GeneticAlgorithmOptimizer.WEIGHTS,
+                               GeneticAlgorithmOptimizer.PEAK_HOURS, now=now)
+    result = greedy.reschedule()
+    assert greedy.feasible
+    assert len(result.matches) == len(schedule.matches)
+    assert minutes(result, "V1") == 45
+    assert result.find_match("V1").duration == 60
+    assert minutes(result, "V2") == 110
+    assert greedy.context.n_matches == 2
@@ -0,0 +1,85 @@
+"""
+Tests for the simulated annealing and tabu search engines.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from backend.models.models import Disruption
+from backend.schedulers.local_search import LocalSearchOptimizer, choose_engine
+from backend.tests.helpers import best_penalty, setup_bracket, val_schedule
+
+
+def make_optimizer(disruption="extended_duration", **options):
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(match=schedule.find_match("M1"), type=disruption, extra_minutes=25)]
+    return LocalSearchOptimizer(tournament, schedule, disruptions, seed=3, **options)
+
+
+@pytest.mark.parametrize("method", LocalSearchOptimizer.METHODS)
+def test_local_search_improves_on_its_start_and_keeps_protected_matches(method):
+    optimizer = make_optimizer(method=method, iterations=1000)
+    start, start_penalty = optimizer._start()
+    schedule = optimizer.optimize()
+
+    penalty, _ = best_penalty(optimizer, schedule)
+    assert penalty <= start_penalty
+    assert penalty == pytest.approx(optimizer.logbook.select("min")[-1])
+    assert optimizer.stop_reason == "iterations"
+    assert len(optimizer.logbook) == 11
+
+    # Fixed-time events keep their exact time
+    for match_id in ("V3", "E1"):
+        assert schedule.find_match(match_id).start_time == optimizer.initial_schedule.find_match(match_id).start_time
+
+
+@pytest.mark.parametrize("method", LocalSearchOptimizer.METHODS)
+def test_local_search_is_reproducible(method):
+    runs = []
+    for _ in range(2):
+        schedule = make_optimizer(method=method, iterations=500).optimize()
+        runs.append(sorted((m.id, m.start_time) for m in schedule.matches))
+    assert runs[0] == runs[1]
+
+
+@pytest.mark.parametrize("warm_start", [False, True])
+def test_moves_never_start_matches_before_their_original_time(warm_start):
+    # An hour between 40-minute matches leaves room to move them earlier
+    tournament, schedule = val_schedule([0, 60, 120], final_at=400)
+    optimizer = LocalSearchOptimizer(tournament, schedule, [], seed=3, warm_start=warm_start)
+    original = optimizer.context.original_start
+    genome, _ = optimizer._start()
+    random.seed(1)
+    for _ in range(500):
+        genome, _ = optimizer._random_move(genome)
+        # Decoding never starts a match before its gene
+        assert np.all(np.array(genome) >= original)
+
+
+def test_late_arrival_stays_pinned_and_stopping_criteria_apply():
+    optimizer = make_optimizer(disruption="late_arrival", iterations=500)
+    schedule = optimizer.optimize()
+    original = optimizer.initial_schedule.find_match("M1").start_time
+    assert (schedule.find_match("M1").start_time - original).total_seconds() == 25 * 60
+
+    optimizer = make_optimizer(target_fitness=1e12)
+    optimizer.optimize()
+    assert optimizer.stop_reason == "target_fitness"
+    assert len(optimizer.logbook) == 1
+
+    optimizer = make_optimizer(iterations=100_000, stagnation_generations=3)
+    optimizer.optimize()
+    assert optimizer.stop_reason == "stagnation"
+
+
+def test_engine_choice():
+    assert choose_engine("tabu", 5, 10) == "tabu"
+    assert choose_engine("auto", 1, 10) == "annealing"
+    assert choose_engine("auto", 5, 10) == "ga"
+    assert choose_engine("auto", 5, 500) == "annealing"
+    with pytest.raises(ValueError):
+        choose_engine("hillclimb", 1, 10)
+    with pytest.raises(ValueError):
+        make_optimizer(method="hillclimb")
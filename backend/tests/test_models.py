@@ -0,0 +1,141 @@
+"""
+Tests for the indexed Schedule container.
+"""
+
+import pickle
+import random
+from datetime import datetime, time as dt_time, timedelta, timezone
+
+import pytest
+
+from backend.models.models import EPOCH, Team, Match, GameType, from_minutes, to_minutes
+from backend.models.tournament import Tournament
+from backend.tests.helpers import random_schedule
+
+
+def linear_affected(schedule, disrupted):
+    """Reference implementation: scan every match."""
+    affected = [
+        m for m in schedule.matches
+        if m.id != disrupted.id and m.start_time >= disrupted.end_time and (
+            {m.team1.name, m.team2.name} & {disrupted.team1.name, disrupted.team2.name} or
+            m.game_type == disrupted.game_type)
+    ]
+    return sorted(affected, key=lambda m: m.start_time)
+
+
+def linear_rest_ok(schedule, team_name, start_time, rest_period):
+    """Reference implementation: scan every match of the team."""
+    for m in schedule.matches:
+        if team_name in (m.team1.name, m.team2.name):
+            if (start_time - m.end_time).total_seconds() / 60 < rest_period:
+                return False
+    return True
+
+
+def test_find_match_uses_id_index():
+    schedule = random_schedule(20, seed=0)
+    assert schedule.find_match("M7") is schedule.matches[7]
+    assert schedule.find_match("missing") is None
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_indexes_follow_time_changes(seed):
+    schedule = random_schedule(40, seed=seed)
+    rng = random.Random(seed)
+
+    # Move matches through set_time and by assigning end_time directly
+    for match in rng.sample(schedule.matches, 15):
+        match.set_time(match.start_time + timedelta(minutes=rng.randint(-60, 60)))
+    for match in rng.sample(schedule.matches, 5):
+        match.duration += 15
+        match.end_time = match.start_time + timedelta(minutes=match.duration)
+
+    for disrupted in schedule.matches:
+        assert schedule.get_affected_matches(disrupted) == linear_affected(schedule, disrupted)
+
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0),
+                            rest_period=30)
+    for match in schedule.matches:
+        team = match.team1
+        assert tournament.check_rest_period(schedule, team, match.start_time) == \
+            linear_rest_ok(schedule, team.name, match.start_time, 30)
+
+
+def test_clone_and_pickle_rebuild_indexes():
+    schedule = random_schedule(30, seed=4)
+    for copy in (schedule.clone(), pickle.loads(pickle.dumps(schedule))):
+        moved = copy.matches[0]
+        moved.set_time(moved.start_time + timedelta(minutes=90))
+        assert copy.find_match(moved.id) is moved
+        assert copy.get_affected_matches(moved) == linear_affected(copy, moved)
+
+    # The original schedule is untouched by changes to the copies
+    original = schedule.matches[0]
+    assert schedule.get_affected_matches(original) == linear_affected(schedule, original)
+
+
+def test_times_are_minutes_since_the_epoch():
+    moment = datetime(2026, 3, 6, 9, 30)
+    assert to_minutes(moment) == (moment - EPOCH) // timedelta(minutes=1)
+    assert isinstance(to_minutes(moment), int)
+    assert to_minutes(moment + timedelta(seconds=30)) == to_minutes(moment) + 0.5
+    assert from_minutes(to_minutes(moment)) == moment
+
+    # Aware datetimes come back in their own time zone
+    manila = timezone(timedelta(hours=8))
+    aware = datetime(2026, 3, 6, 9, 30, tzinfo=manila)
+    assert to_minutes(aware) == to_minutes(moment) - 8 * 60
+    assert from_minutes(to_minutes(aware), manila).tzinfo is manila
+
+    team = Team(id=1, name="Team 1", game_type=GameType.VALORANT)
+    match = Match(id="M1", team1=team, team2=team, duration=40, game_type=GameType.VALORANT, round_number=1,
+                  start_time=aware)
+    assert (match.start_minute, match.end_minute) == (to_minutes(aware), to_minutes(aware) + 40)
+    assert match.end_time == aware + timedelta(minutes=40) and match.end_time.tzinfo is manila
+    match.set_minutes(match.start_minute + 15)
+    assert match.start_time == aware + timedelta(minutes=15)
+
+    # Slotted models carry no per-instance dict
+    assert not hasattr(match, '__dict__') and not hasattr(team, '__dict__')
+    assert pickle.loads(pickle.dumps(match)) == match
+
+
+def benchmark(n_matches=10_000, repeats=3):
+    """Memory per match and time of the scalar fitness evaluation and of cloning on a large schedule."""
+    import contextlib
+    import io
+    import time
+    import tracemalloc
+
+    from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+
+    tracemalloc.start()
+    schedule = random_schedule(n_matches, seed=0)
+    indexed, _ = tracemalloc.get_traced_memory()
+    matches = [Match(id=m.id, team1=m.team1, team2=m.team2, duration=m.duration, game_type=m.game_type,
+                     round_number=m.round_number, start_time=m.start_time) for m in schedule.matches]
+    size = tracemalloc.get_traced_memory()[0] - indexed
+    tracemalloc.stop()
+
+    tournament = Tournament(id="bench", name="bench", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0),
+                            rest_period=15)
+    with contextlib.redirect_stdout(io.StringIO()):
+        optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [], warm_start=False)
+        genome = [int(start) for start in optimizer.context.original_start]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            optimizer._evaluate_schedule(genome)
+        evaluation = (time.perf_counter() - start) / repeats
+    start = time.perf_counter()
+    for _ in range(repeats):
+        schedule.clone()
+    clone = (time.perf_counter() - start) / repeats
+
+    print(f"{n_matches} matches: {size / len(matches):.0f} bytes per match, "
+          f"{indexed / n_matches:.0f} bytes per indexed match, "
+          f"scalar evaluation {evaluation:.3f} s, clone {clone:.3f} s")
+
+
+if __name__ == "__main__":
+    benchmark()
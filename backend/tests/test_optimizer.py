@@ -0,0 +1,105 @@
+"""
+Tests for the stopping criteria of GeneticAlgorithmOptimizer.optimize().
+"""
+
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+import pytest
+
+from backend.models.models import Team, Match, Schedule, Disruption, GameType
+from backend.models.tournament import Tournament
+from backend.schedulers.islands import migrate
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.tests.helpers import best_penalty, setup_bracket
+
+
+def make_optimizer(**options):
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(match=schedule.find_match("M1"), type="extended_duration", extra_minutes=25)]
+    return GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=3, **options)
+
+
+def test_runs_all_generations_without_limits():
+    optimizer = make_optimizer(generations=5)
+    optimizer.optimize()
+    assert optimizer.stop_reason == "generations"
+    assert len(optimizer.logbook) == 6
+
+
+def test_stagnation_window_stops_early():
+    optimizer = make_optimizer(stagnation_generations=3)
+    schedule = optimizer.optimize()
+    assert optimizer.stop_reason == "stagnation"
+    assert len(optimizer.logbook) < 101
+
+    # The returned schedule is the best individual seen
+    penalty, _ = best_penalty(optimizer, schedule)
+    assert penalty == pytest.approx(min(optimizer.logbook.select("min")))
+
+
+def test_target_fitness_and_feasibility_stop_immediately():
+    optimizer = make_optimizer(target_fitness=1e12)
+    optimizer.optimize()
+    assert optimizer.stop_reason == "target_fitness"
+    assert len(optimizer.logbook) == 1
+
+    # Two independent matches: the undisrupted seed schedule is already feasible
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0),
+                            rest_period=15)
+    schedule = Schedule()
+    day = datetime.combine(datetime.today().date(), dt_time(10, 0))
+    for k, game_type in enumerate((GameType.MOBILE_LEGENDS, GameType.VALORANT)):
+        match = Match(id=f"M{k}", team1=Team(id=2 * k, name=f"Team {2 * k}", game_type=game_type),
+                      team2=Team(id=2 * k + 1, name=f"Team {2 * k + 1}", game_type=game_type),
+                      duration=40, game_type=game_type, round_number=1)
+        match.set_time(day + timedelta(minutes=60 * k))
+        schedule.add_match(match)
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [], seed=3, stop_when_feasible=True)
+    schedule = optimizer.optimize()
+    assert optimizer.stop_reason == "feasible"
+    assert len(optimizer.logbook) == 1
+    assert best_penalty(optimizer, schedule)[1] == 0
+
+
+def test_time_budget_returns_best_so_far():
+    optimizer = make_optimizer(generations=10_000, time_budget=0.2)
+    start = time.perf_counter()
+    schedule = optimizer.optimize()
+    elapsed = time.perf_counter() - start
+
+    assert optimizer.stop_reason == "time_budget"
+    assert elapsed < 1.0
+    assert len(schedule.matches) == len(optimizer.initial_schedule.matches)
+
+
+def test_island_model_is_reproducible_and_merges_results():
+    runs = []
+    for _ in range(2):
+        optimizer = make_optimizer(islands=3, generations=12, migration_interval=5)
+        schedule = optimizer.optimize()
+        runs.append(sorted((m.id, m.start_time) for m in schedule.matches))
+
+        # Per-island logbooks cover every generation; the merged logbook tracks the best island
+        assert [len(logbook) for logbook in optimizer.island_logbooks] == [13, 13, 13]
+        assert len(optimizer.logbook) == 13
+        assert optimizer.logbook.select("min")[-1] == \
+            min(logbook.select("min")[-1] for logbook in optimizer.island_logbooks)
+        assert optimizer.hall_of_fame[0].fitness.values[0] <= min(optimizer.logbook.select("min"))
+    assert runs[0] == runs[1]
+
+
+def test_ring_migration_replaces_worst_with_neighbour_best():
+    optimizer = make_optimizer()
+    populations = [optimizer._individuals([[island, k] for k in range(4)],
+                                          [10 * island + k for k in range(4)])
+                   for island in range(3)]
+    migrate(populations, 2, "ring", random.Random(0), optimizer.toolbox.clone)
+
+    # Island 1 keeps its two best and receives island 0's two best
+    assert sorted(map(list, populations[1])) == [[0, 0], [0, 1], [1, 0], [1, 1]]
+    assert sorted(map(list, populations[0])) == [[0, 0], [0, 1], [2, 0], [2, 1]]
+
+    with pytest.raises(ValueError):
+        make_optimizer(islands=2, migration_topology="star")
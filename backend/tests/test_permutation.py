@@ -0,0 +1,158 @@
+"""
+Tests and benchmark for the permutation genome encoding.
+
+Run this module directly to compare the permutation and time encodings.
+"""
+
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+from backend.models.models import Disruption
+from backend.schedulers.local_search import LocalSearchOptimizer
+from backend.schedulers.permutation import venue_crossover, venue_mutation
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.tests.helpers import benchmark_bracket, bracketed, setup_bracket, val_schedule
+
+
+def built(optimizer, genome):
+    return optimizer.evaluator.decode(optimizer.evaluator.as_matrix([genome]))[0]
+
+
+def test_builder_follows_venue_order_gaps_and_kept_matches():
+    tournament, schedule = val_schedule([0, 60])
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [], encoding="permutation")
+    index = optimizer.context.index_of
+    v0, v1 = index["V0"], index["V1"]
+    assert optimizer.evaluator.segments == [(0, 2)]
+    assert optimizer._create_schedule() == [v0, v1, 0, 0]
+
+    # The original order keeps the original times
+    starts = built(optimizer, [v0, v1, 0, 0])
+    assert starts.tolist() == [0, 60, 120]
+    assert optimizer.evaluator.hard_penalty(starts[None, :])[0] == 0
+
+    # A gap delays V1 beyond its earliest start
+    assert built(optimizer, [v0, v1, 0, 10])[v1] == 70
+
+    # V1 first: V0 follows it after the setup time and is pushed past the fixed final of its teams
+    starts = built(optimizer, [v1, v0, 0, 0])
+    assert starts[v1] == 60
+    assert starts[v0] == 120 + 60 + tournament.rest_period
+
+
+def test_builder_waits_for_lower_rounds_or_bracket_predecessors():
+    tournament, schedule = setup_bracket()
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [], encoding="permutation")
+    evaluator = optimizer.evaluator
+    index = optimizer.context.index_of
+    ends = lambda starts, ids: [starts[index[i]] + evaluator.durations[index[i]] for i in ids]
+
+    # The round-2 semi-final is first in its venue's order, but cannot start before round 1 ends
+    genome = optimizer._create_schedule()
+    a, b = next(segment for segment in evaluator.segments if index["M3"] in genome[slice(*segment)])
+    genome[a:b] = [index["M3"]] + [i for i in genome[a:b] if i != index["M3"]]
+    starts = built(optimizer, genome)
+    assert starts[index["M3"]] >= max(ends(starts, ["M1", "M2", "V1", "V2"]))
+    assert evaluator.check_round_sequence(starts[None, :], (starts + evaluator.durations)[None, :])[0] == 0
+
+    # With a bracket the semi-final waits only for its own predecessors
+    tournament, schedule = bracketed()
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [], encoding="permutation")
+    starts = built(optimizer, optimizer._create_schedule())
+    assert starts[index["M3"]] >= max(ends(starts, ["M1", "M2"]))
+    assert starts[index["V1"]] == 0
+
+
+def test_variation_keeps_venue_permutations():
+    tournament, schedule = benchmark_bracket(6)
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [], encoding="permutation",
+                                          permutation_crossover="pmx")
+    evaluator = optimizer.evaluator
+    identity = optimizer._create_schedule()
+    random.seed(4)
+    population = [optimizer._mutate_permutation(list(identity), order_prob=1.0, gap_prob=0.5)[0]
+                  for _ in range(20)]
+    for method in ("ox", "pmx"):
+        for ind1, ind2 in zip(population, population[1:]):
+            venue_crossover(ind1, ind2, evaluator.segments, evaluator.n_free, method)
+            venue_mutation(ind1, evaluator.segments, evaluator.n_free, 5)
+    for genome in population:
+        assert len(genome) == evaluator.genome_length
+        for a, b in evaluator.segments:
+            assert sorted(genome[a:b]) == sorted(identity[a:b])
+        assert min(genome[evaluator.n_free:]) >= 0
+    assert len({tuple(genome) for genome in population}) > 10
+
+
+def test_permutation_optimizer_matches_scalar_fitness_and_runs():
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(match=schedule.find_match("M1"), type="extended_duration", extra_minutes=25)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=5, generations=5,
+                                          encoding="permutation")
+    random.seed(5)
+    population = optimizer.toolbox.population(n=20)
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [optimizer._evaluate_schedule(individual)[0] for individual in population]
+    actual = [fitness[0] for fitness in optimizer.evaluate_population(population)]
+    assert np.allclose(actual, expected)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimizer.optimize()
+    assert sorted(m.id for m in result.matches) == sorted(m.id for m in schedule.matches)
+    assert min(optimizer.logbook.select("min")) <= optimizer.logbook[0]['min']
+
+
+def test_unknown_encodings_are_rejected():
+    tournament, schedule = setup_bracket()
+    with pytest.raises(ValueError):
+        GeneticAlgorithmOptimizer(tournament, schedule, [], encoding="random-keys")
+    with pytest.raises(ValueError):
+        GeneticAlgorithmOptimizer(tournament, schedule, [], encoding="permutation", permutation_crossover="cx")
+    with pytest.raises(ValueError):
+        LocalSearchOptimizer(tournament, schedule, [], encoding="permutation")
+
+
+def benchmark(sizes=(4, 8, 12), seeds=(0, 1, 2), generations=40, max_generations=200):
+    """
+    Compare evaluations to the first feasible schedule and final fitness of both encodings.
+
+    The search for feasibility starts cold, from the disrupted schedule, so the
+    warm-start repair does not do the work for the time encoding.
+    """
+    import time
+
+    print(f"{'matches':>8} {'encoding':>12} {'evals to feasible':>18} {'best (mean)':>12} {'time (s)':>9}")
+    for n in sizes:
+        for encoding in ("time", "permutation"):
+            to_feasible, bests, elapsed = [], [], 0.0
+            for seed in seeds:
+                tournament, schedule = benchmark_bracket(n)
+                disruptions = [Disruption(match=schedule.find_match("ML00"), type="extended_duration",
+                                          extra_minutes=40)]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=seed,
+                                                          generations=max_generations, stop_when_feasible=True,
+                                                          stop_at_bound=False, warm_start=False,
+                                                          encoding=encoding)
+                    optimizer.optimize()
+                    if optimizer.stop_reason == "feasible":
+                        to_feasible.append(sum(optimizer.logbook.select("nevals")))
+
+                    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=seed,
+                                                          generations=generations, stop_at_bound=False,
+                                                          encoding=encoding)
+                    start = time.perf_counter()
+                    optimizer.optimize()
+                    elapsed += time.perf_counter() - start
+                bests.append(min(optimizer.logbook.select("min")))
+            evals = f"{np.mean(to_feasible):.0f} ({len(to_feasible)}/{len(seeds)})" if to_feasible else "never"
+            print(f"{2 * n + 2:>8} {encoding:>12} {evals:>18} {np.mean(bests):>12.1f} "
+                  f"{elapsed / len(seeds):>9.2f}")
+
+
+if __name__ == "__main__":
+    benchmark()
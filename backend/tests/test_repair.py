@@ -0,0 +1,178 @@
+"""
+Tests and benchmark for the feasibility repair operator and warm-start seeding.
+
+Run this module directly to compare repaired and unrepaired search.
+"""
+
+import contextlib
+import io
+
+import numpy as np
+from deap import tools
+
+from backend.models.models import Disruption
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+from backend.tests.helpers import benchmark_bracket, setup_bracket, val_schedule
+
+
+def starts_of(optimizer, genome):
+    return optimizer.evaluator.decode(optimizer.evaluator.as_matrix([genome]))[0]
+
+
+def test_repair_moves_matches_to_nearest_feasible_start():
+    tournament, schedule = val_schedule([0, 60])
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [])
+    index = optimizer.context.index_of
+
+    # V0 (teams 0, 1) ends too close to the final; V1 collides with it at the venue
+    genome = [0] * optimizer.context.n_matches
+    genome[index["V0"]] = 70
+    genome[index["V1"]] = 115
+    starts = starts_of(optimizer, optimizer.repairer.repair(genome))
+
+    # V1 is a lower round and must end before the final starts, so it moves left to 80;
+    # V0 keeps the 5 minute setup before V1 and so moves left to 35
+    assert starts[index["V1"]] == 80
+    assert starts[index["V0"]] == 35
+    assert starts[index["VF"]] == 120
+    assert optimizer.evaluator.hard_penalty(starts[None, :])[0] == 0
+
+    # A fixed match of the same round only needs the rest period for its teams
+    tournament, schedule = val_schedule([0, 200], final_round=1)
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [])
+    index = optimizer.context.index_of
+    genome = [0] * optimizer.context.n_matches
+    genome[index["V0"]] = 70
+    genome[index["V1"]] = 200
+    starts = starts_of(optimizer, optimizer.repairer.repair(genome))
+    assert starts[index["V0"]] == 65
+    assert starts[index["V1"]] == 200
+
+
+def test_repaired_genomes_decode_to_themselves_and_remove_hard_penalties():
+    tournament, schedule = val_schedule([0, 50], final_at=300)
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, [])
+    rng = np.random.default_rng(0)
+    genomes = rng.integers(0, 400, size=(30, optimizer.context.n_matches)).tolist()
+    repaired = optimizer.repairer.repair_population(genomes)
+
+    before = optimizer.evaluator.hard_penalty(optimizer.evaluator.decode(optimizer.evaluator.as_matrix(genomes)))
+    starts = optimizer.evaluator.decode(optimizer.evaluator.as_matrix(repaired))
+    after = optimizer.evaluator.hard_penalty(starts)
+    assert np.all(after <= before)
+    assert np.all(after == 0)
+    assert np.array_equal(starts, optimizer.evaluator.decode(optimizer.evaluator.as_matrix(
+        optimizer.repairer.repair_population(repaired))))
+
+
+def test_warm_start_population_is_diverse_and_repaired():
+    tournament, schedule = val_schedule([0, 50, 100], final_at=400)
+    disruptions = [Disruption(match=schedule.find_match("V0"), type="extended_duration", extra_minutes=25)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=1)
+    population = optimizer.toolbox.population(n=20)
+
+    assert len({tuple(ind) for ind in population}) > 3
+    assert [list(ind) for ind in population] == optimizer.repairer.repair_population(population)
+    penalties = optimizer.evaluator.hard_penalty(optimizer.evaluator.decode(optimizer.evaluator.as_matrix(population)))
+    assert np.all(penalties == 0)
+
+    cold = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, warm_start=False)
+    assert len({tuple(ind) for ind in cold.toolbox.population(n=20)}) == 1
+
+
+def test_seeds_and_repair_keep_matches_after_their_original_start():
+    tournament, schedule = val_schedule([60, 120, 180], final_at=400)
+    disruptions = [Disruption(match=schedule.find_match("V0"), type="early_finish", extra_minutes=20)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=1)
+    context = optimizer.context
+    free = context.mutable_positions
+
+    for genome in optimizer._heuristic_seeds() + optimizer.toolbox.population(n=20):
+        starts = optimizer.evaluator.decode(optimizer.evaluator.as_matrix([optimizer.repairer.repair(genome)]))[0]
+        assert np.all(starts[free] >= context.original_start[free])
+
+
+def test_decoders_never_start_matches_before_their_original_time():
+    tournament, schedule = val_schedule([60, 120, 180], final_at=400)
+    disruptions = [Disruption(match=schedule.find_match("V0"), type="early_finish", extra_minutes=20)]
+    for options in ({}, {"encoding": "grid", "grid_interval": 5}):
+        optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, delta_evaluation=True, **options)
+        context = optimizer.context
+        free = context.mutable_positions
+        zeros = [0] * context.n_matches
+
+        starts = optimizer.evaluator.decode(optimizer.evaluator.as_matrix([zeros]))[0]
+        assert np.all(starts[free] >= context.original_start[free])
+        with contextlib.redirect_stdout(io.StringIO()):
+            decoded = optimizer._decode_schedule(zeros)
+        for match in decoded.matches:
+            assert match.start_time >= schedule.find_match(match.id).start_time
+
+    # The delta evaluator decodes a single changed gene incrementally
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, delta_evaluation=True)
+    context = optimizer.context
+    free = context.mutable_positions
+    genome = optimizer._create_schedule()
+    moved = list(genome)
+    moved[context.index_of["V1"]] = 0
+    starts = optimizer.delta.apply(optimizer.delta.full_state(genome), moved).starts
+    assert np.all(starts[free] >= context.original_start[free])
+    assert np.all(optimizer.delta.full_state([0] * context.n_matches).starts[free] >= context.original_start[free])
+
+
+def test_repair_never_worsens_a_constrained_bracket():
+    tournament, schedule = setup_bracket()
+    disruptions = [Disruption(match=schedule.find_match("M1"), type="extended_duration", extra_minutes=25)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=1)
+    seed = optimizer._create_schedule()
+
+    before = optimizer.evaluator.hard_penalty(starts_of(optimizer, seed)[None, :])[0]
+    after = optimizer.evaluator.hard_penalty(starts_of(optimizer, optimizer.repairer.repair(seed))[None, :])[0]
+    assert after <= before
+
+
+def test_repaired_offspring_stay_repaired():
+    tournament, schedule = val_schedule([0, 50, 100], final_at=400)
+    disruptions = [Disruption(match=schedule.find_match("V0"), type="extended_duration", extra_minutes=25)]
+    optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=2, generations=10,
+                                          repair_offspring=True)
+    optimizer.optimize()
+    assert optimizer.logbook.select("min")[-1] == min(optimizer.logbook.select("min"))
+
+    pop = optimizer.toolbox.population(n=30)
+    hof = tools.HallOfFame(1)
+    optimizer._evaluate_invalid(pop)
+    optimizer._generation(pop, hof)
+    assert [list(ind) for ind in pop] == optimizer.repairer.repair_population(pop)
+
+
+def benchmark(sizes=(4, 8, 16), seeds=(0, 1, 2), generations=40):
+    """Compare best fitness and wall time of repaired and unrepaired search."""
+    import contextlib
+    import io
+    import time
+
+    print(f"{'matches':>8} {'repair':>7} {'best (mean)':>12} {'feasible':>9} {'time (s)':>9}")
+    for n in sizes:
+        for repair in (False, True):
+            bests, feasible, elapsed = [], 0, 0.0
+            for seed in seeds:
+                tournament, schedule = benchmark_bracket(n)
+                disruptions = [Disruption(match=schedule.find_match("ML00"), type="extended_duration",
+                                          extra_minutes=40)]
+                optimizer = GeneticAlgorithmOptimizer(tournament, schedule, disruptions, seed=seed,
+                                                      generations=generations, repair_offspring=repair)
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = optimizer.optimize()
+                elapsed += time.perf_counter() - start
+                bests.append(min(optimizer.logbook.select("min")))
+                starts = np.array([[optimizer.context.offset(m.start_time)
+                                    for m in sorted(result.matches, key=lambda m: m.id)]])
+                feasible += optimizer.evaluator.hard_penalty(starts)[0] == 0
+            print(f"{2 * n + 2:>8} {str(repair):>7} {np.mean(bests):>12.1f} "
+                  f"{feasible:>5}/{len(seeds)} {elapsed / len(seeds):>9.2f}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,113 @@
+"""
+Tests and micro-benchmark for the sweep-line constraint checks.
+
+Run this module directly to print the scaling curve of the sweep-line checks
+against the previous all-pairs implementations.
+"""
+
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+import pytest
+
+from backend.models.models import Team, Match, Schedule, GameType
+from backend.models.tournament import Tournament
+from backend.schedulers.scheduler import GeneticAlgorithmOptimizer
+
+GAME_TYPES = [GameType.MOBILE_LEGENDS, GameType.VALORANT, "ML"]
+
+
+def random_schedule(n_matches, n_teams, seed):
+    """Build a schedule on a coarse time grid so ties and touching matches are common."""
+    rng = random.Random(seed)
+    day = datetime.combine(datetime.today().date(), dt_time(9, 0))
+    teams = [Team(id=i, name=f"Team {i}", game_type=GameType.MOBILE_LEGENDS) for i in range(n_teams)]
+
+    schedule = Schedule()
+    for k in range(n_matches):
+        team1, team2 = rng.sample(teams, 2)
+        match = Match(
+            id=f"M{k:04d}",
+            team1=team1,
+            team2=team2,
+            duration=rng.choice([10, 20, 30]),
+            game_type=rng.choice(GAME_TYPES),
+            round_number=rng.randint(0, 3)
+        )
+        match.set_time(day + timedelta(minutes=10 * rng.randint(0, n_matches // 2)))
+        schedule.add_match(match)
+    return schedule
+
+
+def make_optimizer(schedule):
+    tournament = Tournament(id="sweep", name="Sweep", venue_start=dt_time(9, 0),
+                            venue_end=dt_time(23, 0), rest_period=15)
+    return GeneticAlgorithmOptimizer(tournament, schedule, [])
+
+
+def legacy_round_sequence(schedule):
+    """The previous nested-loop round sequence check, kept as a reference."""
+    violations = 0
+    round_matches = {}
+    for match in schedule.matches:
+        round_matches.setdefault(match.round_number, []).append(match)
+    rounds = sorted(round_matches.keys())
+    for i, round_num in enumerate(rounds):
+        for higher_round in rounds[i + 1:]:
+            for match_lower in round_matches[round_num]:
+                for match_higher in round_matches[higher_round]:
+                    if match_higher.start_time < match_lower.end_time:
+                        violations += 1
+    return violations
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sweep_conflicts_match_pairwise(seed):
+    schedule = random_schedule(60, n_teams=8, seed=seed)
+    optimizer = make_optimizer(schedule)
+
+    assert optimizer._check_conflicts(schedule) == optimizer._check_conflicts_pairwise(schedule)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sweep_round_sequence_matches_nested_loops(seed):
+    schedule = random_schedule(60, n_teams=8, seed=seed)
+    optimizer = make_optimizer(schedule)
+
+    assert optimizer._check_round_sequence(schedule) == legacy_round_sequence(schedule)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_sweeps_match_scalar_checks(seed):
+    schedule = random_schedule(60, n_teams=8, seed=seed)
+    optimizer = make_optimizer(schedule)
+    evaluator = optimizer.evaluator
+    starts = evaluator.original_start[None, :]
+    ends = starts + evaluator.durations
+
+    assert evaluator.check_conflicts(starts, ends)[0] == optimizer._check_conflicts_pairwise(schedule)
+    assert evaluator.check_round_sequence(starts, ends)[0] == legacy_round_sequence(schedule)
+
+
+def benchmark(sizes=(16, 64, 256, 1024)):
+    """Time the sweep-line checks against the all-pairs checks for growing schedules."""
+    print(f"{'matches':>8} {'pairwise (ms)':>14} {'sweep (ms)':>11} {'speedup':>8}")
+    for n in sizes:
+        schedule = random_schedule(n, n_teams=max(8, n // 4), seed=n)
+        optimizer = make_optimizer(schedule)
+
+        start = time.perf_counter()
+        old = (optimizer._check_conflicts_pairwise(schedule), legacy_round_sequence(schedule))
+        pairwise_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        new = (optimizer._check_conflicts(schedule), optimizer._check_round_sequence(schedule))
+        sweep_ms = (time.perf_counter() - start) * 1000
+
+        assert old == new
+        print(f"{n:>8} {pairwise_ms:>14.2f} {sweep_ms:>11.2f} {pairwise_ms / sweep_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
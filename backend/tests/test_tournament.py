@@ -0,0 +1,62 @@
+"""
+Tests for incremental conflict graph maintenance in Tournament.
+"""
+
+import random
+from datetime import datetime, time as dt_time, timedelta
+
+import pytest
+
+from backend.models.models import Team, Match, GameType
+from backend.models.tournament import Tournament
+from backend.tests.helpers import graph_edges, rebuilt_edges
+
+
+def random_match(rng, k, teams, day):
+    team1, team2 = rng.sample(teams, 2)
+    match = Match(id=f"M{k}", team1=team1, team2=team2, duration=rng.choice([20, 40]),
+                  game_type=rng.choice([GameType.MOBILE_LEGENDS, GameType.VALORANT]),
+                  round_number=rng.randint(1, 3))
+    if rng.random() < 0.8:
+        match.set_time(day + timedelta(minutes=10 * rng.randint(0, 30)))
+    return match
+
+
+@pytest.mark.parametrize("backend", ["networkx", "bitset"])
+@pytest.mark.parametrize("seed", range(4))
+def test_incremental_graph_matches_full_rebuild(seed, backend):
+    rng = random.Random(seed)
+    day = datetime.combine(datetime.today().date(), dt_time(9, 0))
+    teams = [Team(id=i, name=f"Team {i}", game_type=GameType.MOBILE_LEGENDS) for i in range(6)]
+    teams.append(Team(id=99, name="Winner of M1", game_type=GameType.MOBILE_LEGENDS))
+    placeholder = Team(id=-1, name="Placeholder", game_type=GameType.MOBILE_LEGENDS)
+
+    tournament = Tournament(id="t", name="t", venue_start=dt_time(9, 0), venue_end=dt_time(20, 0),
+                            rest_period=15, conflict_backend=backend)
+    for k in range(30):
+        tournament.add_match(random_match(rng, k, teams, day))
+
+    for k in range(4):
+        # Fixed events are added one at a time, as the API does for breaks
+        event = Match(id=f"E{k}", team1=placeholder, team2=placeholder, duration=30,
+                      game_type=GameType.MOBILE_LEGENDS, round_number=0,
+                      is_fixed_time=True, is_break=k % 2 == 0)
+        event.set_time(day + timedelta(minutes=60 * (k + 1)))
+        tournament.add_fixed_event(event)
+        assert graph_edges(tournament) == rebuilt_edges(tournament)
+
+        # Matches moved in time are picked up on the next update
+        tournament.add_match(random_match(rng, 100 + k, teams, day))
+        for match in rng.sample(tournament.matches, 5):
+            if match.start_time and not match.is_fixed_time:
+                match.set_time(match.start_time + timedelta(minutes=rng.randint(-30, 30)))
+
+    tournament.mark_finals(["M3", "M7"])
+    assert graph_edges(tournament) == rebuilt_edges(tournament)
+
+    # A match list assigned directly is picked up when the graph is requested
+    tournament.matches = tournament.matches[5:]
+    tournament.mark_finals([])
+    tournament.get_conflict_graph()
+    assert graph_edges(tournament) == rebuilt_edges(tournament)
+    assert {m.id for m in tournament.conflict_graph.nodes} == {m.id for m in tournament.matches}
@@ -5,9 +5,10 @@ Functions to import real tournament data from various formats.
 import csv
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Union
 
-from backend.models import Team, Match, Schedule
+from backend.models import Team, Match, Schedule, ScheduleArrays
+from backend.models.arrays import as_arrays
 from backend.models.models import GameType
 
 def import_teams_from_csv(filepath: str) -> List[Team]:
@@ -102,21 +103,25 @@ def import_tournament_data(teams_file: str, matches_file: str, disruptions_file:
     
     return teams_list, schedule, disruptions
 
-def export_schedule_to_csv(schedule: Schedule, filepath: str):
-    """Export a schedule to a CSV file."""
+def export_schedule_to_csv(schedule: Union[Schedule, ScheduleArrays], filepath: str):
+    """Export a schedule (or its columnar view) to a CSV file."""
+    arrays = as_arrays(schedule)
+    starts = arrays.times(arrays.start)
+    ends = arrays.times(arrays.end)
     with open(filepath, 'w', newline='', encoding='utf-8') as file:
         writer = csv.writer(file)
         writer.writerow(['Match ID', 'Game', 'Team 1', 'Team 2', 'Start Time', 'End Time', 'Duration'])
         
-        for match in sorted(schedule.matches, key=lambda m: m.start_time if m.start_time else datetime.max):
+        # Rows in start order, unscheduled matches last
+        for i in arrays.order.tolist():
             writer.writerow([
-                match.id,
-                match.game_type,
-                match.team1.name,
-                match.team2.name,
-                match.start_time.strftime('%Y-%m-%d %H:%M:%S') if match.start_time else '',
-                match.end_time.strftime('%Y-%m-%d %H:%M:%S') if match.end_time else '',
-                match.duration
+                arrays.ids[i],
+                arrays.game_types[i],
+                arrays.teams[arrays.team1[i]].name,
+                arrays.teams[arrays.team2[i]].name,
+                starts[i].strftime('%Y-%m-%d %H:%M:%S') if starts[i] else '',
+                ends[i].strftime('%Y-%m-%d %H:%M:%S') if ends[i] else '',
+                int(arrays.duration[i])
             ])
 
 def import_data(teams_file: str = None, matches_file: str = None, disruptions_file: str = None):